@@ -0,0 +1,98 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Dict, List, Optional
+from ..models.analytics import SurveyStatsResponse, AnswerGroupByResponse, AnswerQuantilesResponse
+from ..models.survey import SurveyDB
+from ..database import get_db
+from ..services.analytics_service import SurveyAnalyticsService
+from ..services.answer_store import AnswerStoreError
+from .responses import answer_store
+
+router = APIRouter()
+analytics_service = SurveyAnalyticsService()
+
+def _require_answer_store(db: Session, survey_id: str):
+    if not answer_store.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Columnar answer store is disabled"
+        )
+    if not db.query(SurveyDB.id).filter(SurveyDB.id == survey_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+
+@router.get("/surveys/{survey_id}/stats", response_model=SurveyStatsResponse)
+async def get_survey_stats(survey_id: str, db: Session = Depends(get_db)):
+    """Completion, answer distributions, age/income histograms and confidence for a survey"""
+    if not db.query(SurveyDB.id).filter(SurveyDB.id == survey_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+
+    return analytics_service.get_stats(db, survey_id)
+
+@router.post("/surveys/{survey_id}/stats/rebuild", response_model=SurveyStatsResponse)
+async def rebuild_survey_stats(survey_id: str, db: Session = Depends(get_db)):
+    """Recompute a survey's stats from all of its responses"""
+    if not db.query(SurveyDB.id).filter(SurveyDB.id == survey_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+
+    analytics_service.rebuild(db, survey_id)
+    db.commit()
+    return analytics_service.get_stats(db, survey_id)
+
+@router.get("/surveys/{survey_id}/answers/columns", response_model=Dict[str, str])
+async def get_answer_columns(survey_id: str, db: Session = Depends(get_db)):
+    """Answer columns available for analysis and their types"""
+    _require_answer_store(db, survey_id)
+    return await asyncio.to_thread(answer_store.columns, survey_id)
+
+@router.get("/surveys/{survey_id}/answers/group-by", response_model=AnswerGroupByResponse)
+async def group_answers(
+    survey_id: str,
+    by: str = Query(..., description="Column to group on, e.g. q4 or village"),
+    value: Optional[str] = Query(None, description="Numeric column to average per group, e.g. income"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Response counts (and the mean of a numeric answer) per value of a column"""
+    _require_answer_store(db, survey_id)
+    try:
+        return await asyncio.to_thread(answer_store.group_by, survey_id, by, value, date_from, date_to, limit)
+    except AnswerStoreError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/surveys/{survey_id}/answers/quantiles", response_model=AnswerQuantilesResponse)
+async def answer_quantiles(
+    survey_id: str,
+    field: str = Query(..., description="Numeric column, e.g. income or q7.age"),
+    q: List[float] = Query([0.25, 0.5, 0.75]),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """Quantiles of a numeric answer"""
+    _require_answer_store(db, survey_id)
+    if any(not 0 <= quantile <= 1 for quantile in q):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantiles must be between 0 and 1")
+    try:
+        return await asyncio.to_thread(answer_store.quantiles, survey_id, field, q, date_from, date_to)
+    except AnswerStoreError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/surveys/{survey_id}/answers/rebuild")
+async def rebuild_answer_store(survey_id: str, db: Session = Depends(get_db)):
+    """Rewrite a survey's columnar answers from the database"""
+    _require_answer_store(db, survey_id)
+    count = await asyncio.to_thread(answer_store.rebuild, db, survey_id)
+    return {"survey_id": survey_id, "responses": count}
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..models.response import GeoResponsePoint, GeoCellCount, ResolvedLocation
+from ..models.survey import SurveyDB
+from ..database import get_db
+from ..services.geo_service import GeoIndexService, GEO_AGGREGATE_PRECISIONS
+from ..services.gazetteer import GazetteerService, LEVELS
+
+router = APIRouter()
+geo_service = GeoIndexService()
+# Loaded at startup; shared with NLPService for location answers
+gazetteer = GazetteerService()
+
+def _require_survey(db: Session, survey_id: str):
+    if not db.query(SurveyDB.id).filter(SurveyDB.id == survey_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+
+def _parse_bbox(bbox: str):
+    """min_lat,min_lng,max_lat,max_lng"""
+    try:
+        min_lat, min_lng, max_lat, max_lng = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox must be min_lat,min_lng,max_lat,max_lng"
+        )
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid bbox"
+        )
+    return min_lat, min_lng, max_lat, max_lng
+
+@router.get("/surveys/{survey_id}/responses/bbox", response_model=List[GeoResponsePoint])
+async def get_responses_in_bbox(
+    survey_id: str,
+    bbox: str = Query(..., description="min_lat,min_lng,max_lat,max_lng"),
+    limit: int = Query(1000, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Responses located inside a bounding box"""
+    _require_survey(db, survey_id)
+    return geo_service.within_bbox(db, survey_id, _parse_bbox(bbox), limit=limit, offset=offset)
+
+@router.get("/surveys/{survey_id}/responses/near", response_model=List[GeoResponsePoint])
+async def get_responses_near(
+    survey_id: str,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(1000, gt=0, le=200000),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Responses within radius_m meters of a point, nearest first"""
+    _require_survey(db, survey_id)
+    return geo_service.within_radius(db, survey_id, lat, lng, radius_m, limit=limit)
+
+@router.get("/surveys/{survey_id}/geo/cells", response_model=List[GeoCellCount])
+async def get_response_cell_counts(
+    survey_id: str,
+    precision: int = Query(GEO_AGGREGATE_PRECISIONS[0] if GEO_AGGREGATE_PRECISIONS else 4),
+    bbox: Optional[str] = Query(None, description="min_lat,min_lng,max_lat,max_lng"),
+    db: Session = Depends(get_db)
+):
+    """Response counts per geohash cell for map dashboards"""
+    _require_survey(db, survey_id)
+    if precision not in GEO_AGGREGATE_PRECISIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"precision must be one of {GEO_AGGREGATE_PRECISIONS}"
+        )
+
+    return geo_service.cell_counts(db, survey_id, precision, _parse_bbox(bbox) if bbox else None)
+
+@router.get("/locations/resolve", response_model=List[ResolvedLocation])
+async def resolve_location(
+    q: str = Query(..., min_length=1, max_length=200, description="Place name as spoken or typed"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    level: Optional[str] = Query(None, description="state, district, block or village"),
+    limit: int = Query(5, ge=1, le=50)
+):
+    """Gazetteer places named in q with their LGD codes, best first; a GPS
+    point favours places near it"""
+    if not gazetteer.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Gazetteer not loaded"
+        )
+    if level is not None and level not in LEVELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"level must be one of {LEVELS}"
+        )
+
+    return gazetteer.resolve(q, lat, lng, level=level, limit=limit)
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+from ..models.job import TranscriptionJobDB, TranscriptionJobModel
+from ..models.response import AudioFileDB
+from ..database import get_db
+from ..services.transcription_queue import TranscriptionQueue
+
+router = APIRouter()
+
+@router.get("/jobs/{job_id}", response_model=TranscriptionJobModel)
+async def get_job(job_id: str, db: Session = Depends(get_db)):
+    """Get transcription job status"""
+    job = db.query(TranscriptionJobDB).filter(TranscriptionJobDB.id == job_id).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return _convert_db_to_model(job)
+
+@router.get("/audio/{audio_id}/job", response_model=TranscriptionJobModel)
+async def get_audio_job(audio_id: str, db: Session = Depends(get_db)):
+    """Get latest transcription job for an uploaded audio file"""
+    job = (
+        db.query(TranscriptionJobDB)
+        .filter(TranscriptionJobDB.audio_file_id == audio_id)
+        .order_by(TranscriptionJobDB.created_at.desc())
+        .first()
+    )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No transcription job for this audio file"
+        )
+
+    return _convert_db_to_model(job)
+
+@router.post("/audio/{audio_id}/transcribe", response_model=TranscriptionJobModel, status_code=status.HTTP_202_ACCEPTED)
+async def retranscribe_audio(audio_id: str, request: Request, db: Session = Depends(get_db)):
+    """Queue a fresh server-side transcription for an audio file"""
+    audio = db.query(AudioFileDB).filter(AudioFileDB.id == audio_id).first()
+
+    if not audio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio file not found"
+        )
+
+    job = TranscriptionQueue.enqueue(db, audio.id)
+    _notify_queue(request)
+
+    return _convert_db_to_model(job)
+
+def _notify_queue(request: Request):
+    """Wake the in-process worker pool, if one is running"""
+    queue = getattr(request.app.state, "transcription_queue", None)
+    if queue:
+        queue.notify()
+
+def _convert_db_to_model(db_job: TranscriptionJobDB) -> TranscriptionJobModel:
+    """Convert database model to pydantic model"""
+    return TranscriptionJobModel(
+        id=db_job.id,
+        audio_file_id=db_job.audio_file_id,
+        status=db_job.status,
+        attempts=db_job.attempts or 0,
+        max_attempts=db_job.max_attempts or 0,
+        next_run_at=db_job.next_run_at,
+        last_error=db_job.last_error,
+        result=db_job.result,
+        created_at=db_job.created_at,
+        completed_at=db_job.completed_at
+    )
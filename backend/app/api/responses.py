@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Request, status, File, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..models.response import (
     ResponseModel, ResponseCreateRequest, ResponseUpdateRequest,
-    ResponseDB, AudioFileDB, BatchSyncRequest, SyncStatusResponse
+    ResponseDB, AudioFileDB, BatchSyncRequest, SyncStatusResponse,
+    LocationData, DeviceInfo, VerificationData
 )
 from ..database import get_db
 from ..utils.privacy import PrivacyService
+from ..services.analytics_service import SurveyAnalyticsService
+from ..services.answer_store import AnswerStoreService
+from ..services.fraud_detection import FraudDetectionEngine, apply_flags
+from ..services.geo_service import location_geohash
+from ..services.storage_service import AudioStorageService
+from ..services.transcription_queue import TranscriptionQueue
 import uuid
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
 router = APIRouter()
 privacy_service = PrivacyService()
+analytics_service = SurveyAnalyticsService()
+answer_store = AnswerStoreService()
+fraud_engine = FraudDetectionEngine()
+audio_storage = AudioStorageService()
 
 @router.post("/surveys/{survey_id}/responses", response_model=ResponseModel, status_code=status.HTTP_201_CREATED)
 async def create_response(
@@ -33,14 +44,22 @@ async def create_response(
         responses=encrypted_responses,
         location_lat=response_request.location.latitude if response_request.location else None,
         location_lng=response_request.location.longitude if response_request.location else None,
+        geohash=location_geohash(response_request.location.latitude, response_request.location.longitude)
+        if response_request.location else None,
         device_info=response_request.device_info.dict() if response_request.device_info else None,
         verification_data=response_request.verification_data.dict() if response_request.verification_data else None,
-        confidence_scores=response_request.confidence_scores
+        confidence_scores=response_request.confidence_scores,
+        # Set here rather than by the server default so fraud checks see the
+        # same timestamp now and when the response is updated later
+        created_at=datetime.now(timezone.utc)
     )
     
     db.add(db_response)
+    apply_flags(db_response, fraud_engine.evaluate(db_response))
+    analytics_service.record(db, survey_id, None, db_response)
     db.commit()
     db.refresh(db_response)
+    answer_store.enqueue([db_response])
     
     return _convert_db_to_model(db_response)
 
@@ -62,6 +81,31 @@ async def get_survey_responses(
     
     return [_convert_db_to_model(response) for response in responses]
 
+@router.get("/surveys/{survey_id}/responses/flagged", response_model=List[ResponseModel])
+async def get_flagged_responses(
+    survey_id: str,
+    flag_type: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Responses with fraud/duplicate flags, newest first, for supervisor review"""
+    query = db.query(ResponseDB).filter(
+        ResponseDB.survey_id == survey_id,
+        ResponseDB.fraud_flags.isnot(None)
+    ).order_by(ResponseDB.created_at.desc())
+    
+    if flag_type:
+        # Flags are a short JSON list; filtering them in SQL is dialect-specific
+        flagged = [
+            response for response in query.all()
+            if any(flag.get("type") == flag_type for flag in response.fraud_flags)
+        ][skip:skip + limit]
+    else:
+        flagged = query.offset(skip).limit(limit).all()
+    
+    return [_convert_db_to_model(response) for response in flagged]
+
 @router.get("/responses/{response_id}", response_model=ResponseModel)
 async def get_response(response_id: str, db: Session = Depends(get_db)):
     """Get specific response by ID"""
@@ -90,6 +134,8 @@ async def update_response(
             detail="Response not found"
         )
     
+    before = analytics_service.snapshot(response)
+    
     # Update fields
     if response_request.responses:
         encrypted_responses = privacy_service.encrypt_sensitive_data(response_request.responses)
@@ -98,6 +144,7 @@ async def update_response(
     if response_request.location:
         response.location_lat = response_request.location.latitude
         response.location_lng = response_request.location.longitude
+        response.geohash = location_geohash(response.location_lat, response.location_lng)
     
     if response_request.verification_data:
         response.verification_data = response_request.verification_data.dict()
@@ -108,8 +155,11 @@ async def update_response(
     if response_request.is_complete is not None:
         response.is_complete = response_request.is_complete
     
+    apply_flags(response, fraud_engine.evaluate(response))
+    analytics_service.record(db, response.survey_id, before, response)
     db.commit()
     db.refresh(response)
+    answer_store.enqueue([response])
     
     return _convert_db_to_model(response)
 
@@ -117,6 +167,7 @@ async def update_response(
 async def upload_audio_file(
     response_id: str,
     question_id: str,
+    request: Request,
     audio_file: UploadFile = File(...),
     transcription: Optional[str] = None,
     confidence: Optional[float] = None,
@@ -132,28 +183,18 @@ async def upload_audio_file(
             detail="Response not found"
         )
     
-    # Save audio file
-    import os
-    import aiofiles
-    
+    # Stream audio into content-addressed storage
     audio_id = str(uuid.uuid4())
-    file_extension = audio_file.filename.split('.')[-1]
-    file_path = f"audio_files/{response_id}/{audio_id}.{file_extension}"
-    
-    # Create directory if not exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    # Save file
-    async with aiofiles.open(file_path, 'wb') as f:
-        content = await audio_file.read()
-        await f.write(content)
+    stored = await audio_storage.store_upload(audio_file)
     
     # Create database record
     db_audio = AudioFileDB(
         id=audio_id,
         response_id=response_id,
         question_id=question_id,
-        file_path=file_path,
+        file_path=stored["storage_key"],
+        content_hash=stored["content_hash"],
+        size_bytes=stored["size_bytes"],
         transcription=transcription,
         confidence=confidence,
         language=language
@@ -162,7 +203,19 @@ async def upload_audio_file(
     db.add(db_audio)
     db.commit()
     
-    return {"audio_id": audio_id, "file_path": file_path}
+    # Queue server-side transcription; clients poll /jobs/{job_id}
+    job = TranscriptionQueue.enqueue(db, audio_id)
+    queue = getattr(request.app.state, "transcription_queue", None)
+    if queue:
+        queue.notify()
+    
+    return {
+        "audio_id": audio_id,
+        "file_path": stored["storage_key"],
+        "content_hash": stored["content_hash"],
+        "deduplicated": stored["deduplicated"],
+        "job_id": job.id
+    }
 
 @router.post("/sync/batch", response_model=SyncStatusResponse)
 async def batch_sync_responses(
@@ -173,6 +226,7 @@ async def batch_sync_responses(
     synced_count = 0
     failed_count = 0
     errors = []
+    synced = []
     
     for response_data in sync_request.responses:
         try:
@@ -181,10 +235,14 @@ async def batch_sync_responses(
             
             if existing:
                 # Update existing response
+                before = analytics_service.snapshot(existing)
                 encrypted_responses = privacy_service.encrypt_sensitive_data(response_data.responses)
                 existing.responses = encrypted_responses
                 existing.is_synced = True
+                apply_flags(existing, fraud_engine.evaluate(existing))
+                analytics_service.record(db, existing.survey_id, before, existing)
                 db.commit()
+                synced.append(existing)
             else:
                 # Create new response
                 encrypted_responses = privacy_service.encrypt_sensitive_data(response_data.responses)
@@ -196,23 +254,33 @@ async def batch_sync_responses(
                     responses=encrypted_responses,
                     location_lat=response_data.location.latitude if response_data.location else None,
                     location_lng=response_data.location.longitude if response_data.location else None,
+                    geohash=location_geohash(response_data.location.latitude, response_data.location.longitude)
+                    if response_data.location else None,
                     device_info=response_data.device_info.dict() if response_data.device_info else None,
                     verification_data=response_data.verification_data.dict() if response_data.verification_data else None,
                     confidence_scores=response_data.confidence_scores,
                     is_complete=response_data.is_complete,
                     is_synced=True,
-                    created_at=response_data.created_at or datetime.now()
+                    created_at=response_data.created_at or datetime.now(timezone.utc)
                 )
                 
                 db.add(db_response)
+                apply_flags(db_response, fraud_engine.evaluate(db_response))
+                analytics_service.record(db, response_data.survey_id, None, db_response)
                 db.commit()
+                synced.append(db_response)
             
             synced_count += 1
             
         except Exception as e:
+            # Keep the session usable for the rest of the batch
+            db.rollback()
             failed_count += 1
             errors.append(f"Response {response_data.id}: {str(e)}")
     
+    # One file per survey and day for the whole batch
+    answer_store.enqueue(synced)
+    
     return SyncStatusResponse(
         total_responses=len(sync_request.responses),
         synced_responses=synced_count,
@@ -322,5 +390,6 @@ def _convert_db_to_model(db_response: ResponseDB) -> ResponseModel:
         verification_data=verification_data,
         confidence_scores=db_response.confidence_scores,
         is_complete=db_response.is_complete,
-        created_at=db_response.created_at
+        created_at=db_response.created_at,
+        fraud_flags=db_response.fraud_flags
     )
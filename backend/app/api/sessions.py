@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Dict
+from ..models.session import (
+    InterviewSessionModel, SessionCreateRequest, SessionUpdateRequest
+)
+from ..database import get_db
+from ..services.session_store import InterviewSessionStore
+
+router = APIRouter()
+
+# Shared with /api/process-voice, which reads and updates sessions per answer
+session_store = InterviewSessionStore()
+
+@router.post("/sessions", response_model=InterviewSessionModel, status_code=status.HTTP_201_CREATED)
+async def create_session(session_request: SessionCreateRequest, db: Session = Depends(get_db)):
+    """Start an interview session for a survey and respondent"""
+    survey = session_store.survey(db, session_request.survey_id)
+    
+    if not survey:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+    
+    if session_request.language and survey.languages and session_request.language not in survey.languages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Survey is not conducted in {session_request.language}"
+        )
+    
+    state = session_store.create(db, survey, session_request.respondent_id, session_request.language)
+    return _convert_state_to_model(state)
+
+@router.get("/sessions/{session_id}", response_model=InterviewSessionModel)
+async def get_session(session_id: str, db: Session = Depends(get_db)):
+    """Get an open interview session"""
+    return _convert_state_to_model(_get_open_session(session_id, db))
+
+@router.put("/sessions/{session_id}", response_model=InterviewSessionModel)
+async def update_session(
+    session_id: str,
+    session_request: SessionUpdateRequest,
+    db: Session = Depends(get_db)
+):
+    """Move to another question or change the interview language"""
+    state = _get_open_session(session_id, db)
+    changes = session_request.dict(exclude_unset=True)
+    
+    if changes.get("current_question_id"):
+        survey = session_store.survey(db, state["survey_id"])
+        if not survey or not survey.question(changes["current_question_id"]):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Question not in this survey"
+            )
+    
+    return _convert_state_to_model(session_store.update(session_id, **changes) or state)
+
+@router.delete("/sessions/{session_id}", response_model=InterviewSessionModel)
+async def close_session(session_id: str, db: Session = Depends(get_db)):
+    """Finish an interview session"""
+    state = session_store.close(db, session_id)
+    
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    return _convert_state_to_model(state)
+
+def _get_open_session(session_id: str, db: Session) -> Dict[str, Any]:
+    state = session_store.get(session_id, db)
+    
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    return state
+
+def _convert_state_to_model(state: Dict[str, Any]) -> InterviewSessionModel:
+    """Convert session state to pydantic model"""
+    return InterviewSessionModel(
+        id=state["id"],
+        survey_id=state["survey_id"],
+        respondent_id=state.get("respondent_id"),
+        language=state.get("language"),
+        current_question_id=state.get("current_question_id"),
+        answers=state.get("answers", {}),
+        attempts=state.get("attempts", {}),
+        is_closed=state.get("is_closed", False),
+        created_at=datetime.fromisoformat(state["created_at"]) if state.get("created_at") else None,
+        updated_at=datetime.fromisoformat(state["updated_at"]) if state.get("updated_at") else None
+    )
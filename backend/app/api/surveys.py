@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import List
-from ..models.survey import SurveyModel, SurveyCreateRequest, SurveyUpdateRequest, SurveyDB
+from ..models.survey import (
+    SurveyModel, SurveyCreateRequest, SurveyUpdateRequest, SurveyDB,
+    Question, SurveyLogic, SurveyResponses, RetryDecisionRequest, RetryDecision
+)
 from ..database import get_db
+from ..services.retry_policy import RetryPolicyService
+from .sessions import session_store
 import uuid
 import yaml
 import json
 
 router = APIRouter()
 
+# Shared with /api/process-voice so both count attempts in the same sessions
+retry_policy = RetryPolicyService()
+
 @router.get("/surveys", response_model=List[SurveyModel])
 async def get_surveys(
     skip: int = 0,
@@ -42,6 +50,8 @@ async def get_survey(survey_id: str, db: Session = Depends(get_db)):
 @router.post("/surveys", response_model=SurveyModel, status_code=status.HTTP_201_CREATED)
 async def create_survey(
     survey_request: SurveyCreateRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Create new survey"""
@@ -66,12 +76,18 @@ async def create_survey(
     db.commit()
     db.refresh(db_survey)
     
-    return _convert_db_to_model(db_survey)
+    survey_model = _convert_db_to_model(db_survey)
+    _schedule_prerender(request, background_tasks, survey_model)
+    _schedule_plan_compile(request, background_tasks, survey_model)
+    
+    return survey_model
 
 @router.put("/surveys/{survey_id}", response_model=SurveyModel)
 async def update_survey(
     survey_id: str,
     survey_request: SurveyUpdateRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Update existing survey"""
@@ -108,8 +124,15 @@ async def update_survey(
     
     db.commit()
     db.refresh(survey)
+    session_store.invalidate_survey(survey_id)
     
-    return _convert_db_to_model(survey)
+    survey_model = _convert_db_to_model(survey)
+    if survey_request.questions or survey_request.responses or survey_request.languages:
+        _schedule_prerender(request, background_tasks, survey_model)
+    if survey_request.questions:
+        _schedule_plan_compile(request, background_tasks, survey_model)
+    
+    return survey_model
 
 @router.delete("/surveys/{survey_id}")
 async def delete_survey(survey_id: str, db: Session = Depends(get_db)):
@@ -124,12 +147,15 @@ async def delete_survey(survey_id: str, db: Session = Depends(get_db)):
     
     survey.is_active = False
     db.commit()
+    session_store.invalidate_survey(survey_id)
     
     return {"message": "Survey deleted successfully"}
 
 @router.post("/surveys/upload-yaml")
 async def upload_survey_yaml(
     yaml_content: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Upload survey definition from YAML"""
@@ -149,7 +175,8 @@ async def upload_survey_yaml(
             existing_survey.version = existing_survey.version + 1
             db.commit()
             db.refresh(existing_survey)
-            return _convert_db_to_model(existing_survey)
+            session_store.invalidate_survey(existing_survey.id)
+            survey_model = _convert_db_to_model(existing_survey)
         else:
             # Create new survey
             db_survey = SurveyDB(
@@ -161,8 +188,12 @@ async def upload_survey_yaml(
             db.add(db_survey)
             db.commit()
             db.refresh(db_survey)
-            return _convert_db_to_model(db_survey)
-            
+            survey_model = _convert_db_to_model(db_survey)
+        
+        _schedule_prerender(request, background_tasks, survey_model)
+        _schedule_plan_compile(request, background_tasks, survey_model)
+        return survey_model
+        
     except yaml.YAMLError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -174,20 +205,65 @@ async def upload_survey_yaml(
             detail=f"Error processing survey: {str(e)}"
         )
 
+@router.post("/surveys/{survey_id}/questions/{question_id}/decision", response_model=RetryDecision)
+async def decide_retry(
+    survey_id: str,
+    question_id: str,
+    decision_request: RetryDecisionRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Accept, retry or skip an answer under the survey's logic, with the retry prompt and its audio"""
+    survey_model = session_store.survey(db, survey_id)
+    
+    if not survey_model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Survey not found"
+        )
+    
+    question = survey_model.question(question_id)
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    if decision_request.attempt is not None and decision_request.attempt < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="attempt starts at 1"
+        )
+    
+    decision = retry_policy.decide(
+        survey_model, question,
+        session_id=decision_request.session_id,
+        attempt=decision_request.attempt,
+        stt_confidence=decision_request.stt_confidence,
+        extraction_confidence=decision_request.extraction_confidence,
+        no_speech=decision_request.no_speech
+    )
+    
+    lang = decision_request.language or (survey_model.languages[0] if survey_model.languages else "hi")
+    tts_service = getattr(request.app.state, "tts_service", None) if decision_request.include_audio else None
+    return await retry_policy.attach_prompt_audio(decision, tts_service, lang, decision_request.audio_format)
+
+def _schedule_prerender(request: Request, background_tasks: BackgroundTasks,
+                        survey_model: SurveyModel):
+    """Synthesize all survey prompts into the TTS cache after the response is sent"""
+    tts_service = getattr(request.app.state, "tts_service", None)
+    if tts_service:
+        background_tasks.add_task(
+            tts_service.prerender, survey_model.prompt_texts(), survey_model.languages
+        )
+
+def _schedule_plan_compile(request: Request, background_tasks: BackgroundTasks,
+                           survey_model: SurveyModel):
+    """Compile extraction plans, with their choice option indexes, after the response is sent"""
+    nlp_service = getattr(request.app.state, "nlp_service", None)
+    if nlp_service:
+        background_tasks.add_task(nlp_service.plans_for, survey_model, rebuild=True)
+
 def _convert_db_to_model(db_survey: SurveyDB) -> SurveyModel:
     """Convert database model to pydantic model"""
-    definition = db_survey.definition
-    
-    questions = [Question(**q) for q in definition.get("questions", [])]
-    logic = SurveyLogic(**definition.get("logic", {}))
-    responses = SurveyResponses(**definition.get("responses", {}))
-    
-    return SurveyModel(
-        id=db_survey.id,
-        title=db_survey.title,
-        version=db_survey.version,
-        languages=db_survey.languages or [],
-        questions=questions,
-        logic=logic,
-        responses=responses
-    )
+    return SurveyModel.from_db(db_survey)
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -28,3 +28,22 @@ def get_db():
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+
+def add_missing_columns():
+    """Add columns (and their indexes) that models gained after their table was created
+    
+    create_all() only creates missing tables; new nullable columns are added in place
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        with engine.begin() as connection:
+            for column in missing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
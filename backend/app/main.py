@@ -1,10 +1,13 @@
-from fastapi import FastAPI, File, UploadFile, Depends, HTTPException
+from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 import os
 import asyncio
+import logging
 from dotenv import load_dotenv
+from sqlalchemy.orm import Session
 
 # Load environment variables
 load_dotenv()
@@ -13,10 +16,22 @@ load_dotenv()
 from app.services.stt_service import STTService
 from app.services.tts_service import TTSService
 from app.services.nlp_service import NLPService
-from app.database import create_tables
+from app.services.transcription_queue import TranscriptionQueue
+from app.services.analytics_service import SurveyAnalyticsService
+from app.services.geo_service import GeoIndexService
+from app.utils.audio_codec import MEDIA_TYPES, negotiate_profile
+from app.utils.audio_response import audio_response
+from app.utils.metrics import MetricsMiddleware, async_stage, render_metrics, stage
+from app.database import create_tables, get_db
+from app.api import surveys, responses, jobs, analytics, geo, sessions
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="BharatPulse API", version="1.0.0")
 
+# Per-request stage timings, /metrics histograms and slow-request profiling
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -25,25 +40,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(surveys.router, prefix="/api")
+app.include_router(responses.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(geo.router, prefix="/api")
+app.include_router(sessions.router, prefix="/api")
+
 # Initialize services
 stt_service = None
 tts_service = None
 nlp_service = None
+transcription_queue = None
 
 @app.on_event("startup")
 async def startup_event():
-    global stt_service, tts_service, nlp_service
+    global stt_service, tts_service, nlp_service, transcription_queue
     
     # Create database tables
     create_tables()
     
+    # Survey stats for responses written before incremental aggregation
+    SurveyAnalyticsService().backfill_missing()
+    
+    # Geohash index for responses stored before the column existed
+    GeoIndexService().backfill_geohashes()
+    
+    # Fraud checks compare against recent interviews, including those before a restart
+    responses.fraud_engine.warm_up()
+    
+    # Place-name index for location answers (memory-mapped). Loaded in the
+    # background: compiling a stale index takes a while, and location
+    # resolution just stays off until it is ready
+    app.state.gazetteer_load = asyncio.create_task(asyncio.to_thread(geo.gazetteer.load))
+    
     # Initialize services
     stt_service = STTService()
     tts_service = TTSService()
-    nlp_service = NLPService()
+    nlp_service = NLPService(gazetteer=geo.gazetteer)
+    app.state.tts_service = tts_service
+    app.state.nlp_service = nlp_service
+    
+    # Start background transcription workers
+    transcription_queue = TranscriptionQueue(stt_service, nlp_service, responses.audio_storage)
+    await transcription_queue.start()
+    app.state.transcription_queue = transcription_queue
+    
+    # Merge the small files response writes leave in the columnar answer store
+    await responses.answer_store.start()
+    
+    # Periodic snapshots of interview sessions held in memory
+    await sessions.session_store.start()
     
     print("✅ BharatPulse API started successfully!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if transcription_queue:
+        await transcription_queue.stop()
+    await responses.answer_store.stop()
+    await sessions.session_store.stop()
+    if tts_service:
+        tts_service.close()
+
 @app.get("/")
 async def root():
     return {"message": "BharatPulse API is running!", "status": "healthy"}
@@ -52,22 +111,56 @@ async def root():
 async def health_check():
     return {"status": "healthy", "services": "operational"}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text-format latency, CPU and size histograms"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.post("/api/process-voice")
 async def process_voice(
     audio_file: UploadFile = File(...),
     question_id: str = None,
-    user_lang: str = "hi"
+    user_lang: str = "hi",
+    session_id: str = None,
+    survey_id: str = None,
+    attempt: int = None,
+    audio_format: str = Query(None, alias="format"),
+    latitude: float = Query(None, ge=-90, le=90),
+    longitude: float = Query(None, ge=-180, le=180),
+    db: Session = Depends(get_db)
 ):
-    """Process voice input and return structured response"""
+    """Process voice input and return structured response
+    
+    With survey_id and question_id the response also carries the retry
+    policy's decision (accept/retry/skip) and the retry prompt audio, so a
+    low-confidence answer needs no further round-trip. latitude/longitude
+    (the device's GPS fix) pick between villages sharing a spoken name.
+    """
     try:
         if not audio_file.content_type.startswith('audio/'):
             raise HTTPException(status_code=400, detail="File must be an audio file")
         
         # Read audio content
-        audio_content = await audio_file.read()
+        with async_stage("upload_read") as upload:
+            audio_content = await audio_file.read()
+            upload.add_bytes(len(audio_content))
+        
+        # An interview session supplies survey, question and language from memory
+        session = sessions.session_store.get(session_id, db)
+        if session:
+            survey_id = session["survey_id"]
+            question_id = question_id or session.get("current_question_id")
+            user_lang = session.get("language") or user_lang
+        
+        # Languages the survey is conducted in narrow any language detection
+        survey = sessions.session_store.survey(db, survey_id)
+        survey_languages = survey.languages if survey else None
+        question = survey.question(question_id) if survey else None
         
         # Speech to text
-        transcription_result = await stt_service.transcribe(audio_content, user_lang)
+        transcription_result = await stt_service.transcribe(
+            audio_content, user_lang, session_id=session_id, survey_languages=survey_languages
+        )
         
         if not transcription_result.get("success"):
             return JSONResponse(
@@ -75,29 +168,71 @@ async def process_voice(
                 content={"error": "Speech recognition failed", "success": False}
             )
         
-        # Extract structured data
-        extraction_result = await nlp_service.extract_fields(
-            transcription_result.get("text", ""), question_id
-        )
+        # Extract structured data: the question's fields only, minus ones answered earlier
+        previous = None
+        if session:
+            previous = {
+                field: value
+                for answered_id, answer in session["answers"].items() if answered_id != question_id
+                for field, value in answer.items()
+            }
+        with async_stage("nlp"):
+            extraction_result = await nlp_service.extract_fields(
+                transcription_result.get("text", ""), question_id,
+                language=transcription_result.get("language"),
+                plan=nlp_service.plans_for(survey).get(question.id) if question else None,
+                previous=previous,
+                coordinates=(latitude, longitude) if latitude is not None and longitude is not None else None
+            )
+        
+        # Accept/retry/skip under the survey's logic, with the retry prompt audio
+        decision = None
+        if question:
+            decision = surveys.retry_policy.decide(
+                survey, question,
+                session_id=session_id,
+                attempt=attempt,
+                stt_confidence=transcription_result.get("confidence"),
+                extraction_confidence=extraction_result.get("confidence", 0.0),
+                no_speech=bool(transcription_result.get("no_speech"))
+            )
+            decision = await surveys.retry_policy.attach_prompt_audio(
+                decision, tts_service, transcription_result.get("language") or user_lang, audio_format
+            )
         
-        return {
-            "transcription": transcription_result,
-            "extracted_data": extraction_result,
-            "confidence": extraction_result.get("confidence", 0.0),
-            "success": True
-        }
+        if session and question:
+            sessions.session_store.record_answer(
+                session, survey, question.id, extraction_result.get("extracted_data", {}),
+                decision, transcription_result.get("language")
+            )
         
+        with stage("serialization") as serialization:
+            response = JSONResponse(content=jsonable_encoder({
+                "transcription": transcription_result,
+                "extracted_data": extraction_result,
+                "confidence": extraction_result.get("confidence", 0.0),
+                "decision": decision,
+                "next_question_id": session.get("current_question_id") if session else None,
+                "success": True
+            }))
+            serialization.add_bytes(len(response.body))
+        return response
+        
+    except HTTPException:
+        # Client errors (e.g. non-audio upload) keep their status code
+        raise
     except Exception as e:
+        logger.exception(f"process-voice failed: {e}")
         return JSONResponse(
             status_code=500,
             content={"error": str(e), "success": False}
         )
 
 @app.get("/api/tts/{text}")
-async def text_to_speech(text: str, lang: str = "hi"):
+async def text_to_speech(text: str, lang: str = "hi", audio_format: str = Query(None, alias="format")):
     """Convert text to speech"""
     try:
-        audio_data = await tts_service.synthesize(text, lang)
+        audio_data = await tts_service.synthesize(text, lang, profile=audio_format)
         return {"audio_base64": audio_data, "success": True}
     except Exception as e:
         return JSONResponse(
@@ -105,6 +240,47 @@ async def text_to_speech(text: str, lang: str = "hi"):
             content={"error": str(e), "success": False}
         )
 
+@app.get("/api/tts/{text}/audio")
+async def text_to_speech_audio(
+    text: str,
+    request: Request,
+    lang: str = "hi",
+    slow: bool = False,
+    voice: str = None,
+    audio_format: str = Query(None, alias="format")
+):
+    """Serve synthesized (usually cached) prompt audio as raw bytes
+    
+    The encoding is chosen from ?format= (opus-16k, opus-8k, mp3, wav-8k) or
+    the Accept header, e.g. "Accept: audio/ogg" for Opus on 2G links.
+    """
+    profile = negotiate_profile(request.headers.get("accept"), audio_format)
+    
+    try:
+        audio_data, container = await tts_service.synthesize_audio(text, lang, slow, voice, profile)
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e), "success": False}
+        )
+    
+    if not audio_data:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Speech synthesis unavailable", "success": False}
+        )
+    
+    # Cache key + profile identify the rendering; the length tells a transcoded
+    # variant apart from the native fallback served when ffmpeg is missing
+    etag = f"{tts_service.cache.make_key(text, lang, slow, voice)}-{profile or 'native'}-{len(audio_data)}"
+    return audio_response(
+        request,
+        audio_data,
+        MEDIA_TYPES.get(container, "application/octet-stream"),
+        etag,
+        max_age=int(os.getenv("TTS_HTTP_MAX_AGE", 86400))
+    )
+
 if __name__ == "__main__":
     uvicorn.run(
         app,
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float
+from sqlalchemy.sql import func
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+from ..database import Base
+
+class SurveyStatCounterDB(Base):
+    __tablename__ = "survey_stat_counters"
+
+    # One running counter per survey/metric/key, e.g. ("answer:q3", "yes") or
+    # ("hist:age", "25-34"); total holds the sum for averages
+    survey_id = Column(String, primary_key=True)
+    metric = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# Pydantic models for API
+class NumericFieldStats(BaseModel):
+    count: int = 0
+    mean: Optional[float] = None
+    histogram: Dict[str, int] = {}
+
+class QuestionStats(BaseModel):
+    answered: int = 0
+    answers: Dict[str, int] = {}
+    average_confidence: Optional[float] = None
+
+class SurveyStatsResponse(BaseModel):
+    survey_id: str
+    total_responses: int = 0
+    complete_responses: int = 0
+    synced_responses: int = 0
+    completion_rate: float = 0.0
+    average_confidence: Optional[float] = None
+    questions: Dict[str, QuestionStats] = {}
+    numeric: Dict[str, NumericFieldStats] = {}
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+class AnswerGroup(BaseModel):
+    value: Optional[str] = None
+    count: int
+    mean: Optional[float] = None
+
+class AnswerGroupByResponse(BaseModel):
+    survey_id: str
+    by: str
+    value: Optional[str] = None
+    responses: int
+    groups: List[AnswerGroup] = []
+
+class AnswerQuantilesResponse(BaseModel):
+    survey_id: str
+    field: str
+    count: int
+    mean: float
+    min: float
+    max: float
+    quantiles: Dict[str, float]
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy.sql import func
+from pydantic import BaseModel
+from typing import Dict, Any, Optional
+from datetime import datetime
+from ..database import Base
+
+class TranscriptionJobDB(Base):
+    __tablename__ = "transcription_jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    audio_file_id = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default="pending", index=True)  # pending/running/completed/failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    next_run_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    locked_at = Column(DateTime(timezone=True))  # When a worker claimed the job
+    last_error = Column(Text)
+    result = Column(JSON)  # Transcription and extracted fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True))
+
+# Pydantic models for API
+class TranscriptionJobModel(BaseModel):
+    id: str
+    audio_file_id: str
+    status: str
+    attempts: int = 0
+    max_attempts: int = 3
+    next_run_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
@@ -1,11 +1,9 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, Float
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, Float, Index
 from sqlalchemy.sql import func
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import List, Dict, Any, Optional
 from datetime import datetime
-
-Base = declarative_base()
+from ..database import Base
 
 class ResponseDB(Base):
     __tablename__ = "survey_responses"
@@ -16,14 +14,21 @@ class ResponseDB(Base):
     responses = Column(JSON, nullable=False)
     location_lat = Column(Float)
     location_lng = Column(Float)
+    geohash = Column(String(12))  # Cell of the location, see utils.geohash
     device_info = Column(JSON)
     audio_files = Column(JSON)  # Store audio file references
     verification_data = Column(JSON)  # Face/voice verification results
     confidence_scores = Column(JSON)  # Per-question confidence
+    fraud_flags = Column(JSON(none_as_null=True))  # Curbstoning checks, see services.fraud_detection
     is_complete = Column(Boolean, default=False)
     is_synced = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Map queries are per survey: prefix range scans over (survey_id, geohash)
+    __table_args__ = (
+        Index("ix_survey_responses_survey_geohash", "survey_id", "geohash"),
+    )
 
 class AudioFileDB(Base):
     __tablename__ = "audio_files"
@@ -31,7 +36,9 @@ class AudioFileDB(Base):
     id = Column(String, primary_key=True, index=True)
     response_id = Column(String, nullable=False, index=True)
     question_id = Column(String, nullable=False)
-    file_path = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)  # Storage key in the audio backend
+    content_hash = Column(String, index=True)  # SHA-256 of the uploaded bytes
+    size_bytes = Column(Integer)
     transcription = Column(Text)
     confidence = Column(Float)
     language = Column(String)
@@ -67,6 +74,7 @@ class ResponseModel(BaseModel):
     confidence_scores: Optional[Dict[str, float]] = None
     is_complete: bool = False
     created_at: datetime = None
+    fraud_flags: Optional[List[Dict[str, Any]]] = None  # Set by the server; ignored on sync
     
     class Config:
         json_encoders = {
@@ -107,3 +115,37 @@ class SyncStatusResponse(BaseModel):
     synced_responses: int
     failed_responses: int
     errors: List[str] = []
+
+class GeoResponsePoint(BaseModel):
+    id: str
+    respondent_id: Optional[str] = None
+    latitude: float
+    longitude: float
+    is_complete: bool = False
+    created_at: Optional[datetime] = None
+    distance_m: Optional[float] = None  # Radius queries only
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+class GeoCellCount(BaseModel):
+    cell: str
+    count: int
+    latitude: float
+    longitude: float
+    bbox: List[float]  # [min_lat, min_lng, max_lat, max_lng]
+
+class ResolvedPlace(BaseModel):
+    code: int  # LGD code
+    name: Optional[str] = None
+    name_hi: Optional[str] = None
+
+class ResolvedLocation(ResolvedPlace):
+    level: str  # state, district, block or village
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    score: float
+    distance_km: Optional[float] = None  # With a GPS point only
+    parents: Dict[str, ResolvedPlace] = {}  # Keyed by level
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, DateTime, Boolean, JSON
+from sqlalchemy.sql import func
+from pydantic import BaseModel
+from typing import Dict, Any, Optional
+from datetime import datetime
+from ..database import Base
+
+class InterviewSessionDB(Base):
+    __tablename__ = "interview_sessions"
+
+    id = Column(String, primary_key=True, index=True)
+    survey_id = Column(String, nullable=False, index=True)
+    respondent_id = Column(String, index=True)
+    state = Column(JSON, nullable=False)  # Snapshot of the in-memory session, see services.session_store
+    is_closed = Column(Boolean, default=False)
+    expires_at = Column(DateTime(timezone=True), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+# Pydantic models for API
+class SessionCreateRequest(BaseModel):
+    survey_id: str
+    respondent_id: Optional[str] = None
+    language: Optional[str] = None
+
+class SessionUpdateRequest(BaseModel):
+    current_question_id: Optional[str] = None
+    language: Optional[str] = None
+
+class InterviewSessionModel(BaseModel):
+    id: str
+    survey_id: str
+    respondent_id: Optional[str] = None
+    language: Optional[str] = None
+    current_question_id: Optional[str] = None
+    answers: Dict[str, Any] = {}  # question id -> extracted fields
+    attempts: Dict[str, int] = {}
+    is_closed: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
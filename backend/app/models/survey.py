@@ -1,11 +1,9 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-
-Base = declarative_base()
+from ..database import Base
 
 class SurveyDB(Base):
     __tablename__ = "surveys"
@@ -41,6 +39,7 @@ class Question(BaseModel):
     required: bool = True
     extract: Optional[List[Dict[str, Any]]] = None
     conditions: Optional[List[Dict[str, Any]]] = None
+    options: Optional[List[Any]] = None  # Choices: strings or {"value", "labels"}
     retry_prompts: Optional[List[str]] = None
     follow_ups: Optional[List[Dict[str, Any]]] = None
     next: Optional[str] = None
@@ -88,6 +87,48 @@ class SurveyModel(BaseModel):
             logic=logic,
             responses=responses
         )
+    
+    @classmethod
+    def from_db(cls, db_survey: SurveyDB):
+        """Create survey model from its database row"""
+        definition = db_survey.definition
+        
+        return cls(
+            id=db_survey.id,
+            title=db_survey.title,
+            version=db_survey.version,
+            languages=db_survey.languages or [],
+            questions=[Question(**q) for q in definition.get("questions", [])],
+            logic=SurveyLogic(**definition.get("logic", {})),
+            responses=SurveyResponses(**definition.get("responses", {}))
+        )
+    
+    def question(self, question_id: Optional[str]) -> Optional[Question]:
+        """Question by id, or None"""
+        return next((q for q in self.questions if q.id == question_id), None)
+    
+    def next_question_id(self, question_id: str) -> Optional[str]:
+        """Question asked after this one: its explicit next, else the following one"""
+        for index, question in enumerate(self.questions):
+            if question.id == question_id:
+                if question.next:
+                    return question.next
+                return self.questions[index + 1].id if index + 1 < len(self.questions) else None
+        return None
+    
+    def prompt_texts(self) -> List[str]:
+        """All spoken prompts: question texts, retry prompts and canned responses"""
+        texts = []
+        for question in self.questions:
+            texts.append(question.text)
+            texts.extend(question.retry_prompts or [])
+        
+        texts.extend([
+            self.responses.thank_you,
+            self.responses.error_generic,
+            self.responses.error_unclear
+        ])
+        return texts
 
 class SurveyCreateRequest(BaseModel):
     title: str
@@ -105,3 +146,25 @@ class SurveyUpdateRequest(BaseModel):
     logic: Optional[SurveyLogic] = None
     responses: Optional[SurveyResponses] = None
     is_active: Optional[bool] = None
+
+class RetryDecisionRequest(BaseModel):
+    session_id: Optional[str] = None
+    attempt: Optional[int] = None  # 1 for the first answer; counted per session when omitted
+    stt_confidence: Optional[float] = None
+    extraction_confidence: Optional[float] = None
+    no_speech: bool = False
+    language: Optional[str] = None  # Prompt language, defaults to the survey's first
+    audio_format: Optional[str] = None  # OUTPUT_PROFILES name for the prompt audio
+    include_audio: bool = True
+
+class RetryDecision(BaseModel):
+    action: str  # accept, retry or skip
+    reason: str
+    attempt: int
+    retries_left: int
+    confidence: float
+    threshold: float
+    needs_review: bool = False  # Required question skipped
+    prompt: Optional[str] = None
+    prompt_audio_url: Optional[str] = None
+    audio_base64: Optional[str] = None
@@ -0,0 +1,323 @@
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.analytics import SurveyStatCounterDB
+from ..models.response import ResponseDB
+from ..utils import geohash
+from ..utils.privacy import SENSITIVE_FIELDS, mask_pii_in_text
+from .geo_service import GEO_AGGREGATE_PRECISIONS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Encrypted PII never feeds the distributions (ciphertexts are unique anyway)
+PII_FIELDS = set(SENSITIVE_FIELDS)
+
+# Lower bucket edges; the last bucket is open-ended
+NUMERIC_BUCKETS = {
+    "age": [0, 18, 25, 35, 45, 60, 75],
+    "income": [0, 5000, 10000, 20000, 50000, 100000],
+}
+
+OTHER = "__other__"
+LONG_TEXT = "__long_text__"
+MAX_ANSWER_LENGTH = 64
+
+# Bump when contribution() changes; surveys counted by an older version are rebuilt at startup
+STATS_VERSION = 2
+
+Counters = Dict[Tuple[str, str], list]
+
+
+class SurveyAnalyticsService:
+    """Per-survey aggregates kept up to date on every response write.
+
+    Each write applies the difference between the response's contribution
+    before and after it (completion, answer values, age/income buckets and
+    sums, confidence sums, responses per map cell) to counter rows in the same transaction, so
+    reading a survey's stats costs the same for 10 or 10 million responses.
+    """
+
+    def __init__(self, max_distinct_answers: Optional[int] = None):
+        # Free-text answers would otherwise add a counter row per response
+        self.max_distinct_answers = max_distinct_answers or int(
+            os.getenv("ANALYTICS_MAX_DISTINCT_ANSWERS", 50)
+        )
+
+    @staticmethod
+    def snapshot(response: ResponseDB) -> Dict[str, Any]:
+        """The stored fields stats depend on; take it before mutating a response"""
+        return {
+            "responses": dict(response.responses or {}),
+            "confidence_scores": dict(response.confidence_scores or {}),
+            "is_complete": bool(response.is_complete),
+            "is_synced": bool(response.is_synced),
+            "location": (response.location_lat, response.location_lng),
+        }
+
+    def record(self, db: Session, survey_id: str, before: Optional[Dict[str, Any]],
+               response: ResponseDB):
+        """Apply a create (before=None) or update to the survey's counters; caller commits"""
+        delta = self.contribution(self.snapshot(response))
+        if before is not None:
+            for key, (count, total) in self.contribution(before).items():
+                entry = delta.setdefault(key, [0, 0.0])
+                entry[0] -= count
+                entry[1] -= total
+
+        delta = {key: value for key, value in delta.items() if value[0] or value[1]}
+        if delta:
+            self._apply(db, survey_id, self._route_answers(db, survey_id, delta))
+
+    def contribution(self, state: Dict[str, Any]) -> Counters:
+        """Counter increments one response accounts for"""
+        counters: Counters = defaultdict(lambda: [0, 0.0])
+
+        def add(metric, key, value=0.0):
+            counters[(metric, key)][0] += 1
+            counters[(metric, key)][1] += value
+
+        add("responses", "total")
+        add("meta", f"v{STATS_VERSION}")
+        if state["is_complete"]:
+            add("responses", "complete")
+        if state.get("is_synced"):
+            add("responses", "synced")
+
+        for question_id, answer in state["responses"].items():
+            if question_id in PII_FIELDS:
+                continue
+            values = self._answer_values(answer)
+            if values or isinstance(answer, dict):
+                add(f"answered:{question_id}", "")
+            # Numeric fields are summarised as histograms instead
+            if question_id in NUMERIC_BUCKETS:
+                continue
+            for value in values:
+                add(f"answer:{question_id}", value)
+
+        for field, number in self._numeric_fields(state["responses"]).items():
+            add(f"numeric:{field}", "", number)
+            add(f"hist:{field}", self._bucket(field, number))
+
+        for question_id, score in state["confidence_scores"].items():
+            if isinstance(score, (int, float)):
+                add(f"confidence:{question_id}", "", float(score))
+                add("confidence", "all", float(score))
+
+        lat, lng = state.get("location") or (None, None)
+        if lat is not None and lng is not None and GEO_AGGREGATE_PRECISIONS:
+            cell = geohash.encode(lat, lng, max(GEO_AGGREGATE_PRECISIONS))
+            for precision in GEO_AGGREGATE_PRECISIONS:
+                add(f"geo:{precision}", cell[:precision])
+
+        return dict(counters)
+
+    @staticmethod
+    def _answer_values(answer) -> Iterable[str]:
+        if answer is None or isinstance(answer, dict):
+            return []
+        if isinstance(answer, list):
+            values = answer
+        else:
+            values = [answer]
+
+        keys = []
+        for value in values:
+            if isinstance(value, (dict, list)) or value is None:
+                continue
+            text = str(value).strip()
+            if len(text) > MAX_ANSWER_LENGTH:
+                keys.append(LONG_TEXT)
+            elif text:
+                # Stats are shown to supervisors; free text can carry phone/Aadhaar
+                # numbers. Mask before casefolding so the PAN pattern still matches
+                keys.append(mask_pii_in_text(text).casefold())
+        return keys
+
+    @staticmethod
+    def _numeric_fields(responses: Dict[str, Any]) -> Dict[str, float]:
+        """age/income stored as answers or inside extraction results"""
+        found = {}
+        candidates = [responses] + [
+            value.get("extracted_data", value) for value in responses.values() if isinstance(value, dict)
+        ]
+        for source in candidates:
+            if not isinstance(source, dict):
+                continue
+            for field in NUMERIC_BUCKETS:
+                if field in found or field not in source:
+                    continue
+                try:
+                    found[field] = float(str(source[field]).replace(",", ""))
+                except (TypeError, ValueError):
+                    continue
+        return found
+
+    @staticmethod
+    def _bucket(field: str, number: float) -> str:
+        edges = NUMERIC_BUCKETS[field]
+        for lower, upper in zip(edges, edges[1:]):
+            if number < upper:
+                return f"{lower}-{upper - 1}"
+        return f"{edges[-1]}+"
+
+    def _route_answers(self, db: Session, survey_id: str, delta: Counters) -> Counters:
+        """Send answer values past the distinct-value cap to __other__.
+
+        Counter rows are never deleted, so a value keeps the row it was first
+        counted in and decrements always hit the same row as the increments.
+        """
+        metrics = {metric for metric, _ in delta if metric.startswith("answer:")}
+        if not metrics:
+            return delta
+
+        existing = defaultdict(set)
+        rows = db.query(SurveyStatCounterDB.metric, SurveyStatCounterDB.key).filter(
+            SurveyStatCounterDB.survey_id == survey_id,
+            SurveyStatCounterDB.metric.in_(metrics)
+        ).all()
+        for metric, key in rows:
+            existing[metric].add(key)
+
+        routed: Counters = {}
+        for (metric, key), (count, total) in delta.items():
+            if metric in metrics and key not in existing[metric]:
+                if count > 0 and len(existing[metric]) < self.max_distinct_answers:
+                    existing[metric].add(key)
+                else:
+                    key = OTHER
+            entry = routed.setdefault((metric, key), [0, 0.0])
+            entry[0] += count
+            entry[1] += total
+        return routed
+
+    def _apply(self, db: Session, survey_id: str, delta: Counters):
+        """Add the deltas with one atomic upsert, safe across workers"""
+        rows = [
+            {"survey_id": survey_id, "metric": metric, "key": key, "count": count, "total": total}
+            for (metric, key), (count, total) in delta.items()
+        ]
+        dialect = db.bind.dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            insert = None
+
+        if insert is not None:
+            statement = insert(SurveyStatCounterDB).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=["survey_id", "metric", "key"],
+                set_={
+                    "count": SurveyStatCounterDB.count + statement.excluded.count,
+                    "total": SurveyStatCounterDB.total + statement.excluded.total,
+                    "updated_at": func.now(),
+                }
+            ))
+            return
+
+        for row in rows:
+            updated = db.query(SurveyStatCounterDB).filter(
+                SurveyStatCounterDB.survey_id == survey_id,
+                SurveyStatCounterDB.metric == row["metric"],
+                SurveyStatCounterDB.key == row["key"]
+            ).update({
+                SurveyStatCounterDB.count: SurveyStatCounterDB.count + row["count"],
+                SurveyStatCounterDB.total: SurveyStatCounterDB.total + row["total"],
+            }, synchronize_session=False)
+            if not updated:
+                db.add(SurveyStatCounterDB(**row))
+
+    def rebuild(self, db: Session, survey_id: str) -> int:
+        """Recompute a survey's counters from its responses; caller commits"""
+        db.query(SurveyStatCounterDB).filter(
+            SurveyStatCounterDB.survey_id == survey_id
+        ).delete(synchronize_session=False)
+
+        count = 0
+        totals: Counters = {}
+        query = db.query(ResponseDB).filter(ResponseDB.survey_id == survey_id).order_by(ResponseDB.created_at)
+        for response in query.yield_per(500):
+            for key, (n, total) in self.contribution(self.snapshot(response)).items():
+                entry = totals.setdefault(key, [0, 0.0])
+                entry[0] += n
+                entry[1] += total
+            count += 1
+
+        if totals:
+            self._apply(db, survey_id, self._route_answers(db, survey_id, totals))
+        return count
+
+    def backfill_missing(self):
+        """Build counters for surveys whose responses predate the current stats version"""
+        db = SessionLocal()
+        try:
+            initialized = db.query(SurveyStatCounterDB.survey_id).filter(
+                SurveyStatCounterDB.metric == "meta",
+                SurveyStatCounterDB.key == f"v{STATS_VERSION}"
+            )
+            missing = [
+                survey_id for (survey_id,) in db.query(ResponseDB.survey_id).distinct()
+                .filter(ResponseDB.survey_id.notin_(initialized)).all()
+            ]
+            for survey_id in missing:
+                count = self.rebuild(db, survey_id)
+                db.commit()
+                logger.info(f"✅ Built stats for survey {survey_id} from {count} responses")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Survey stats backfill failed: {e}")
+        finally:
+            db.close()
+
+    def get_stats(self, db: Session, survey_id: str) -> Dict[str, Any]:
+        """Assemble the stats document from the survey's counter rows"""
+        rows = db.query(SurveyStatCounterDB).filter(SurveyStatCounterDB.survey_id == survey_id).all()
+
+        counters = {(row.metric, row.key): row for row in rows}
+
+        def count(metric, key):
+            row = counters.get((metric, key))
+            return row.count if row else 0
+
+        def mean(metric, key):
+            row = counters.get((metric, key))
+            return round(row.total / row.count, 4) if row and row.count else None
+
+        total = count("responses", "total")
+        questions: Dict[str, Dict] = defaultdict(lambda: {"answered": 0, "answers": {}, "average_confidence": None})
+        numeric: Dict[str, Dict] = defaultdict(lambda: {"count": 0, "mean": None, "histogram": {}})
+
+        for (metric, key), row in counters.items():
+            kind, _, name = metric.partition(":")
+            if kind == "answered":
+                questions[name]["answered"] = row.count
+            elif kind == "answer" and row.count:
+                questions[name]["answers"][key] = row.count
+            elif kind == "confidence" and name:
+                questions[name]["average_confidence"] = mean(metric, key)
+            elif kind == "numeric":
+                numeric[name]["count"] = row.count
+                numeric[name]["mean"] = mean(metric, key)
+            elif kind == "hist" and row.count:
+                numeric[name]["histogram"][key] = row.count
+
+        return {
+            "survey_id": survey_id,
+            "total_responses": total,
+            "complete_responses": count("responses", "complete"),
+            "synced_responses": count("responses", "synced"),
+            "completion_rate": round(count("responses", "complete") / total, 4) if total else 0.0,
+            "average_confidence": mean("confidence", "all"),
+            "questions": dict(questions),
+            "numeric": dict(numeric),
+            "updated_at": max((row.updated_at for row in rows if row.updated_at), default=None),
+        }
@@ -0,0 +1,482 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy.orm import Session
+
+from ..models.response import ResponseDB
+from ..utils.privacy import SENSITIVE_FIELDS, mask_pii_in_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bookkeeping columns; answer columns are named after the question ("q3") or
+# question and extracted field ("q5.income")
+META_COLUMNS = ["_response_id", "_written_at", "_created_at", "_is_complete", "_lat", "_lng", "_geohash"]
+
+LOCK_FILE = ".compact.lock"
+
+
+class AnswerStoreError(Exception):
+    """Bad query against the answer store (unknown column, no data)"""
+
+
+def _partition_date(value: Optional[datetime]) -> str:
+    return (value or datetime.now(timezone.utc)).date().isoformat()
+
+
+class AnswerStoreService:
+    """Columnar copy of the non-sensitive answers, for analytics.
+
+    Every response write appends the response's current answers, flattened
+    to one typed column per question or extracted field, as a Parquet file
+    under <root>/survey_id=<id>/date=<created day>/ (hive layout, readable
+    by DuckDB or any Parquet reader). Sensitive fields are never written and
+    free text is PII-masked, so queries read only the columns they need and
+    never touch PrivacyService. Rows are versions: readers keep the latest
+    _written_at per _response_id, and compaction merges a day's small files
+    into one, dropping superseded versions.
+
+    Request handlers enqueue() rows; a background task writes the buffer
+    every ANSWER_STORE_FLUSH_INTERVAL seconds on an executor thread, so the
+    event loop never waits on Parquet encoding or disk.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("ANSWER_STORE_DIR", "answer_store")
+        self.compact_min_files = int(os.getenv("ANSWER_STORE_COMPACT_MIN_FILES", 8))
+        self.compact_interval = float(os.getenv("ANSWER_STORE_COMPACT_INTERVAL", 600))
+        self.flush_interval = float(os.getenv("ANSWER_STORE_FLUSH_INTERVAL", 2))
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._pending: Dict[tuple, List[Dict]] = {}
+        self._pending_lock = threading.Lock()
+
+        try:
+            import pyarrow  # noqa: F401
+            self.enabled = os.getenv("ANSWER_STORE_ENABLED", "true").lower() != "false"
+        except ImportError:
+            logger.warning("⚠️ pyarrow not installed, columnar answer store disabled")
+            self.enabled = False
+
+    def flatten(self, response: ResponseDB) -> Dict[str, Any]:
+        """One row of the store: bookkeeping columns plus non-sensitive answers"""
+        row = {
+            "_response_id": response.id,
+            "_written_at": datetime.now(timezone.utc),
+            "_created_at": response.created_at,
+            "_is_complete": bool(response.is_complete),
+            "_lat": response.location_lat,
+            "_lng": response.location_lng,
+            "_geohash": response.geohash,
+        }
+        for question_id, answer in (response.responses or {}).items():
+            if question_id in SENSITIVE_FIELDS:
+                continue
+            if isinstance(answer, dict):
+                # process-voice results: {"transcription": ..., "extracted_data": {...}}
+                extracted = answer.get("extracted_data", answer)
+                if isinstance(extracted, dict):
+                    for field, value in extracted.items():
+                        if field not in SENSITIVE_FIELDS:
+                            self._put(row, f"{question_id}.{field}", value)
+                if isinstance(answer.get("transcription"), str):
+                    self._put(row, question_id, answer["transcription"])
+            else:
+                self._put(row, question_id, answer)
+        return row
+
+    @staticmethod
+    def _put(row: Dict[str, Any], column: str, value):
+        if value is None or isinstance(value, dict):
+            return
+        if isinstance(value, list):
+            value = "|".join(str(item) for item in value if not isinstance(item, (dict, list)))
+        if isinstance(value, str):
+            value = mask_pii_in_text(value.strip())
+            if not value:
+                return
+        row[column] = value
+
+    def append(self, responses: Iterable[ResponseDB]):
+        """Write the current version of responses now; never raises"""
+        if not self.enabled:
+            return
+        try:
+            for (survey_id, day), rows in self._partition_rows(responses).items():
+                self._write(self._partition_dir(survey_id, day), rows)
+        except Exception as e:
+            logger.warning(f"⚠️ Answer store write failed: {e}")
+
+    def enqueue(self, responses: Iterable[ResponseDB]):
+        """Buffer the current version of responses for the background flush.
+
+        Rows are flattened here, while the ORM objects are still attached to
+        the request's session. Without a running flush task (scripts, tests)
+        this writes immediately like append().
+        """
+        if not self.enabled:
+            return
+        if self._flush_task is None:
+            self.append(responses)
+            return
+        try:
+            partitions = self._partition_rows(responses)
+        except Exception as e:
+            logger.warning(f"⚠️ Answer store write failed: {e}")
+            return
+        with self._pending_lock:
+            for key, rows in partitions.items():
+                self._pending.setdefault(key, []).extend(rows)
+
+    def flush(self) -> int:
+        """Write buffered rows, one file per survey and day; returns rows written"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        written = 0
+        for (survey_id, day), rows in pending.items():
+            try:
+                self._write(self._partition_dir(survey_id, day), rows)
+                written += len(rows)
+            except Exception as e:
+                logger.warning(f"⚠️ Answer store write failed: {e}")
+        return written
+
+    def _partition_rows(self, responses: Iterable[ResponseDB]) -> Dict[tuple, List[Dict]]:
+        partitions: Dict[tuple, List[Dict]] = {}
+        for response in responses:
+            key = (response.survey_id, _partition_date(response.created_at))
+            partitions.setdefault(key, []).append(self.flatten(response))
+        return partitions
+
+    def _partition_dir(self, survey_id: str, day: str) -> str:
+        return os.path.join(self.root, f"survey_id={survey_id}", f"date={day}")
+
+    def _write(self, directory: str, rows: List[Dict]) -> str:
+        import pyarrow as pa
+
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        return self._write_table(directory, pa.table({
+            column: self._array([row.get(column) for row in rows]) for column in columns
+        }))
+
+    @staticmethod
+    def _write_table(directory: str, table, prefix: str = "part") -> str:
+        import pyarrow.parquet as pq
+
+        os.makedirs(directory, exist_ok=True)
+        name = f"{prefix}-{datetime.now(timezone.utc):%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet"
+        temp_path = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(table, temp_path, compression="zstd")
+        # Readers skip dotfiles, so a file appears complete or not at all
+        os.replace(temp_path, os.path.join(directory, name))
+        return name
+
+    @staticmethod
+    def _array(values: List[Any]):
+        """Typed column: double for numbers, bool, timestamp, otherwise string"""
+        import pyarrow as pa
+
+        present = [value for value in values if value is not None]
+        if present and all(isinstance(value, bool) for value in present):
+            return pa.array(values, pa.bool_())
+        if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+            return pa.array([None if value is None else float(value) for value in values], pa.float64())
+        if present and all(isinstance(value, datetime) for value in present):
+            return pa.array([
+                value if value is None or value.tzinfo else value.replace(tzinfo=timezone.utc) for value in values
+            ], pa.timestamp("us", tz="UTC"))
+        return pa.array([None if value is None else str(value) for value in values], pa.string())
+
+    def _files(self, survey_id: str, date_from: Optional[date] = None,
+               date_to: Optional[date] = None) -> List[str]:
+        """Parquet files of a survey, pruned to the partitions in the date range"""
+        survey_dir = os.path.join(self.root, f"survey_id={survey_id}")
+        if not os.path.isdir(survey_dir):
+            return []
+        files = []
+        for partition in sorted(os.listdir(survey_dir)):
+            if not partition.startswith("date="):
+                continue
+            day = date.fromisoformat(partition[5:])
+            if (date_from and day < date_from) or (date_to and day > date_to):
+                continue
+            directory = os.path.join(survey_dir, partition)
+            files.extend(
+                os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                if name.endswith(".parquet") and not name.startswith(".")
+            )
+        return files
+
+    def columns(self, survey_id: str) -> Dict[str, str]:
+        """Answer columns of a survey and their unified types"""
+        return {
+            column: str(column_type)
+            for column, column_type in self._schema(self._files(survey_id)).items()
+            if column not in META_COLUMNS
+        }
+
+    @staticmethod
+    def _schema(files: List[str]) -> Dict[str, Any]:
+        """Column types across files (footers only); conflicting types become string"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types: Dict[str, Any] = {}
+        for path in files:
+            for field in pq.read_schema(path):
+                known = types.get(field.name)
+                if known is None:
+                    types[field.name] = field.type
+                elif known != field.type:
+                    types[field.name] = pa.string()
+        return types
+
+    def resolve(self, survey_id: str, name: str) -> str:
+        """Column for a question id, "q5.village", or a bare extracted field like "village" """
+        columns = self.columns(survey_id)
+        if name in columns:
+            return name
+        matches = [column for column in columns if column.rsplit(".", 1)[-1] == name]
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            raise AnswerStoreError(f"'{name}' is ambiguous: {', '.join(sorted(matches))}")
+        raise AnswerStoreError(f"Unknown answer column '{name}'")
+
+    def scan(self, survey_id: str, columns: List[str], date_from: Optional[date] = None,
+             date_to: Optional[date] = None):
+        """Latest version of every response, reading only the requested columns"""
+        return self._read(self._files(survey_id, date_from, date_to), columns)
+
+    def _read(self, files: List[str], columns: Optional[List[str]] = None):
+        """Files unified to one schema and deduplicated; all columns when columns is None"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        types = self._schema(files)
+        wanted = list(dict.fromkeys(["_response_id", "_written_at"] + (list(types) if columns is None else columns)))
+        tables = []
+        for path in files:
+            available = set(pq.read_schema(path).names)
+            table = pq.read_table(path, columns=[column for column in wanted if column in available])
+            arrays = []
+            for column in wanted:
+                column_type = types.get(column, pa.string())
+                if column in available:
+                    arrays.append(table.column(column).cast(column_type))
+                else:
+                    arrays.append(pa.nulls(table.num_rows, column_type))
+            tables.append(pa.table(arrays, names=wanted))
+
+        if not tables:
+            return pa.table({column: pa.array([], types.get(column, pa.string())) for column in wanted})
+
+        table = pa.concat_tables(tables)
+        if table.num_rows < 2:
+            return table
+        # Newest version first within each response, then keep the first row of each run
+        table = table.sort_by([("_response_id", "ascending"), ("_written_at", "descending")])
+        ids = table.column("_response_id")
+        first = pc.not_equal(ids.slice(1), ids.slice(0, len(ids) - 1))
+        keep = pa.concat_arrays([pa.array([True])] + [chunk for chunk in first.chunks])
+        return table.filter(keep)
+
+    @staticmethod
+    def _numbers(column):
+        """Numeric view of a column; strings like "12,000" are parsed, others dropped"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if pa.types.is_floating(column.type) or pa.types.is_integer(column.type):
+            return column.cast(pa.float64())
+        text = pc.replace_substring(column.cast(pa.string()), ",", "")
+        text = pc.if_else(pc.match_substring_regex(text, r"^\s*-?\d+(\.\d+)?\s*$"), text, None)
+        return pc.utf8_trim_whitespace(text).cast(pa.float64())
+
+    def group_by(self, survey_id: str, by: str, value: Optional[str] = None,
+                 date_from: Optional[date] = None, date_to: Optional[date] = None,
+                 limit: int = 100) -> Dict[str, Any]:
+        """Response counts per value of one column, with the mean of another"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        by_column = self.resolve(survey_id, by)
+        value_column = self.resolve(survey_id, value) if value else None
+        table = self.scan(survey_id, [by_column] + ([value_column] if value_column else []), date_from, date_to)
+
+        keys = table.column(by_column).cast(pa.string())
+        data = {"key": keys}
+        aggregations = [("key", "count", pc.CountOptions(mode="all"))]
+        if value_column:
+            data["value"] = self._numbers(table.column(value_column))
+            aggregations.append(("value", "mean"))
+        grouped = pa.table(data).group_by("key").aggregate(aggregations)
+        grouped = grouped.sort_by([("key_count", "descending")])
+
+        groups = []
+        for row in grouped.slice(0, limit).to_pylist():
+            group = {"value": row["key"], "count": row["key_count"]}
+            if value_column:
+                group["mean"] = round(row["value_mean"], 4) if row["value_mean"] is not None else None
+            groups.append(group)
+        return {
+            "survey_id": survey_id,
+            "by": by_column,
+            "value": value_column,
+            "responses": table.num_rows,
+            "groups": groups,
+        }
+
+    def quantiles(self, survey_id: str, field: str, q: List[float],
+                  date_from: Optional[date] = None, date_to: Optional[date] = None) -> Dict[str, Any]:
+        """Quantiles, mean and range of a numeric answer"""
+        import pyarrow.compute as pc
+
+        column = self.resolve(survey_id, field)
+        table = self.scan(survey_id, [column], date_from, date_to)
+        numbers = pc.drop_null(self._numbers(table.column(column)))
+        if not len(numbers):
+            raise AnswerStoreError(f"No numeric values for '{column}'")
+
+        values = pc.quantile(numbers, q=q, interpolation="linear").to_pylist()
+        return {
+            "survey_id": survey_id,
+            "field": column,
+            "count": len(numbers),
+            "mean": round(pc.mean(numbers).as_py(), 4),
+            "min": pc.min(numbers).as_py(),
+            "max": pc.max(numbers).as_py(),
+            "quantiles": {str(quantile): value for quantile, value in zip(q, values)},
+        }
+
+    def compact(self, survey_id: Optional[str] = None, min_files: Optional[int] = None) -> int:
+        """Merge partitions with many small files into one file each; returns files removed"""
+        if not self.enabled or not os.path.isdir(self.root):
+            return 0
+        min_files = min_files or self.compact_min_files
+        survey_dirs = [f"survey_id={survey_id}"] if survey_id else sorted(os.listdir(self.root))
+
+        removed = 0
+        for survey_dir in survey_dirs:
+            survey_path = os.path.join(self.root, survey_dir)
+            if not survey_dir.startswith("survey_id=") or not os.path.isdir(survey_path):
+                continue
+            for partition in sorted(os.listdir(survey_path)):
+                directory = os.path.join(survey_path, partition)
+                if os.path.isdir(directory):
+                    removed += self._compact_partition(directory, min_files)
+        return removed
+
+    def _compact_partition(self, directory: str, min_files: int) -> int:
+        import pyarrow.parquet as pq
+
+        files = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.endswith(".parquet") and not name.startswith(".")
+        )
+        if len(files) < min_files or not self._lock(directory):
+            return 0
+        try:
+            rows = sum(pq.ParquetFile(path).metadata.num_rows for path in files)
+            table = self._read(files)
+            # Readers deduplicate, so the merged file may briefly coexist with its inputs
+            self._write_table(directory, table, prefix="compact")
+            for path in files:
+                os.remove(path)
+            logger.info(f"✅ Compacted {len(files)} files ({rows} rows) into {table.num_rows} rows in {directory}")
+            return len(files)
+        finally:
+            os.remove(os.path.join(directory, LOCK_FILE))
+
+    @staticmethod
+    def _lock(directory: str) -> bool:
+        """One compactor or rebuild per partition across workers; locks older than an hour are stale"""
+        path = os.path.join(directory, LOCK_FILE)
+        try:
+            if time.time() - os.path.getmtime(path) > 3600:
+                os.remove(path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def rebuild(self, db: Session, survey_id: str, batch_size: int = 5000) -> int:
+        """Rewrite a survey's store from the database, e.g. after enabling it"""
+        # Buffered rows are committed already, so the query below re-reads them
+        with self._pending_lock:
+            self._pending = {key: rows for key, rows in self._pending.items() if key[0] != survey_id}
+        self._remove_survey(survey_id)
+        count = 0
+        batch = []
+        query = db.query(ResponseDB).filter(ResponseDB.survey_id == survey_id).order_by(ResponseDB.created_at)
+        for response in query.yield_per(500):
+            batch.append(response)
+            if len(batch) >= batch_size:
+                self.append(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.append(batch)
+            count += len(batch)
+        self.compact(survey_id, min_files=2)
+        return count
+
+    def _remove_survey(self, survey_id: str):
+        """Delete a survey's partitions, each once no compactor holds it"""
+        import shutil
+
+        survey_path = os.path.join(self.root, f"survey_id={survey_id}")
+        if not os.path.isdir(survey_path):
+            return
+        for partition in sorted(os.listdir(survey_path)):
+            directory = os.path.join(survey_path, partition)
+            if not os.path.isdir(directory):
+                continue
+            while not self._lock(directory):
+                time.sleep(1)
+            # Removes the lock along with the partition
+            shutil.rmtree(directory, ignore_errors=True)
+        shutil.rmtree(survey_path, ignore_errors=True)
+
+    async def start(self):
+        """Start the buffered-write flush and the periodic compaction job"""
+        if not self.enabled:
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        if self.compact_interval > 0:
+            self._task = asyncio.create_task(self._compaction_loop())
+
+    async def stop(self):
+        for task in (self._flush_task, self._task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._flush_task = self._task = None
+        # Rows enqueued since the last flush
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.flush)
+            except Exception as e:
+                logger.error(f"❌ Answer store flush failed: {e}")
+
+    async def _compaction_loop(self):
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.compact)
+            except Exception as e:
+                logger.error(f"❌ Answer store compaction failed: {e}")
@@ -0,0 +1,330 @@
+import bisect
+import math
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from ..database import SessionLocal
+from ..models.response import ResponseDB
+from ..utils.privacy import SENSITIVE_FIELDS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 64 MinHash rows in 8 bands of 8: pairs above ~0.77 Jaccard similarity
+# become candidates (0.9 -> 99%), unrelated short answer vectors rarely do
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 8
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+# Most recent members kept per bucket: common answers ("q1=yes") can put
+# thousands of responses in one bucket, and candidates must stay bounded
+LSH_BUCKET_SIZE = 16
+
+_rng = np.random.RandomState(20240917)
+_PERM_A = _rng.randint(1, 2 ** 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.randint(0, 2 ** 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+METERS_PER_DEGREE = 111320.0
+
+
+def _utc(value: Optional[datetime]) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class _LRU(OrderedDict):
+    """OrderedDict that evicts its least recently used entries past maxsize"""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def touch(self, key, factory):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        value = self[key] = factory()
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+        return value
+
+
+class _Timeline:
+    """Sorted (timestamp, response_id) events, one per response id, capped to
+    the most recent ones"""
+
+    __slots__ = ("events", "times")
+
+    def __init__(self):
+        self.events: List[Tuple[float, str]] = []
+        self.times: Dict[str, float] = {}
+
+    def add(self, timestamp: float, response_id: str, cap: int):
+        """Record a response, replacing its event from an earlier evaluation"""
+        previous = self.times.get(response_id)
+        if previous == timestamp:
+            return
+        if previous is not None:
+            self.events.pop(bisect.bisect_left(self.events, (previous, response_id)))
+        bisect.insort(self.events, (timestamp, response_id))
+        self.times[response_id] = timestamp
+        if len(self.events) > cap:
+            del self.times[self.events.pop(0)[1]]
+
+    def count_between(self, start: float, end: float, exclude: Optional[str] = None) -> int:
+        count = bisect.bisect_right(self.events, (end, "\uffff")) - bisect.bisect_left(self.events, (start, ""))
+        if exclude is not None and start <= self.times.get(exclude, math.nan) <= end:
+            count -= 1
+        return count
+
+    def nearest_gap(self, timestamp: float, response_id: str) -> Optional[float]:
+        """Seconds to the closest event of another response"""
+        index = bisect.bisect_left(self.events, (timestamp, ""))
+        gaps = []
+        for step in (-1, 1):
+            neighbour = index if step == 1 else index - 1
+            while 0 <= neighbour < len(self.events) and self.events[neighbour][1] == response_id:
+                neighbour += step
+            if 0 <= neighbour < len(self.events):
+                gaps.append(abs(timestamp - self.events[neighbour][0]))
+        return min(gaps) if gaps else None
+
+
+class FraudDetectionEngine:
+    """Streaming curbstoning checks run on every synced response.
+
+    Keeps bounded in-memory state per process: MinHash signatures of the
+    most recent answer vectors in a fixed ring with LSH buckets
+    (near-duplicate interviews), a timeline per device (interviews closer
+    together than a questionnaire can be read, bursts per hour) and per
+    ~30 m grid cell (many interviews at one spot). Flags are advisory, for
+    supervisors to review; nothing is rejected.
+    """
+
+    def __init__(self):
+        self.duplicate_similarity = float(os.getenv("FRAUD_DUPLICATE_SIMILARITY", 0.9))
+        self.duplicate_min_answers = int(os.getenv("FRAUD_DUPLICATE_MIN_ANSWERS", 5))
+        self.min_interview_seconds = float(os.getenv("FRAUD_MIN_INTERVIEW_SECONDS", 180))
+        self.min_seconds_per_answer = float(os.getenv("FRAUD_MIN_SECONDS_PER_ANSWER", 15))
+        self.device_max_per_hour = int(os.getenv("FRAUD_DEVICE_MAX_PER_HOUR", 8))
+        self.gps_cluster_meters = float(os.getenv("FRAUD_GPS_CLUSTER_METERS", 30))
+        self.gps_cluster_max = int(os.getenv("FRAUD_GPS_CLUSTER_MAX", 6))
+        self.gps_window = float(os.getenv("FRAUD_GPS_WINDOW_HOURS", 24)) * 3600
+        self.window_size = int(os.getenv("FRAUD_SIGNATURE_WINDOW", 50000))
+        self.events_per_key = int(os.getenv("FRAUD_EVENTS_PER_KEY", 64))
+
+        # Ring of the last window_size signatures; buckets hold slot numbers
+        self._matrix = np.zeros((self.window_size, MINHASH_PERMUTATIONS), dtype=np.uint32)
+        # slot -> (response_id, survey_id, device_id)
+        self._owners: List[Optional[Tuple[str, str, Optional[str]]]] = [None] * self.window_size
+        self._slots: Dict[str, int] = {}
+        self._next_slot = 0
+        self._buckets: Dict[int, List[int]] = {}
+        self._devices = _LRU(int(os.getenv("FRAUD_MAX_DEVICES", 20000)))
+        self._cells = _LRU(int(os.getenv("FRAUD_MAX_CELLS", 100000)))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def answer_tokens(responses: Dict[str, Any]) -> List[str]:
+        """Shingles of an answer vector: question=value pairs and transcript word triples"""
+        tokens = []
+        for question_id, answer in (responses or {}).items():
+            if question_id in SENSITIVE_FIELDS or answer is None:
+                continue
+            if isinstance(answer, dict):
+                extracted = answer.get("extracted_data", answer)
+                if isinstance(extracted, dict):
+                    tokens.extend(
+                        f"{question_id}.{field}={str(value).strip().casefold()}"
+                        for field, value in extracted.items()
+                        if field not in SENSITIVE_FIELDS and value not in (None, "", [], {})
+                    )
+                words = str(answer.get("transcription") or "").casefold().split()
+                tokens.extend(f"{question_id}~{' '.join(words[i:i + 3])}" for i in range(max(0, len(words) - 2)))
+            elif isinstance(answer, list):
+                tokens.extend(f"{question_id}={str(value).strip().casefold()}" for value in answer)
+            elif str(answer).strip():
+                tokens.append(f"{question_id}={str(answer).strip().casefold()}")
+        return tokens
+
+    @staticmethod
+    def signature(tokens: List[str]) -> np.ndarray:
+        """MinHash signature: per permutation, the minimum of (a*x + b) mod 2^32 over token hashes"""
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in set(tokens)), dtype=np.uint64)
+        return ((np.outer(hashes, _PERM_A) + _PERM_B) & _MASK32).min(axis=0).astype(np.uint32)
+
+    def evaluate(self, response: ResponseDB) -> List[Dict[str, Any]]:
+        """Flags for one response, recording it in the streaming state.
+
+        Sensitive fields are never used, so encrypted and plaintext answers
+        give the same result. Re-evaluating a response id replaces its
+        earlier signature.
+        """
+        created = _utc(response.created_at)
+        timestamp = created.timestamp()
+        device_id = (response.device_info or {}).get("device_id")
+        flags: List[Dict[str, Any]] = []
+
+        with self._lock:
+            if created > datetime.now(timezone.utc) + timedelta(minutes=10):
+                flags.append({"type": "future_timestamp", "detail": f"created_at {created.isoformat()} is in the future"})
+
+            tokens = self.answer_tokens(response.responses)
+            answered = sum(1 for token in tokens if "=" in token)
+            if answered >= self.duplicate_min_answers:
+                flags.extend(self._check_duplicates(response.id, response.survey_id, self.signature(tokens), device_id))
+
+            if device_id:
+                flags.extend(self._check_device(response.id, device_id, timestamp, answered))
+
+            if response.location_lat is not None and response.location_lng is not None:
+                flags.extend(self._check_location(
+                    response.id, response.survey_id, response.location_lat, response.location_lng, timestamp
+                ))
+        return flags
+
+    @staticmethod
+    def _band_keys(survey_id: str, signature: np.ndarray) -> List[int]:
+        # Hash collisions only add candidates, which are then compared in full
+        return [
+            hash((survey_id, band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()))
+            for band in range(LSH_BANDS)
+        ]
+
+    def _check_duplicates(self, response_id: str, survey_id: str, signature: np.ndarray,
+                          device_id: Optional[str]) -> List[Dict[str, Any]]:
+        self._forget(response_id)
+
+        keys = self._band_keys(survey_id, signature)
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+
+        match = None
+        if candidates:
+            # All candidates compared in one vectorised pass over the ring
+            slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            agreement = np.count_nonzero(self._matrix[slots] == signature, axis=1)
+            best = int(agreement.argmax())
+            similarity = agreement[best] / MINHASH_PERMUTATIONS
+            if similarity >= self.duplicate_similarity:
+                match = (self._owners[slots[best]], float(similarity))
+
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.window_size
+        if self._owners[slot] is not None:
+            self._forget(self._owners[slot][0])
+        self._matrix[slot] = signature
+        self._owners[slot] = (response_id, survey_id, device_id)
+        self._slots[response_id] = slot
+        for key in keys:
+            bucket = self._buckets.setdefault(key, [])
+            bucket.append(slot)
+            if len(bucket) > LSH_BUCKET_SIZE:
+                del bucket[0]
+
+        if match is None:
+            return []
+        (matched_id, _, matched_device), similarity = match
+        return [{
+            "type": "near_duplicate",
+            "matched_response_id": matched_id,
+            "similarity": round(similarity, 3),
+            "same_device": device_id is not None and matched_device == device_id,
+        }]
+
+    def _forget(self, response_id: str):
+        slot = self._slots.pop(response_id, None)
+        if slot is None:
+            return
+        for key in self._band_keys(self._owners[slot][1], self._matrix[slot]):
+            bucket = self._buckets.get(key)
+            if bucket and slot in bucket:
+                bucket.remove(slot)
+                if not bucket:
+                    del self._buckets[key]
+        self._owners[slot] = None
+
+    def _check_device(self, response_id: str, device_id: str, timestamp: float,
+                      answered: int) -> List[Dict[str, Any]]:
+        flags = []
+        timeline = self._devices.touch(device_id, _Timeline)
+        timeline.add(timestamp, response_id, self.events_per_key)
+
+        # Consent, questions and answers take at least this long
+        minimum = max(self.min_interview_seconds, answered * self.min_seconds_per_answer)
+        gap = timeline.nearest_gap(timestamp, response_id)
+        if gap is not None and gap < minimum:
+            flags.append({
+                "type": "impossible_duration",
+                "detail": f"{gap:.0f}s from another interview on device {device_id}, minimum {minimum:.0f}s",
+            })
+
+        # This interview plus the others on the device in the preceding hour
+        per_hour = timeline.count_between(timestamp - 3600, timestamp, exclude=response_id) + 1
+        if per_hour > self.device_max_per_hour:
+            flags.append({"type": "device_rate", "detail": f"{per_hour} interviews in an hour on device {device_id}"})
+        return flags
+
+    def _check_location(self, response_id: str, survey_id: str, lat: float, lng: float,
+                        timestamp: float) -> List[Dict[str, Any]]:
+        # Grid of gps_cluster_meters cells; counting the 3x3 block around a
+        # point catches clusters that straddle a cell edge
+        lat_step = self.gps_cluster_meters / METERS_PER_DEGREE
+        lng_step = lat_step / max(0.01, math.cos(math.radians(round(lat, 1))))
+        row, column = int(lat // lat_step), int(lng // lng_step)
+
+        timeline = self._cells.touch((survey_id, row, column), _Timeline)
+        timeline.add(timestamp, response_id, self.events_per_key)
+
+        nearby = 1
+        for d_row in (-1, 0, 1):
+            for d_column in (-1, 0, 1):
+                neighbour = self._cells.get((survey_id, row + d_row, column + d_column))
+                if neighbour is not None:
+                    nearby += neighbour.count_between(
+                        timestamp - self.gps_window, timestamp + self.gps_window, exclude=response_id
+                    )
+        if nearby <= self.gps_cluster_max:
+            return []
+        return [{
+            "type": "gps_cluster",
+            "detail": f"{nearby} interviews within ~{self.gps_cluster_meters * 1.5:.0f} m in {self.gps_window / 3600:.0f}h",
+        }]
+
+    def warm_up(self, hours: float = 24, limit: int = 50000) -> int:
+        """Replay recent responses so checks see interviews synced before a restart"""
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        db = SessionLocal()
+        try:
+            rows = db.query(ResponseDB).filter(ResponseDB.created_at >= since.replace(tzinfo=None)) \
+                .order_by(ResponseDB.created_at.desc()).limit(limit).all()
+            for row in reversed(rows):
+                self.evaluate(row)
+            if rows:
+                logger.info(f"✅ Fraud detection warmed up with {len(rows)} recent responses")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"❌ Fraud detection warm-up failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+
+def apply_flags(response: ResponseDB, flags: List[Dict[str, Any]]):
+    """Store flags on a response; verification data's is_duplicate follows the near-duplicate flag"""
+    response.fraud_flags = flags or None
+    duplicate = any(flag["type"] == "near_duplicate" for flag in flags)
+    verification = dict(response.verification_data or {})
+    # Cleared once an update removes the flag; not added to clean responses
+    if duplicate or "is_duplicate" in verification:
+        verification["is_duplicate"] = duplicate
+        response.verification_data = verification
@@ -0,0 +1,559 @@
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from ..utils.geohash import EARTH_RADIUS_M
+from ..utils.option_index import (
+    OptionIndex, bounded_distance, keyed_words, phonetic_keys, spelling, spelling_distance
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Administrative levels, largest first; a place's parent is at an earlier level
+LEVELS = ["state", "district", "block", "village"]
+
+# Bumped when the compiled layout changes, so old index directories are rebuilt
+INDEX_FORMAT = 1
+
+ENTRY_FIELDS = [
+    ("code", "<u4"), ("level", "u1"), ("parent", "<i4"),
+    ("lat", "<f4"), ("lng", "<f4"), ("name", "<u4"), ("name_hi", "<u4"),
+]
+NO_NAME = 0xFFFFFFFF
+
+# Words around a place name that are never one themselves ("रामपुर गांव में", "I live in Rampur")
+STOPWORDS = (
+    "मैं में से का की के है हूँ हैं हम मेरा मेरी हमारा रहता रहती रहते घर पास "
+    "main mein se ka ki ke hai hun hoon hum mera meri hamara rahta rahti ghar paas "
+    "i am in at from of the my our live lives near"
+)
+
+# Level words that follow a name: "सीतापुर जिला", "Rampur village", "Mahmudabad block"
+LEVEL_WORDS = {
+    "village": "गांव गाँव ग्राम gaon gaanv gram village",
+    "block": "ब्लॉक तहसील प्रखंड तालुका block tehsil tahsil taluka mandal",
+    "district": "जिला जिले ज़िला jila zila district",
+    "state": "राज्य rajya state",
+}
+
+# Score added when an ancestor is also named in the text ("Rampur, Sitapur"),
+# times how well that name matched
+HIERARCHY_BONUS = 0.2
+# Score added when the name is followed by its level word
+LEVEL_BONUS = 0.1
+# Score added at the response's GPS point, falling to 0 at the radius
+GPS_BONUS = 0.3
+# Score taken per edit a name is spelled further from the mention than
+# another candidate's for the same words ("Rampura" keys like "Rampur"),
+# counting up to SPELLING_MAX_EDITS
+SPELLING_PENALTY = 0.05
+SPELLING_MAX_EDITS = 3
+
+# A compile lock older than this was left by a process that died
+COMPILE_LOCK_STALE_SECONDS = 3600
+
+
+def _key(name: str) -> Tuple[str, int]:
+    """(index key, word count) of a place name: its phonetic keys joined, so
+    "Ram Pur" and "Rampur" share one"""
+    keys = phonetic_keys(name or "")
+    return "".join(keys), len(keys)
+
+
+class GazetteerService:
+    """Resolves spoken place names to gazetteer entries with their LGD codes.
+
+    The gazetteer is a CSV of states, districts, blocks and villages:
+    code, level, name, name_hi, parent_code, lat, lng (parent_code is the
+    code of the place one level up, lat/lng may be empty). load() compiles
+    it once into index_dir and memory-maps the result, so restarts and
+    worker processes share the pages instead of each parsing ~650k rows:
+
+    - keys.marisa: phonetic keys (utils.option_index, so "Raampur",
+      "rampur" and "रामपुर" agree) of every English and Hindi name; a
+      key's id picks its entry numbers out of key_entries.npy via
+      key_offsets.npy
+    - deletes.marisa: every key with one letter deleted -> key id and
+      the deleted position
+    - names.marisa: display names, referenced by id from entries
+    - entries.npy: one fixed-size record per place (code, level, parent
+      entry, lat/lng, name ids)
+
+    Names are looked up exactly over windows of one to a few words. Typos
+    are found by symmetric deletion: a window and a key one edit apart
+    agree once a letter is deleted from one or both, so the window and its
+    one-letter deletions are looked up in keys.marisa and deletes.marisa -
+    a few dozen exact lookups instead of comparing against every name -
+    and the keys found are edit-distance checked. Candidates are ranked by match
+    score plus bonuses for ancestors also mentioned ("Rampur, Sitapur"),
+    a level word after the name ("Sitapur district") and closeness to the
+    response's GPS point, which is what tells apart the many villages
+    sharing a name. Names sharing a key (Rampur, Rampura) are told apart
+    by how close their spelling is to the mention's.
+
+    Compiling takes a lock file next to index_dir, so of several workers
+    starting on a stale index one compiles and the rest wait and open its
+    result. Large gazetteers are better compiled at deploy time:
+
+        python -m app.services.gazetteer [--path data/gazetteer.csv] [--index-dir gazetteer_index]
+    """
+
+    def __init__(self, path: Optional[str] = None, index_dir: Optional[str] = None):
+        self.path = path or os.getenv("GAZETTEER_PATH", "data/gazetteer.csv")
+        self.index_dir = index_dir or os.getenv("GAZETTEER_INDEX_DIR", "gazetteer_index")
+        self.gps_radius_km = float(os.getenv("GAZETTEER_GPS_RADIUS_KM", 25))
+        self.enabled = False
+        self.keys = None
+        self.key_offsets = None
+        self.key_entries = None
+        self.deletes = None
+        self.names = None
+        self.entries = None
+        self.max_words = 1
+
+        self.level_keys = {
+            key: level for level, words in LEVEL_WORDS.items() for key in phonetic_keys(words)
+        }
+        self.skip_keys = set(phonetic_keys(STOPWORDS)) | set(self.level_keys)
+
+    def __len__(self) -> int:
+        return len(self.entries) if self.entries is not None else 0
+
+    def load(self) -> bool:
+        """Memory-map the compiled index, compiling it first when the CSV is newer"""
+        try:
+            import marisa_trie  # noqa: F401
+            import numpy  # noqa: F401
+        except ImportError:
+            logger.warning("⚠️ marisa-trie/numpy not installed, location resolution disabled")
+            return False
+
+        try:
+            if not self._index_current():
+                if not os.path.exists(self.path):
+                    logger.warning(f"⚠️ No gazetteer at {self.path}, location resolution disabled")
+                    return False
+                self.compile(if_stale=True)
+            self._open()
+        except Exception as e:
+            logger.error(f"❌ Gazetteer load failed: {e}")
+            self.enabled = False
+            return False
+
+        self.enabled = True
+        logger.info(f"✅ Gazetteer loaded: {len(self)} places from {self.index_dir}")
+        return True
+
+    def _meta_path(self, directory: Optional[str] = None) -> str:
+        return os.path.join(directory or self.index_dir, "meta.json")
+
+    def _source_stamp(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        stat = os.stat(self.path)
+        return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+    def _index_current(self) -> bool:
+        """Compiled index exists, has this format and was built from the
+        current CSV (a deployment may ship the index without the CSV)"""
+        try:
+            with open(self._meta_path(), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if meta.get("format") != INDEX_FORMAT:
+            return False
+        stamp = self._source_stamp()
+        return stamp is None or meta.get("source") == stamp
+
+    def compile(self, if_stale: bool = False) -> bool:
+        """Build the index files from the CSV, replacing index_dir atomically.
+
+        One process compiles at a time. With if_stale, a process that had to
+        wait for another's compile uses that index instead of compiling
+        again. Returns whether this call compiled.
+        """
+        # Lock, staging directory and index_dir share a parent, so the swap is a rename
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_dir)), exist_ok=True)
+        lock = self.index_dir.rstrip("/\\") + ".lock"
+        while not self._acquire(lock):
+            time.sleep(1)
+        try:
+            if if_stale and self._index_current():
+                return False
+            self._compile()
+            return True
+        finally:
+            try:
+                os.remove(lock)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _acquire(lock: str) -> bool:
+        try:
+            if time.time() - os.path.getmtime(lock) > COMPILE_LOCK_STALE_SECONDS:
+                os.remove(lock)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def _compile(self):
+        import marisa_trie
+        import numpy as np
+
+        with open(self.path, encoding="utf-8", newline="") as f:
+            rows = [row for row in csv.DictReader(f) if row.get("code") and row.get("level") in LEVELS]
+
+        # Entry number of each (level, code); a parent is looked up one level up first
+        numbers = {(row["level"], int(row["code"])): number for number, row in enumerate(rows)}
+        names = {row["name"].strip() for row in rows} | {(row.get("name_hi") or "").strip() for row in rows}
+        name_trie = marisa_trie.Trie(sorted(names - {""}))
+
+        codes, levels, parents, lats, lngs, name_ids, name_hi_ids = ([] for _ in range(7))
+        entry_keys, label_keys, max_words = {}, {}, 1
+        for number, row in enumerate(rows):
+            level = LEVELS.index(row["level"])
+            parent = -1
+            if row.get("parent_code"):
+                for parent_level in reversed(LEVELS[:level]):
+                    parent = numbers.get((parent_level, int(row["parent_code"])), -1)
+                    if parent >= 0:
+                        break
+            name, name_hi = row["name"].strip(), (row.get("name_hi") or "").strip()
+            codes.append(int(row["code"]))
+            levels.append(level)
+            parents.append(parent)
+            lats.append(float(row["lat"]) if row.get("lat") else math.nan)
+            lngs.append(float(row["lng"]) if row.get("lng") else math.nan)
+            name_ids.append(name_trie[name] if name else NO_NAME)
+            name_hi_ids.append(name_trie[name_hi] if name_hi else NO_NAME)
+            for label in (name, name_hi):
+                if label not in label_keys:
+                    label_keys[label] = _key(label)
+                key, words = label_keys[label]
+                if key:
+                    entry_keys.setdefault(key, set()).add(number)
+                    max_words = max(max_words, words)
+
+        entries = np.zeros(len(rows), dtype=np.dtype(ENTRY_FIELDS))
+        for field, values in zip(entries.dtype.names, (codes, levels, parents, lats, lngs, name_ids, name_hi_ids)):
+            entries[field] = values
+
+        # Entry numbers grouped by key id: key_entries[key_offsets[id]:key_offsets[id + 1]]
+        key_trie = marisa_trie.Trie(entry_keys)
+        by_id = sorted((key_trie[key], sorted(entries_of_key)) for key, entries_of_key in entry_keys.items())
+        key_offsets = np.zeros(len(by_id) + 1, dtype="<u4")
+        key_offsets[1:] = np.cumsum([len(entries_of_key) for _, entries_of_key in by_id])
+        key_entries = np.fromiter((number for _, entries_of_key in by_id for number in entries_of_key),
+                                  dtype="<u4", count=int(key_offsets[-1]))
+        deletes = marisa_trie.RecordTrie("<IB", (
+            (key[:position] + key[position + 1:], (key_trie[key], position))
+            for key in entry_keys if OptionIndex.allowed_distance(len(key))
+            for position in range(min(len(key), 256))
+        ))
+
+        staging = tempfile.mkdtemp(prefix=os.path.basename(self.index_dir.rstrip("/\\")) + ".tmp-",
+                                   dir=os.path.dirname(os.path.abspath(self.index_dir)))
+        try:
+            # mkdtemp is private to its user; the index may be compiled at deploy time
+            os.chmod(staging, 0o755)
+            self._save(staging, key_trie, deletes, name_trie, key_offsets, key_entries, entries, max_words)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # Readers that mapped the old files keep them until they reopen
+        previous = staging + ".old"
+        if os.path.exists(self.index_dir):
+            os.replace(self.index_dir, previous)
+        os.replace(staging, self.index_dir)
+        shutil.rmtree(previous, ignore_errors=True)
+        logger.info(f"✅ Gazetteer compiled: {len(rows)} places, {len(entry_keys)} name keys")
+
+    def _save(self, staging: str, key_trie, deletes, name_trie, key_offsets, key_entries, entries, max_words: int):
+        import numpy as np
+
+        key_trie.save(os.path.join(staging, "keys.marisa"))
+        deletes.save(os.path.join(staging, "deletes.marisa"))
+        name_trie.save(os.path.join(staging, "names.marisa"))
+        np.save(os.path.join(staging, "key_offsets.npy"), key_offsets)
+        np.save(os.path.join(staging, "key_entries.npy"), key_entries)
+        np.save(os.path.join(staging, "entries.npy"), entries)
+        with open(self._meta_path(staging), "w", encoding="utf-8") as f:
+            json.dump({"format": INDEX_FORMAT, "source": self._source_stamp(),
+                       "entries": len(entries), "max_words": max_words}, f)
+
+    def _open(self):
+        import marisa_trie
+        import numpy as np
+
+        with open(self._meta_path(), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.keys = marisa_trie.Trie().mmap(os.path.join(self.index_dir, "keys.marisa"))
+        self.deletes = marisa_trie.RecordTrie("<IB").mmap(os.path.join(self.index_dir, "deletes.marisa"))
+        self.names = marisa_trie.Trie().mmap(os.path.join(self.index_dir, "names.marisa"))
+        self.key_offsets = np.load(os.path.join(self.index_dir, "key_offsets.npy"), mmap_mode="r")
+        self.key_entries = np.load(os.path.join(self.index_dir, "key_entries.npy"), mmap_mode="r")
+        self.entries = np.load(os.path.join(self.index_dir, "entries.npy"), mmap_mode="r")
+        self.max_words = int(meta.get("max_words", 1))
+
+    def resolve(self, text: str, lat: Optional[float] = None, lng: Optional[float] = None,
+                level: Optional[str] = None, limit: int = 1) -> List[Dict[str, Any]]:
+        """Places named in text, best first.
+
+        lat/lng (the response's GPS point) favour places within
+        gps_radius_km; level keeps only places of that level.
+        """
+        import numpy as np
+
+        if not self.enabled or not text:
+            return []
+        tokens, words = keyed_words(text)
+        if not tokens:
+            return []
+        level_number = LEVELS.index(level) if level in LEVELS else None
+
+        # entry -> (match score, start, end) of its best window. A near-miss
+        # near the GPS point or under another place named in the text can
+        # beat an exact name (a typo that spells another village), so then
+        # windows with exact matches are fuzzy-matched too
+        found = self._exact(tokens)
+        covered = set()
+        if (lat is None or lng is None) and len({match[1:] for match in found.values()}) < 2:
+            exact = np.fromiter(found, dtype=np.int64, count=len(found))
+            if level_number is not None:
+                exact = exact[self.entries["level"][exact] == level_number]
+            for entry in exact.tolist():
+                covered.update(range(found[entry][1], found[entry][2]))
+        for entry, match in self._fuzzy(tokens, covered).items():
+            found.setdefault(entry, match)
+        if not found:
+            return []
+
+        mentioned = np.fromiter(found, dtype=np.int64, count=len(found))
+        matches = np.array(list(found.values()))
+        records = self.entries[mentioned]
+        keep = records["level"] == level_number if level_number is not None else np.ones(len(found), dtype=bool)
+        if not keep.any():
+            return []
+        candidates, matches, records = mentioned[keep], matches[keep], records[keep]
+        scores, starts, ends = matches[:, 0], matches[:, 1].astype(np.int64), matches[:, 2].astype(np.int64)
+        scores -= SPELLING_PENALTY * self._spelling_excess(words, records, scores, starts, ends)
+        ancestors = self._ancestor_rows(records["parent"].astype(np.int64))
+
+        # Ancestors named elsewhere in the text ("Rampur, Sitapur"), the best matched one counting
+        named = np.zeros(len(candidates))
+        for column in ancestors.T:
+            for row in np.flatnonzero(np.isin(column, mentioned)).tolist():
+                score, start, end = found[int(column[row])]
+                if end <= starts[row] or start >= ends[row]:
+                    named[row] = max(named[row], score)
+        scores += HIERARCHY_BONUS * named
+
+        # A level word right after the name ("Sitapur district")
+        hints = np.array([LEVELS.index(self.level_keys[token]) if token in self.level_keys else -1
+                          for token in tokens[1:]] + [-1])
+        scores += LEVEL_BONUS * (hints[ends - 1] == records["level"])
+
+        distances = None
+        if lat is not None and lng is not None:
+            distances = self._distances_km(records, ancestors, lat, lng)
+            scores += GPS_BONUS * np.clip(1 - distances / self.gps_radius_km, 0.0, 1.0)
+
+        # Larger places first on ties: a bare "Sitapur" is more likely the district
+        order = np.lexsort((candidates, records["level"], -scores))[:max(1, limit)]
+        return [
+            self._describe(int(candidates[row]), float(scores[row]),
+                           None if distances is None or np.isnan(distances[row]) else round(float(distances[row]), 2))
+            for row in order.tolist()
+        ]
+
+    def _spelling_excess(self, words: List[str], records, scores, starts, ends):
+        """Per candidate, how many edits further its closest name is spelled
+        from the mentioned words than the closest name of the candidates tied
+        with it: matched on the same words with the same, best score for
+        those words. Lower-scored matches are left as they are"""
+        import numpy as np
+
+        spans, span_rows = np.unique(starts * (len(words) + 1) + ends, return_inverse=True)
+        span_rows = span_rows.ravel()
+        top = np.full(len(spans), -np.inf)
+        np.maximum.at(top, span_rows, scores)
+        tied = np.flatnonzero(scores == top[span_rows])
+        tied = tied[np.bincount(span_rows[tied], minlength=len(spans))[span_rows[tied]] > 1]
+        excess = np.zeros(len(scores))
+        if not len(tied):
+            return excess
+
+        # Many candidates share a name (every "Rampur"): one distance per
+        # span and name
+        mentions: Dict[int, Any] = {}
+        names: Dict[int, Any] = {}
+        distances: Dict[Tuple[int, int], float] = {}
+        spelled = np.empty(len(tied))
+        for position, (span, start, end, name_id, name_hi_id) in enumerate(zip(
+                span_rows[tied].tolist(), starts[tied].tolist(), ends[tied].tolist(),
+                records["name"][tied].tolist(), records["name_hi"][tied].tolist())):
+            closest = math.inf
+            for label_id in (name_id, name_hi_id):
+                if label_id == NO_NAME:
+                    continue
+                if (span, label_id) not in distances:
+                    if span not in mentions:
+                        mentions[span] = spelling(words[start:end])
+                    if label_id not in names:
+                        names[label_id] = spelling(keyed_words(self._name(label_id))[1])
+                    distances[(span, label_id)] = spelling_distance(mentions[span], names[label_id], SPELLING_MAX_EDITS)
+                closest = min(closest, distances[(span, label_id)])
+            spelled[position] = closest if closest < math.inf else 0.0
+        nearest = np.full(len(spans), np.inf)
+        np.minimum.at(nearest, span_rows[tied], spelled)
+        excess[tied] = spelled - nearest[span_rows[tied]]
+        return excess
+
+    def _windows(self, tokens: List[str]) -> Iterable[Tuple[str, int, int]]:
+        """(joined key, start, end) of runs of up to max_words tokens that
+        neither start nor end with a stopword or level word"""
+        for width in range(min(self.max_words, len(tokens)), 0, -1):
+            for start in range(len(tokens) - width + 1):
+                end = start + width
+                if tokens[start] in self.skip_keys or tokens[end - 1] in self.skip_keys:
+                    continue
+                yield "".join(tokens[start:end]), start, end
+
+    def _key_entries(self, key_id: int) -> List[int]:
+        return self.key_entries[int(self.key_offsets[key_id]):int(self.key_offsets[key_id + 1])].tolist()
+
+    def _exact(self, tokens: List[str]) -> Dict[int, Tuple[float, int, int]]:
+        found: Dict[int, Tuple[float, int, int]] = {}
+        for window, start, end in self._windows(tokens):
+            key_id = self.keys.get(window)
+            if key_id is None:
+                continue
+            for entry in self._key_entries(key_id):
+                if entry not in found:
+                    found[entry] = (1.0, start, end)
+        return found
+
+    def _fuzzy(self, tokens: List[str], covered: set) -> Dict[int, Tuple[float, int, int]]:
+        """Entries within OptionIndex.allowed_distance of a window not
+        overlapping an exact match, found by symmetric deletion"""
+        found: Dict[int, Tuple[float, int, int]] = {}
+        for window, start, end in self._windows(tokens):
+            if len(window) < 3 or covered.intersection(range(start, end)):
+                continue
+            # Keys with a letter more than the window, and the window with a
+            # letter deleted as a key (a letter less) or as a key with the
+            # same letter deleted (one substitution); any other deletion pair
+            # is two edits, only checked for keys allowed that many.
+            # key id -> (distance, key length)
+            near = {key_id: (1, len(window) + 1) for key_id, _ in self.deletes.get(window, ())}
+            checked = set()
+            for position in range(len(window)):
+                variant = window[:position] + window[position + 1:]
+                key_id = self.keys.get(variant)
+                if key_id is not None and OptionIndex.allowed_distance(len(variant)):
+                    near[key_id] = (1, len(variant))
+                for key_id, deleted in self.deletes.get(variant, ()):
+                    if deleted == position:
+                        near[key_id] = (1, len(window))
+                    elif OptionIndex.allowed_distance(len(window)) > 1:
+                        checked.add(key_id)
+            for key_id in checked.difference(near):
+                key = self.keys.restore_key(key_id)
+                limit = OptionIndex.allowed_distance(len(key))
+                distance = bounded_distance(key, window, limit)
+                if 0 < distance <= limit:
+                    near[key_id] = (distance, len(key))
+            for key_id, (distance, length) in near.items():
+                score = round(1 - distance / max(length, len(window)), 4)
+                for entry in self._key_entries(key_id):
+                    if entry not in found or score > found[entry][0]:
+                        found[entry] = (score, start, end)
+        return found
+
+    def _ancestors(self, entry: int) -> List[int]:
+        ancestors = []
+        parent = int(self.entries[entry]["parent"])
+        while parent >= 0 and len(ancestors) < len(LEVELS):
+            ancestors.append(parent)
+            parent = int(self.entries[parent]["parent"])
+        return ancestors
+
+    def _ancestor_rows(self, parents):
+        """Parent, grandparent, ... entry numbers of each candidate (-1 past the top)"""
+        import numpy as np
+
+        columns = [parents]
+        for _ in range(len(LEVELS) - 2):
+            above = columns[-1]
+            columns.append(np.where(above >= 0, self.entries["parent"][np.maximum(above, 0)], -1))
+        return np.stack(columns, axis=1)
+
+    def _distances_km(self, records, ancestors, lat: float, lng: float):
+        """Great-circle km from the point to each candidate, or to its nearest
+        located ancestor when the gazetteer has no coordinates for it (NaN if none)"""
+        import numpy as np
+
+        lats, lngs = records["lat"].astype(np.float64), records["lng"].astype(np.float64)
+        for column in ancestors.T:
+            missing = np.isnan(lats) & (column >= 0)
+            if not missing.any():
+                break
+            above = self.entries[column[missing]]
+            lats[missing], lngs[missing] = above["lat"], above["lng"]
+
+        phi1, phi2 = math.radians(lat), np.radians(lats)
+        dlmb = np.radians(lngs - lng)
+        a = np.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+        return 2 * EARTH_RADIUS_M / 1000 * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+    def _name(self, name_id: int) -> Optional[str]:
+        return self.names.restore_key(name_id) if name_id != NO_NAME else None
+
+    def _place(self, entry: int) -> Dict[str, Any]:
+        record = self.entries[entry]
+        return {
+            "code": int(record["code"]),
+            "name": self._name(int(record["name"])),
+            "name_hi": self._name(int(record["name_hi"])),
+        }
+
+    def _describe(self, entry: int, score: float, distance_km: Optional[float]) -> Dict[str, Any]:
+        record = self.entries[entry]
+        lat, lng = float(record["lat"]), float(record["lng"])
+        return {
+            **self._place(entry),
+            "level": LEVELS[int(record["level"])],
+            "latitude": None if math.isnan(lat) else round(lat, 5),
+            "longitude": None if math.isnan(lng) else round(lng, 5),
+            "score": round(score, 4),
+            "distance_km": distance_km,
+            "parents": {LEVELS[int(self.entries[ancestor]["level"])]: self._place(ancestor)
+                        for ancestor in self._ancestors(entry)},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the gazetteer CSV into the memory-mapped index")
+    parser.add_argument("--path", help="gazetteer CSV (default GAZETTEER_PATH)")
+    parser.add_argument("--index-dir", help="index directory (default GAZETTEER_INDEX_DIR)")
+    args = parser.parse_args()
+    GazetteerService(args.path, args.index_dir).compile()
+
+
+if __name__ == "__main__":
+    main()
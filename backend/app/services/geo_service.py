@@ -0,0 +1,152 @@
+import os
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.analytics import SurveyStatCounterDB
+from ..models.response import ResponseDB
+from ..utils import geohash
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Zoom levels with pre-aggregated counts: 3 ~ 156 km, 4 ~ 39 km, 5 ~ 4.9 km, 6 ~ 1.2 km cells
+GEO_AGGREGATE_PRECISIONS = sorted(
+    int(p) for p in os.getenv("GEO_AGGREGATE_PRECISIONS", "3,4,5,6").split(",") if p.strip()
+)
+
+
+def location_geohash(lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+    """Geohash to store with a response, or None without a location"""
+    if lat is None or lng is None:
+        return None
+    return geohash.encode(lat, lng)
+
+
+def _in_ranges(column, prefixes: List[str]):
+    """SQL condition matching values under any of the prefixes, as index range scans"""
+    conditions = []
+    for start, end in geohash.prefix_ranges(prefixes):
+        if not start and end is None:
+            return column.isnot(None)
+        conditions.append(column >= start if end is None else and_(column >= start, column < end))
+    return or_(*conditions)
+
+
+class GeoIndexService:
+    """Bounding-box/radius lookups over the geohash index and per-cell counts.
+
+    A box is covered by at most a few dozen geohash cells; their prefixes
+    become range scans on the (survey_id, geohash) index, and only the rows
+    found are checked against the exact box. Ranges are queried one by one:
+    an OR of them plus ORDER BY makes SQLite walk the survey's whole index.
+    """
+
+    POINT_COLUMNS = (
+        ResponseDB.id, ResponseDB.respondent_id, ResponseDB.location_lat,
+        ResponseDB.location_lng, ResponseDB.is_complete, ResponseDB.created_at
+    )
+
+    def within_bbox(self, db: Session, survey_id: str, bbox: geohash.BBox,
+                    limit: int = 1000, offset: int = 0) -> List[Dict]:
+        """Responses located inside the box, in geohash order"""
+        rows = self._scan(db, survey_id, bbox, offset + limit)
+        return [self._point(row) for row in rows[offset:]]
+
+    def within_radius(self, db: Session, survey_id: str, lat: float, lng: float,
+                      radius_m: float, limit: int = 1000) -> List[Dict]:
+        """Responses within radius_m meters, nearest first"""
+        points = []
+        for row in self._scan(db, survey_id, geohash.radius_bbox(lat, lng, radius_m)):
+            distance = geohash.haversine_m(lat, lng, row.location_lat, row.location_lng)
+            if distance <= radius_m:
+                point = self._point(row)
+                point["distance_m"] = round(distance, 1)
+                points.append(point)
+        points.sort(key=lambda point: point["distance_m"])
+        return points[:limit]
+
+    def cell_counts(self, db: Session, survey_id: str, precision: int,
+                    bbox: Optional[geohash.BBox] = None) -> List[Dict]:
+        """Pre-aggregated response counts per cell at one zoom level"""
+        query = db.query(SurveyStatCounterDB.key, SurveyStatCounterDB.count).filter(
+            SurveyStatCounterDB.survey_id == survey_id,
+            SurveyStatCounterDB.metric == f"geo:{precision}",
+            SurveyStatCounterDB.count > 0
+        )
+        if bbox:
+            query = query.filter(_in_ranges(
+                SurveyStatCounterDB.key, geohash.cover_bbox(bbox, max_precision=precision)
+            ))
+
+        cells = []
+        for cell, count in query.order_by(SurveyStatCounterDB.key).all():
+            min_lat, min_lng, max_lat, max_lng = geohash.decode_bbox(cell)
+            cells.append({
+                "cell": cell,
+                "count": count,
+                "latitude": (min_lat + max_lat) / 2,
+                "longitude": (min_lng + max_lng) / 2,
+                "bbox": [min_lat, min_lng, max_lat, max_lng],
+            })
+        return cells
+
+    def _scan(self, db: Session, survey_id: str, bbox: geohash.BBox, wanted: Optional[int] = None) -> List:
+        """Rows inside the box, one index range scan per merged covering range"""
+        min_lat, min_lng, max_lat, max_lng = bbox
+        rows = []
+        for start, end in geohash.prefix_ranges(geohash.cover_bbox(bbox)):
+            query = db.query(*self.POINT_COLUMNS).filter(
+                ResponseDB.survey_id == survey_id,
+                ResponseDB.geohash >= start,
+                ResponseDB.location_lat.between(min_lat, max_lat),
+                ResponseDB.location_lng.between(min_lng, max_lng)
+            )
+            if end is not None:
+                query = query.filter(ResponseDB.geohash < end)
+            query = query.order_by(ResponseDB.geohash)
+            if wanted is not None:
+                query = query.limit(wanted - len(rows))
+            rows.extend(query.all())
+            if wanted is not None and len(rows) >= wanted:
+                break
+        return rows
+
+    @staticmethod
+    def _point(row) -> Dict:
+        return {
+            "id": row.id,
+            "respondent_id": row.respondent_id,
+            "latitude": row.location_lat,
+            "longitude": row.location_lng,
+            "is_complete": bool(row.is_complete),
+            "created_at": row.created_at,
+        }
+
+    def backfill_geohashes(self, batch_size: int = 1000):
+        """Index responses stored before the geohash column existed"""
+        db = SessionLocal()
+        total = 0
+        try:
+            while True:
+                rows = db.query(ResponseDB).filter(
+                    ResponseDB.geohash.is_(None),
+                    ResponseDB.location_lat.isnot(None),
+                    ResponseDB.location_lng.isnot(None)
+                ).limit(batch_size).all()
+                if not rows:
+                    break
+                for row in rows:
+                    row.geohash = location_geohash(row.location_lat, row.location_lng)
+                db.commit()
+                total += len(rows)
+            if total:
+                logger.info(f"✅ Indexed {total} response locations")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Geohash backfill failed: {e}")
+        finally:
+            db.close()
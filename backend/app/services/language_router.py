@@ -0,0 +1,74 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LanguageRouter:
+    """Decides a clip's language before speech recognition runs.
+
+    Order: the enumerator's declared language (when the survey allows it),
+    the language already settled for this interview session, the survey's
+    only language. Otherwise resolve() returns None and the caller detects
+    once and remember()s the result for the rest of the session.
+    """
+
+    def __init__(self, supported_languages: Iterable[str],
+                 ttl_seconds: Optional[float] = None,
+                 max_sessions: Optional[int] = None):
+        self.supported_languages = set(supported_languages)
+        self.ttl = ttl_seconds or float(os.getenv("LANGUAGE_SESSION_TTL", 4 * 3600))
+        self.max_sessions = max_sessions or int(os.getenv("LANGUAGE_SESSION_CACHE_SIZE", 10000))
+
+        self._sessions: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, session_id: Optional[str] = None, declared: Optional[str] = None,
+                survey_languages: Optional[Iterable[str]] = None) -> Tuple[Optional[str], str]:
+        """(language or None, source) for the next clip"""
+        allowed = [lang for lang in (survey_languages or []) if lang in self.supported_languages]
+
+        if declared in self.supported_languages and (not allowed or declared in allowed):
+            return declared, "declared"
+
+        cached = self._lookup(session_id)
+        if cached and (not allowed or cached in allowed):
+            return cached, "session"
+
+        if len(allowed) == 1:
+            return allowed[0], "survey"
+
+        return None, "unknown"
+
+    def remember(self, session_id: Optional[str], language: Optional[str]):
+        """Cache the language settled for a session"""
+        if not session_id or language not in self.supported_languages:
+            return
+        with self._lock:
+            self._sessions[session_id] = (language, time.monotonic() + self.ttl)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _lookup(self, session_id: Optional[str]) -> Optional[str]:
+        if not session_id:
+            return None
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if not entry:
+                return None
+            language, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return language
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pairs that may be fetched from the Hugging Face hub when not found locally
+DEFAULT_HUB_PAIRS = "hi-en,en-hi,bn-en,mr-en,ur-en"
+HUB_NAME_TEMPLATE = "Helsinki-NLP/opus-mt-{pair}"
+
+# Language every pivot route goes through
+PIVOT_LANGUAGE = "en"
+
+
+def model_nbytes(model) -> int:
+    """Resident size of a model's weights, including int8-packed Linear layers"""
+    import torch
+
+    def tensor_bytes(value) -> int:
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(v) for v in value)
+        return 0
+
+    return sum(tensor_bytes(v) for v in model.state_dict().values())
+
+
+class TranslationModelRegistry:
+    """Loads MarianMT pairs on demand and keeps an LRU set resident.
+
+    At most max_models pairs, and at most memory_budget_mb of weights, stay
+    loaded; the least recently used pair is evicted first. Listeners receive
+    ("load" | "evict", pair, info) events. Loading (possibly a hub download)
+    happens outside the registry lock; concurrent callers for the same pair
+    wait for the one load in flight.
+    """
+
+    def __init__(self, model_dir: Optional[str] = None,
+                 max_models: Optional[int] = None,
+                 memory_budget_mb: Optional[float] = None,
+                 quantize: Optional[bool] = None):
+        self.model_dir = model_dir or os.getenv("TRANSLATION_MODEL_DIR", "models/translation")
+        self.max_models = max_models or int(os.getenv("TRANSLATION_MAX_MODELS", 3))
+        self.memory_budget = int((memory_budget_mb or float(
+            os.getenv("TRANSLATION_MEMORY_BUDGET_MB", 2048))) * 1024 * 1024)
+        self.quantize = quantize if quantize is not None else (
+            os.getenv("TRANSLATION_QUANTIZE", "").lower() == "int8"
+        )
+        self.allow_download = os.getenv("TRANSLATION_ALLOW_DOWNLOAD", "true").lower() == "true"
+        self.hub_pairs = [
+            p.strip() for p in os.getenv("TRANSLATION_HUB_PAIRS", DEFAULT_HUB_PAIRS).split(",") if p.strip()
+        ]
+
+        self._resident: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading: Dict[str, Dict] = {}
+        self._listeners: List[Callable[[str, str, Dict], None]] = []
+
+    def add_listener(self, listener: Callable[[str, str, Dict], None]):
+        """Subscribe to model load/evict events"""
+        self._listeners.append(listener)
+
+    def available_pairs(self) -> List[str]:
+        """Pairs that can be loaded: local checkpoints plus allowed hub pairs"""
+        pairs = set()
+        if os.path.isdir(self.model_dir):
+            for entry in os.listdir(self.model_dir):
+                if os.path.isdir(os.path.join(self.model_dir, entry)):
+                    pairs.add(entry.replace("opus-mt-", ""))
+        if self.allow_download:
+            pairs.update(self.hub_pairs)
+        return sorted(pairs)
+
+    def has_pair(self, pair: str) -> bool:
+        return self._resolve_source(pair) is not None
+
+    def route(self, source_lang: str, target_lang: str) -> List[str]:
+        """Model pairs to apply in order: direct, or pivoting through English"""
+        direct = f"{source_lang}-{target_lang}"
+        if self.has_pair(direct):
+            return [direct]
+
+        if PIVOT_LANGUAGE not in (source_lang, target_lang):
+            first = f"{source_lang}-{PIVOT_LANGUAGE}"
+            second = f"{PIVOT_LANGUAGE}-{target_lang}"
+            if self.has_pair(first) and self.has_pair(second):
+                return [first, second]
+
+        return []
+
+    def get(self, pair: str) -> Tuple[object, object]:
+        """(model, tokenizer) for a pair, loading and evicting as needed"""
+        with self._lock:
+            entry = self._resident.get(pair)
+            if entry:
+                self._resident.move_to_end(pair)
+                entry["last_used"] = time.time()
+                return entry["model"], entry["tokenizer"]
+
+            pending = self._loading.get(pair)
+            loader = pending is None
+            if loader:
+                pending = {"done": threading.Event(), "entry": None, "error": None}
+                self._loading[pair] = pending
+
+        if not loader:
+            pending["done"].wait()
+            if pending["error"] is not None:
+                raise pending["error"]
+            return pending["entry"]["model"], pending["entry"]["tokenizer"]
+
+        try:
+            entry = self._load(pair)
+        except Exception as e:
+            pending["error"] = e
+            raise
+        else:
+            pending["entry"] = entry
+            with self._lock:
+                self._resident[pair] = entry
+                self._emit("load", pair, self._describe(entry))
+                self._evict_over_budget(keep=pair)
+            return entry["model"], entry["tokenizer"]
+        finally:
+            with self._lock:
+                self._loading.pop(pair, None)
+            pending["done"].set()
+
+    def evict(self, pair: str) -> bool:
+        with self._lock:
+            entry = self._resident.pop(pair, None)
+        if entry:
+            self._emit("evict", pair, self._describe(entry))
+        return entry is not None
+
+    def resident_models(self) -> Dict[str, Dict]:
+        """Resident pairs (LRU order) with weight bytes and usage times"""
+        with self._lock:
+            return {pair: self._describe(entry) for pair, entry in self._resident.items()}
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry["bytes"] for entry in self._resident.values())
+
+    def _resolve_source(self, pair: str) -> Optional[str]:
+        for candidate in (pair, f"opus-mt-{pair}"):
+            path = os.path.join(self.model_dir, candidate)
+            if os.path.isdir(path):
+                return path
+        if self.allow_download and pair in self.hub_pairs:
+            return HUB_NAME_TEMPLATE.format(pair=pair)
+        return None
+
+    def _load(self, pair: str) -> Dict:
+        from transformers import MarianMTModel, MarianTokenizer
+
+        source = self._resolve_source(pair)
+        if source is None:
+            raise KeyError(f"No translation model available for {pair}")
+
+        started = time.perf_counter()
+        model = MarianMTModel.from_pretrained(source)
+        model.eval()
+
+        if self.quantize:
+            import torch
+            # Dynamic int8 quantization of the Linear layers for CPU inference
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        tokenizer = MarianTokenizer.from_pretrained(source)
+        now = time.time()
+
+        return {
+            "model": model,
+            "tokenizer": tokenizer,
+            "source": source,
+            "bytes": model_nbytes(model),
+            "load_seconds": time.perf_counter() - started,
+            "loaded_at": now,
+            "last_used": now,
+        }
+
+    def _evict_over_budget(self, keep: str):
+        while len(self._resident) > 1 and (
+            len(self._resident) > self.max_models or self.resident_bytes() > self.memory_budget
+        ):
+            oldest = next(iter(self._resident))
+            if oldest == keep:
+                break
+            self.evict(oldest)
+
+    def _emit(self, event: str, pair: str, info: Dict):
+        logger.info(f"Translation model {event}: {pair} ({info['bytes'] / 1024 / 1024:.1f} MB)")
+        for listener in self._listeners:
+            try:
+                listener(event, pair, info)
+            except Exception as e:
+                logger.warning(f"⚠️ Model registry listener failed: {e}")
+
+    @staticmethod
+    def _describe(entry: Dict) -> Dict:
+        return {
+            "source": entry["source"],
+            "bytes": entry["bytes"],
+            "load_seconds": round(entry["load_seconds"], 3),
+            "loaded_at": entry["loaded_at"],
+            "last_used": entry["last_used"],
+        }
@@ -1,17 +1,75 @@
+import os
 import re
-from typing import Dict, List, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
+from ..models.survey import Question, SurveyModel
+from ..utils.extractors import build_extractor, has_extractor, parse_numbers
+from ..utils.metrics import stage
+from ..utils.script_classifier import classify_script
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NUMERIC_FIELDS = {"age", "income"}
+
+# Fields _extract_entities can fill from spaCy NER (income too, but it is numeric)
+SPACY_FIELDS = {"name", "location", "date"}
+
+
+class ExtractionPlan:
+    """Which extractors extract_fields runs for one question.
+
+    Fields whose extract type (or, for a single field, the question's type)
+    has a registered extractor (utils.extractors) get it, compiled with the
+    question's options; spaCy runs only for name/location/date fields that
+    have no such extractor.
+    """
+
+    __slots__ = ("fields", "pattern_fields", "extractors", "use_spacy")
+
+    def __init__(self, question: Question, patterns: Dict[str, Any]):
+        extract = [item for item in (question.extract or []) if item.get("field")]
+        # Checked without compiling: a choice question's OptionIndex is built once, below
+        if not extract and has_extractor(question.type, question.options):
+            extract = [{"field": "answer", "type": question.type}]
+        
+        self.fields = [item["field"] for item in extract]
+        self.pattern_fields = [field for field in self.fields if field in patterns]
+        self.extractors = {}
+        for item in extract:
+            extractor = build_extractor(item.get("type"), question.options)
+            if extractor is None and len(extract) == 1:
+                extractor = build_extractor(question.type, question.options)
+            if extractor is not None:
+                self.extractors[item["field"]] = extractor
+        self.use_spacy = any(
+            field in SPACY_FIELDS and field not in NUMERIC_FIELDS and field not in self.extractors
+            for field in self.fields
+        )
+
+    @property
+    def targeted(self) -> bool:
+        """False when no field has an extractor; such questions get the all-fields path"""
+        return bool(self.pattern_fields or self.extractors) or self.use_spacy
+
 class NLPService:
-    def __init__(self):
+    def __init__(self, gazetteer=None):
         self.nlp_hi = None
         self.nlp_en = None
         self._init_spacy()
         
+        # Resolves location answers to LGD-coded places (services.gazetteer)
+        self.gazetteer = gazetteer
+        
+        # Extraction plans per (survey id, version), compiled on first use
+        self._plans: "OrderedDict[tuple, Dict[str, ExtractionPlan]]" = OrderedDict()
+        self._plans_lock = threading.Lock()
+        self.max_plans = int(os.getenv("NLP_PLAN_CACHE_SIZE", 256))
+        
         # Custom patterns for common survey fields
         self.patterns = {
             "age": [
@@ -45,6 +103,10 @@ class NLPService:
                 r"(.+?)\s*(?:नाम|कहलाता|कहलाती)\s*(?:है|हूँ)",
             ]
         }
+        self.compiled_patterns = {
+            field: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for field, patterns in self.patterns.items()
+        }
     
     def _init_spacy(self):
         """Initialize spaCy models"""
@@ -73,8 +135,45 @@ class NLPService:
             self.nlp_en = None
 
     
-    async def extract_fields(self, text: str, question_id: str = None) -> Dict:
-        """Extract structured data from natural language text"""
+    def plans_for(self, survey: SurveyModel, rebuild: bool = False) -> Dict[str, ExtractionPlan]:
+        """Per-question extraction plans, compiled once per survey version
+        
+        rebuild compiles them again (a survey edited in place keeps its
+        version) and drops the survey's other versions; the survey API does
+        this on upload, so choice questions' option indexes are built before
+        the first answer arrives.
+        """
+        key = (survey.id, survey.version)
+        with self._plans_lock:
+            plans = None if rebuild else self._plans.get(key)
+            if plans is not None:
+                self._plans.move_to_end(key)
+                return plans
+        
+        plans = {question.id: ExtractionPlan(question, self.patterns) for question in survey.questions}
+        with self._plans_lock:
+            if rebuild:
+                for stale in [cached for cached in self._plans if cached[0] == survey.id]:
+                    del self._plans[stale]
+            self._plans[key] = plans
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plans
+    
+    async def extract_fields(self, text: str, question_id: str = None,
+                             language: Optional[str] = None,
+                             plan: Optional[ExtractionPlan] = None,
+                             previous: Optional[Dict[str, Any]] = None,
+                             coordinates: Optional[Tuple[float, float]] = None) -> Dict:
+        """Extract structured data from natural language text
+        
+        plan (see plans_for) limits extraction to the question's fields: only
+        their patterns run, and spaCy only for name/location/date. previous
+        holds fields already answered in the interview; those are not
+        re-extracted from an answer to a different question. coordinates
+        (the response's GPS point) disambiguate the location's gazetteer
+        entry.
+        """
         try:
             if not text or not text.strip():
                 return {
@@ -86,30 +185,60 @@ class NLPService:
             
             text = text.strip()
             
-            # Determine language
-            lang = self._detect_language(text)
+            # Determine language (already known when STT routed the clip)
+            lang = language or self._detect_language(text)
             nlp = self.nlp_hi if lang == "hi" and self.nlp_hi else self.nlp_en
             
+            # Question-specific extractors; questions with no known field use them all
+            if plan is not None and not plan.targeted:
+                plan = None
+            
             # Extract using spaCy if available
             entities = {}
-            if nlp:
-                doc = nlp(text)
-                entities = self._extract_entities(doc)
+            if nlp and (plan is None or plan.use_spacy):
+                with stage("nlp_spacy", len(text.encode("utf-8"))):
+                    doc = nlp(text)
+                    entities = self._extract_entities(doc)
+                if plan:
+                    entities = {field: value for field, value in entities.items() if field in plan.fields}
             
             # Extract using custom patterns
-            pattern_matches = self._extract_with_patterns(text)
+            with stage("nlp_patterns", len(text.encode("utf-8"))):
+                pattern_matches = self._extract_with_patterns(text, plan.pattern_fields if plan else None)
             
             # Combine results (pattern matches take priority)
             extracted_data = {**entities, **pattern_matches}
             
+            # Typed extractors (numbers, dates, choices, yes/no) fill what patterns missed
+            if plan and plan.extractors:
+                with stage("nlp_extractors", len(text.encode("utf-8"))):
+                    for field, extractor in plan.extractors.items():
+                        if field not in extracted_data or extractor.overrides_patterns:
+                            value = extractor(text)
+                            if value is not None and value != []:
+                                extracted_data[field] = value
+            
+            # Earlier answers already settled these fields (e.g. "मैं किसान हूँ"
+            # is not a name when the name was given two questions ago)
+            if previous:
+                extracted_data = {
+                    field: value for field, value in extracted_data.items()
+                    if field not in previous or (plan and field in plan.fields)
+                }
+            
             # Calculate overall confidence
             confidence = self._calculate_extraction_confidence(
-                text, extracted_data, question_id
+                text, extracted_data, question_id, plan.fields if plan else None
             )
             
             # Clean and validate extracted data
             cleaned_data = self._clean_extracted_data(extracted_data)
             
+            # Place names to gazetteer entries: location_code (LGD) and the place's hierarchy
+            if self.gazetteer is not None and self.gazetteer.enabled:
+                with stage("nlp_gazetteer", len(text.encode("utf-8"))):
+                    self._resolve_location(cleaned_data, text, plan, coordinates)
+            
             return {
                 "extracted_data": cleaned_data,
                 "confidence": confidence,
@@ -127,14 +256,29 @@ class NLPService:
                 "success": False
             }
     
+    def _resolve_location(self, data: Dict, text: str, plan: Optional[ExtractionPlan],
+                          coordinates: Optional[Tuple[float, float]]):
+        """Adds location_code and location_resolved for the extracted
+        location, or for the whole answer to a question asking for one"""
+        asked = plan is not None and "location" in plan.fields
+        sources = [data["location"]] if isinstance(data.get("location"), str) else []
+        if asked:
+            sources.append(text)
+        if not sources:
+            return
+        
+        lat, lng = coordinates or (None, None)
+        for source in sources:
+            found = self.gazetteer.resolve(source, lat, lng)
+            if found:
+                data["location_code"] = found[0]["code"]
+                data["location_resolved"] = found[0]
+                data.setdefault("location", found[0]["name_hi"] or found[0]["name"])
+                return
+    
     def _detect_language(self, text: str) -> str:
         """Simple language detection based on script"""
-        hindi_chars = len(re.findall(r'[\u0900-\u097F]', text))
-        latin_chars = len(re.findall(r'[a-zA-Z]', text))
-        
-        if hindi_chars > latin_chars:
-            return "hi"
-        return "en"
+        return classify_script(text)
     
     def _extract_entities(self, doc) -> Dict:
         """Extract named entities using spaCy"""
@@ -166,13 +310,13 @@ class NLPService:
         
         return entities
     
-    def _extract_with_patterns(self, text: str) -> Dict:
-        """Extract using regex patterns"""
+    def _extract_with_patterns(self, text: str, fields: Optional[List[str]] = None) -> Dict:
+        """Extract using regex patterns, only for the given fields when set"""
         extracted = {}
         
-        for field, patterns in self.patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
+        for field in fields if fields is not None else self.compiled_patterns:
+            for pattern in self.compiled_patterns[field]:
+                matches = pattern.findall(text)
                 if matches:
                     match_text = matches[0].strip()
                     
@@ -223,12 +367,11 @@ class NLPService:
         if not money_text:
             return None
             
-        # Remove currency symbols and extract numbers
-        cleaned = re.sub(r'[^\d,]', '', str(money_text))
-        cleaned = cleaned.replace(',', '')
+        # Digits or number words: "12,000", "पचास हज़ार", "1.5 lakh"
+        numbers = parse_numbers(str(money_text))
         
         try:
-            value = int(cleaned)
+            value = int(numbers[0][0])
             # Reasonable income range (monthly in INR)
             if 1000 <= value <= 10000000:  # 1K to 1Crore
                 return value
@@ -238,7 +381,8 @@ class NLPService:
         return None
     
     def _calculate_extraction_confidence(self, text: str, 
-                                       extracted: Dict, question_id: str = None) -> float:
+                                       extracted: Dict, question_id: str = None,
+                                       fields: Optional[List[str]] = None) -> float:
         """Calculate confidence score for extraction"""
         confidence_factors = []
         
@@ -278,6 +422,10 @@ class NLPService:
             elif question_id == "name" and "name" in extracted:
                 confidence_factors.append(0.9)
         
+        # The answer gave the fields the question asked for
+        if fields:
+            confidence_factors.append(0.9 if all(field in extracted for field in fields) else 0.5)
+        
         # Calculate final confidence
         if confidence_factors:
             return min(1.0, sum(confidence_factors) / len(confidence_factors))
@@ -0,0 +1,142 @@
+import base64
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
+import logging
+
+from ..models.survey import Question, SurveyModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACCEPT = "accept"
+RETRY = "retry"
+SKIP = "skip"
+
+
+class RetryPolicyService:
+    """Applies a survey's logic (max_retries, confidence_threshold,
+    auto_skip_timeout) to one spoken answer: accept it, ask again, or move on.
+
+    Attempts are counted per (session, survey, question) so clients can leave
+    the attempt number out; the clock for auto_skip_timeout starts at the
+    first attempt. Entries expire like LanguageRouter sessions.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.ttl = ttl_seconds or float(os.getenv("RETRY_SESSION_TTL", 4 * 3600))
+        self.max_entries = max_entries or int(os.getenv("RETRY_SESSION_CACHE_SIZE", 50000))
+
+        # key -> (attempts so far, first attempt time, expires at)
+        self._attempts: "OrderedDict[Tuple[str, str, str], Tuple[int, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def combined_confidence(stt_confidence: Optional[float],
+                            extraction_confidence: Optional[float]) -> float:
+        """The weaker of speech recognition and field extraction confidence"""
+        scores = [score for score in (stt_confidence, extraction_confidence) if score is not None]
+        return max(0.0, min(1.0, min(scores))) if scores else 0.0
+
+    def decide(self, survey: SurveyModel, question: Question,
+               session_id: Optional[str] = None, attempt: Optional[int] = None,
+               stt_confidence: Optional[float] = None,
+               extraction_confidence: Optional[float] = None,
+               no_speech: bool = False) -> Dict:
+        """Decision for the latest answer to a question.
+
+        attempt is 1 for the first answer; when omitted it is counted from
+        earlier decisions in the same session. retries_left counts the retry
+        being asked for, so a RETRY always has retries_left >= 1.
+        """
+        logic = survey.logic
+        attempt, elapsed = self._record(session_id, survey.id, question.id, attempt)
+        confidence = 0.0 if no_speech else self.combined_confidence(stt_confidence, extraction_confidence)
+        # Attempts after the first are retries
+        retries_left = max(0, logic.max_retries - (attempt - 1))
+
+        if confidence >= logic.confidence_threshold:
+            action, reason = ACCEPT, "confident"
+        elif retries_left == 0:
+            action, reason = SKIP, "max_retries"
+        elif logic.auto_skip_timeout and elapsed >= logic.auto_skip_timeout:
+            action, reason = SKIP, "timeout"
+        else:
+            action, reason = RETRY, "no_speech" if no_speech else "low_confidence"
+
+        if action != RETRY:
+            self.forget(session_id, survey.id, question.id)
+
+        return {
+            "action": action,
+            "reason": reason,
+            "attempt": attempt,
+            "retries_left": retries_left if action == RETRY else 0,
+            "confidence": round(confidence, 3),
+            "threshold": logic.confidence_threshold,
+            "needs_review": action == SKIP and question.required,
+            "prompt": self.retry_prompt(survey, question, attempt) if action == RETRY else None,
+        }
+
+    @staticmethod
+    def retry_prompt(survey: SurveyModel, question: Question, attempt: int) -> str:
+        """The question's retry prompt for this attempt (the last one repeats), else the survey's error_unclear"""
+        prompts = [prompt for prompt in (question.retry_prompts or []) if prompt and prompt.strip()]
+        if prompts:
+            return prompts[min(attempt, len(prompts)) - 1]
+        return survey.responses.error_unclear
+
+    async def attach_prompt_audio(self, decision: Dict, tts_service, lang: str,
+                                  profile: Optional[str] = None) -> Dict:
+        """Add the retry prompt's audio (pre-rendered at survey upload, so normally a cache hit)"""
+        prompt = decision.get("prompt")
+        decision["prompt_audio_url"] = None
+        decision["audio_base64"] = None
+        if not prompt:
+            return decision
+
+        query = {"lang": lang, **({"format": profile} if profile else {})}
+        decision["prompt_audio_url"] = f"/api/tts/{quote(prompt, safe='')}/audio?{urlencode(query)}"
+        if tts_service:
+            try:
+                audio_data, _ = await tts_service.synthesize_audio(prompt, lang, profile=profile)
+                decision["audio_base64"] = base64.b64encode(audio_data).decode() if audio_data else None
+            except Exception as e:
+                logger.warning(f"⚠️ Retry prompt audio unavailable: {e}")
+        return decision
+
+    def forget(self, session_id: Optional[str], survey_id: str, question_id: str):
+        if not session_id:
+            return
+        with self._lock:
+            self._attempts.pop((session_id, survey_id, question_id), None)
+
+    def _record(self, session_id: Optional[str], survey_id: str, question_id: str,
+                attempt: Optional[int]) -> Tuple[int, float]:
+        """(attempt number, seconds since the first attempt) after counting this one"""
+        now = time.monotonic()
+        if not session_id:
+            return max(1, attempt or 1), 0.0
+
+        key = (session_id, survey_id, question_id)
+        with self._lock:
+            entry = self._attempts.get(key)
+            if entry and entry[2] < now:
+                entry = None
+            # Attempt 1 starts over, e.g. when the enumerator returns to a question
+            if entry and attempt != 1:
+                count, started = entry[0] + 1, entry[1]
+            else:
+                count, started = 1, now
+            if attempt:
+                count = max(1, attempt)
+
+            self._attempts[key] = (count, started, now + self.ttl)
+            self._attempts.move_to_end(key)
+            while len(self._attempts) > self.max_entries:
+                self._attempts.popitem(last=False)
+        return count, now - started
@@ -0,0 +1,288 @@
+import asyncio
+import os
+import time
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.session import InterviewSessionDB
+from ..models.survey import SurveyDB, SurveyModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class InterviewSessionStore:
+    """Interview sessions kept in memory, snapshotted to the database.
+
+    A session binds an id to a survey and respondent and holds what the
+    per-question path needs: current question, extracted answers, attempts
+    and the settled language. Reads and updates touch only memory; changed
+    sessions are written to interview_sessions every snapshot interval (and
+    on create/close), so a restarted process picks them up again on first
+    use. Idle sessions expire after the TTL. Parsed survey definitions are
+    cached alongside, so a session never re-reads its survey.
+
+    Every change bumps the state's version, and a snapshot never replaces a
+    stored state of the same or a newer version: a worker holding a stale
+    copy (another worker served the session since it loaded it) drops it
+    and reloads on next use instead of overwriting the other's answers.
+    Changes made to that stale copy since its last snapshot are lost, so
+    route an interview's requests to one worker (sticky sessions) when
+    running several.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None,
+                 max_sessions: Optional[int] = None,
+                 snapshot_interval: Optional[float] = None):
+        self.ttl = ttl_seconds or float(os.getenv("SESSION_TTL", 4 * 3600))
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_CACHE_SIZE", 10000))
+        self.snapshot_interval = float(
+            os.getenv("SESSION_SNAPSHOT_INTERVAL", 15) if snapshot_interval is None else snapshot_interval
+        )
+        self.survey_ttl = float(os.getenv("SESSION_SURVEY_CACHE_TTL", 300))
+
+        # session id -> (state, expires at)
+        self._sessions: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._dirty = set()
+        self._surveys: "OrderedDict[str, Tuple[SurveyModel, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._task = None
+
+    def create(self, db: Session, survey: SurveyModel, respondent_id: Optional[str] = None,
+               language: Optional[str] = None) -> Dict[str, Any]:
+        """Start a session at the survey's first question and persist it"""
+        now = datetime.now(timezone.utc)
+        state = {
+            "id": str(uuid.uuid4()),
+            "survey_id": survey.id,
+            "respondent_id": respondent_id,
+            "language": language,
+            "current_question_id": survey.questions[0].id if survey.questions else None,
+            "answers": {},
+            "attempts": {},
+            "is_closed": False,
+            "version": 1,
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+        }
+        self._write(db, [state])
+        db.commit()
+        self._remember(state)
+        return state
+
+    def get(self, session_id: Optional[str], db: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+        """Open session state from memory, else from its last snapshot"""
+        if not session_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry and entry[1] >= now:
+                self._sessions[session_id] = (entry[0], now + self.ttl)
+                self._sessions.move_to_end(session_id)
+                return entry[0]
+
+        if db:
+            row = db.query(InterviewSessionDB).filter(InterviewSessionDB.id == session_id).first()
+        else:
+            row = self._load(session_id)
+        if not row or row.is_closed or self._expired(row.expires_at):
+            return None
+        state = dict(row.state)
+        self._remember(state)
+        return state
+
+    def update(self, session_id: str, **changes) -> Optional[Dict[str, Any]]:
+        """Change top-level fields of an open session in memory"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if not entry:
+                return None
+            state = entry[0]
+            state.update(changes)
+            self._touch(state)
+            return state
+
+    def record_answer(self, session: Dict[str, Any], survey: SurveyModel, question_id: str,
+                      extracted: Dict[str, Any], decision: Optional[Dict] = None,
+                      language: Optional[str] = None) -> Dict[str, Any]:
+        """Keep an answer's extracted fields; accepted or skipped questions move the session on"""
+        with self._lock:
+            if extracted:
+                session["answers"][question_id] = extracted
+            if decision:
+                session["attempts"][question_id] = decision["attempt"]
+                if decision["action"] != "retry":
+                    session["current_question_id"] = survey.next_question_id(question_id)
+            if language and not session.get("language"):
+                session["language"] = language
+            self._touch(session)
+        return session
+
+    def _touch(self, state: Dict[str, Any]):
+        """Mark a changed state for the next snapshot; call holding _lock"""
+        state["version"] = state.get("version", 0) + 1
+        state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._dirty.add(state["id"])
+
+    def close(self, db: Session, session_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a session finished, persist it and drop it from memory"""
+        state = self.get(session_id, db)
+        if not state:
+            return None
+        # Close the newest state, which another worker may have written
+        row = db.query(InterviewSessionDB).filter(InterviewSessionDB.id == session_id).first()
+        if row and row.state.get("version", 0) > state.get("version", 0):
+            state = dict(row.state)
+        with self._lock:
+            state["is_closed"] = True
+            self._touch(state)
+            self._sessions.pop(session_id, None)
+            self._dirty.discard(session_id)
+        self._write(db, [state])
+        db.commit()
+        return state
+
+    def survey(self, db: Session, survey_id: Optional[str]) -> Optional[SurveyModel]:
+        """Parsed survey definition, cached for SESSION_SURVEY_CACHE_TTL seconds"""
+        if not survey_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._surveys.get(survey_id)
+            if entry and entry[1] >= now:
+                return entry[0]
+
+        row = db.query(SurveyDB).filter(SurveyDB.id == survey_id).first()
+        if not row:
+            return None
+        model = SurveyModel.from_db(row)
+        with self._lock:
+            self._surveys[survey_id] = (model, now + self.survey_ttl)
+            self._surveys.move_to_end(survey_id)
+            while len(self._surveys) > self.max_sessions:
+                self._surveys.popitem(last=False)
+        return model
+
+    def invalidate_survey(self, survey_id: str):
+        """Drop a survey from this process's cache.
+
+        Other worker processes keep their copy until SESSION_SURVEY_CACHE_TTL
+        expires, so an edited survey can be served stale for up to that long.
+        """
+        with self._lock:
+            self._surveys.pop(survey_id, None)
+
+    def snapshot(self) -> int:
+        """Write changed sessions to the database and drop expired ones from memory"""
+        now = time.monotonic()
+        with self._lock:
+            states = [self._sessions[sid][0] for sid in self._dirty if sid in self._sessions]
+            self._dirty.clear()
+            for session_id in [sid for sid, (_, expires_at) in self._sessions.items() if expires_at < now]:
+                del self._sessions[session_id]
+            # Copies: request handlers keep changing the live dicts
+            states = [{**state, "answers": dict(state["answers"]), "attempts": dict(state["attempts"])}
+                      for state in states]
+        if not states:
+            return 0
+
+        db = SessionLocal()
+        try:
+            stale = self._write(db, states)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._dirty.update(state["id"] for state in states)
+            raise
+        finally:
+            db.close()
+
+        if stale:
+            logger.warning(f"⚠️ {len(stale)} sessions changed in another worker; reloading them")
+            with self._lock:
+                for session_id in stale:
+                    self._sessions.pop(session_id, None)
+        return len(states) - len(stale)
+
+    def _write(self, db: Session, states) -> List[str]:
+        """Upsert states newer than the stored ones; returns ids of the others"""
+        stored = {
+            row.id: row.state.get("version", 0)
+            for row in db.query(InterviewSessionDB.id, InterviewSessionDB.state)
+            .filter(InterviewSessionDB.id.in_([state["id"] for state in states]))
+        }
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        stale = []
+        for state in states:
+            if state["id"] in stored and stored[state["id"]] >= state.get("version", 0):
+                stale.append(state["id"])
+                continue
+            db.merge(InterviewSessionDB(
+                id=state["id"],
+                survey_id=state["survey_id"],
+                respondent_id=state.get("respondent_id"),
+                state=state,
+                is_closed=state.get("is_closed", False),
+                expires_at=expires_at
+            ))
+        return stale
+
+    def _remember(self, state: Dict[str, Any]):
+        with self._lock:
+            self._sessions[state["id"]] = (state, time.monotonic() + self.ttl)
+            self._sessions.move_to_end(state["id"])
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                # Unsaved changes of an evicted session are lost; snapshot first
+                if evicted in self._dirty:
+                    logger.warning(f"⚠️ Session {evicted} evicted before its snapshot")
+                    self._dirty.discard(evicted)
+
+    @staticmethod
+    def _load(session_id: str) -> Optional[InterviewSessionDB]:
+        db = SessionLocal()
+        try:
+            return db.query(InterviewSessionDB).filter(InterviewSessionDB.id == session_id).first()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _expired(expires_at: Optional[datetime]) -> bool:
+        if expires_at is None:
+            return False
+        if not expires_at.tzinfo:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at < datetime.now(timezone.utc)
+
+    async def start(self):
+        """Start the periodic snapshot job"""
+        if self.snapshot_interval > 0:
+            self._task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self):
+        """Stop snapshotting and write what is still unsaved"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            self.snapshot()
+        except Exception as e:
+            logger.error(f"❌ Session snapshot failed: {e}")
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.snapshot)
+            except Exception as e:
+                logger.error(f"❌ Session snapshot failed: {e}")
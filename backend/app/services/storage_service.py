@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+import logging
+
+import aiofiles
+
+from ..utils.audio_codec import OPUS_SPEECH_ARGS, transcode_file
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Size of each read from the upload spool
+CHUNK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "aac": "audio/aac",
+    "ogg": "audio/ogg",
+    "opus": "audio/ogg",
+    "webm": "audio/webm",
+}
+
+# Other spellings of the formats above; anything else is stored as .bin
+EXTENSION_ALIASES = {"wave": "wav", "mpeg": "mp3", "mpga": "mp3", "mp4": "m4a", "oga": "ogg"}
+
+
+class StorageBackend(ABC):
+    """Blob store for audio content, addressed by storage key"""
+
+    # Directory where uploads are spooled before being handed to put_file
+    staging_dir: str
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether an object is already stored under key"""
+
+    @abstractmethod
+    async def put_file(self, key: str, source_path: str, content_type: str) -> None:
+        """Move a staged local file into the store under key"""
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """Read the full object stored under key"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the object stored under key"""
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores objects as files below a root directory"""
+
+    def __init__(self, root: str = "audio_files"):
+        self.root = root
+        self.staging_dir = os.path.join(root, ".staging")
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    async def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    async def put_file(self, key: str, source_path: str, content_type: str) -> None:
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Staging lives on the same filesystem, so this is an atomic rename
+        os.replace(source_path, target)
+
+    async def read(self, key: str) -> bytes:
+        async with aiofiles.open(self._path(key), "rb") as f:
+            return await f.read()
+
+    async def delete(self, key: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+class S3StorageBackend(StorageBackend):
+    """Stores objects in an S3-compatible bucket (AWS S3, MinIO, ...)"""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, prefix: str = ""):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.staging_dir = tempfile.gettempdir()
+
+        # Path-style addressing keeps MinIO and other local stand-ins working
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(s3={"addressing_style": "path"}),
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await self._run(self.client.head_object, Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def put_file(self, key: str, source_path: str, content_type: str) -> None:
+        try:
+            # upload_file streams from disk and switches to multipart for large clips
+            await self._run(
+                self.client.upload_file, source_path, self.bucket, self._key(key),
+                ExtraArgs={"ContentType": content_type},
+            )
+        finally:
+            if os.path.exists(source_path):
+                os.unlink(source_path)
+
+    async def read(self, key: str) -> bytes:
+        obj = await self._run(self.client.get_object, Bucket=self.bucket, Key=self._key(key))
+        return await self._run(obj["Body"].read)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self.client.delete_object, Bucket=self.bucket, Key=self._key(key))
+
+    def ensure_bucket(self) -> None:
+        """Create the bucket if it does not exist yet (handy for local MinIO)"""
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except ClientError:
+            self.client.create_bucket(Bucket=self.bucket)
+
+
+def create_storage_backend() -> StorageBackend:
+    """Build the storage backend selected by AUDIO_STORAGE_BACKEND"""
+    backend = os.getenv("AUDIO_STORAGE_BACKEND", "local").lower()
+
+    if backend == "s3":
+        return S3StorageBackend(
+            bucket=os.getenv("S3_BUCKET", "bharatpulse-audio"),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            region=os.getenv("S3_REGION") or None,
+            prefix=os.getenv("S3_PREFIX", ""),
+        )
+
+    return LocalStorageBackend(os.getenv("AUDIO_STORAGE_ROOT", "audio_files"))
+
+
+class AudioStorageService:
+    def __init__(self, backend: Optional[StorageBackend] = None,
+                 transcode_opus: Optional[bool] = None):
+        self.backend = backend or create_storage_backend()
+
+        if transcode_opus is None:
+            transcode_opus = os.getenv("AUDIO_TRANSCODE_OPUS", "false").lower() == "true"
+        self.transcode_opus = transcode_opus
+
+    async def store_upload(self, upload_file) -> Dict:
+        """Stream an upload into content-addressed storage"""
+        extension = self._extension(upload_file.filename)
+        fd, staged_path = tempfile.mkstemp(dir=self.backend.staging_dir, suffix=f".{extension}")
+        os.close(fd)
+
+        try:
+            # Hash while copying chunk by chunk from the upload spool
+            digest = hashlib.sha256()
+            size_bytes = 0
+            async with aiofiles.open(staged_path, "wb") as f:
+                while True:
+                    chunk = await upload_file.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size_bytes += len(chunk)
+                    await f.write(chunk)
+
+            content_hash = digest.hexdigest()
+            stored_path = staged_path
+            stored_format = extension
+
+            if self.transcode_opus and extension != "opus":
+                # Identical clips were already transcoded once - skip ffmpeg entirely
+                if await self.backend.exists(self.storage_key(content_hash, "opus")):
+                    return self._result(content_hash, "opus", size_bytes, None, True)
+
+                opus_path = f"{staged_path}.opus"
+                if await transcode_file(staged_path, opus_path, OPUS_SPEECH_ARGS):
+                    stored_path = opus_path
+                    stored_format = "opus"
+
+            key = self.storage_key(content_hash, stored_format)
+            if await self.backend.exists(key):
+                return self._result(content_hash, stored_format, size_bytes, None, True)
+
+            stored_bytes = os.path.getsize(stored_path)
+            await self.backend.put_file(key, stored_path, CONTENT_TYPES.get(stored_format, "application/octet-stream"))
+            return self._result(content_hash, stored_format, size_bytes, stored_bytes, False)
+
+        finally:
+            for path in (staged_path, f"{staged_path}.opus"):
+                if os.path.exists(path):
+                    os.unlink(path)
+
+    async def read(self, key: str) -> bytes:
+        """Read stored audio bytes by storage key"""
+        return await self.backend.read(key)
+
+    @staticmethod
+    def storage_key(content_hash: str, extension: str) -> str:
+        """Fan out by hash prefix so no directory/prefix grows unbounded"""
+        return f"audio/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.{extension}"
+
+    def _result(self, content_hash: str, stored_format: str, size_bytes: int,
+                stored_bytes: Optional[int], deduplicated: bool) -> Dict:
+        return {
+            "storage_key": self.storage_key(content_hash, stored_format),
+            "content_hash": content_hash,
+            "format": stored_format,
+            "size_bytes": size_bytes,
+            "stored_bytes": stored_bytes,
+            "deduplicated": deduplicated,
+        }
+
+    @staticmethod
+    def _extension(filename: Optional[str]) -> str:
+        """Known audio extension of the upload; the filename is client input
+        and ends up in the storage key and the staging file name"""
+        if not filename or "." not in filename:
+            return "wav"
+        extension = filename.rsplit(".", 1)[-1].strip().lower()
+        extension = EXTENSION_ALIASES.get(extension, extension)
+        return extension if extension in CONTENT_TYPES else "bin"
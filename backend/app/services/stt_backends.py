@@ -0,0 +1,279 @@
+import asyncio
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from ..utils.metrics import add_cpu, cpu_timed
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper identifies the language from one 30-second window
+DETECTION_SAMPLES = 30 * 16000
+
+
+def best_language(probabilities: Dict[str, float],
+                  candidates: Optional[Iterable[str]] = None) -> Optional[Tuple[str, float]]:
+    """Most probable language, restricted to candidates when given"""
+    if candidates:
+        candidates = set(candidates)
+        probabilities = {lang: p for lang, p in probabilities.items() if lang in candidates}
+    if not probabilities:
+        return None
+    language = max(probabilities, key=probabilities.get)
+    return language, probabilities[language]
+
+
+class STTBackend(ABC):
+    """A speech-to-text engine behind STTService.
+
+    transcribe() takes 16 kHz mono float32 audio and returns a Whisper-style
+    result: {"text", "language", "segments": [{"start", "end", "text",
+    "avg_logprob"}]}.
+    """
+
+    name = "base"
+
+    # Calls one loaded model can serve at once. Whisper installs per-call
+    # kv-cache hooks on the shared model, so it must stay at 1
+    concurrency = 1
+
+    def __init__(self, size: str):
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="stt")
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}:{self.size}"
+
+    def supports(self, language: Optional[str]) -> bool:
+        """Whether the loaded model can transcribe this language"""
+        return True
+
+    def detect_language(self, audio: np.ndarray,
+                        candidates: Optional[Iterable[str]] = None) -> Optional[Tuple[str, float]]:
+        """(language, probability) from the first 30 s, or None if unsupported"""
+        return None
+
+    async def transcribe_async(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        """transcribe() on the backend's own thread pool, off the event loop"""
+        loop = asyncio.get_running_loop()
+        result, cpu = await loop.run_in_executor(self._executor, cpu_timed, self.transcribe, audio, language)
+        add_cpu(cpu)
+        return result
+
+    async def detect_language_async(self, audio: np.ndarray,
+                                    candidates: Optional[Iterable[str]] = None) -> Optional[Tuple[str, float]]:
+        loop = asyncio.get_running_loop()
+        result, cpu = await loop.run_in_executor(self._executor, cpu_timed, self.detect_language, audio, candidates)
+        add_cpu(cpu)
+        return result
+
+    @abstractmethod
+    def load(self):
+        """Load model weights; called once before the first transcription"""
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        """Transcribe 16 kHz mono float32 samples"""
+
+
+class WhisperBackend(STTBackend):
+    """openai-whisper on PyTorch, optionally with int8 dynamic quantization"""
+
+    name = "whisper"
+
+    def __init__(self, size: str, quantize: bool = False):
+        super().__init__(size)
+        self.quantize = quantize
+        self.model = None
+        if quantize:
+            self.name = "whisper-int8"
+
+    def load(self):
+        import whisper
+
+        model = whisper.load_model(self.size, device="cpu")
+
+        if self.quantize:
+            import torch
+
+            # whisper.model.Linear only casts weights to the input dtype, which
+            # is a no-op in fp32 on CPU; quantize_dynamic matches exact types,
+            # so present those layers as plain nn.Linear first
+            for module in model.modules():
+                if isinstance(module, torch.nn.Linear):
+                    module.__class__ = torch.nn.Linear
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        self.model = model
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        # fp16 is GPU-only; asking for it on CPU just logs a warning per call
+        return self.model.transcribe(audio, language=language, fp16=False)
+
+    def detect_language(self, audio: np.ndarray,
+                        candidates: Optional[Iterable[str]] = None) -> Optional[Tuple[str, float]]:
+        import whisper
+
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio[:DETECTION_SAMPLES]), n_mels=self.model.dims.n_mels
+        )
+        _, probabilities = self.model.detect_language(mel)
+        return best_language(probabilities, candidates)
+
+
+class FasterWhisperBackend(STTBackend):
+    """Whisper converted to CTranslate2 (faster-whisper), int8 on CPU by default"""
+
+    name = "faster-whisper"
+
+    def __init__(self, size: str, compute_type: Optional[str] = None, cpu_threads: Optional[int] = None):
+        super().__init__(size)
+        self.compute_type = compute_type or os.getenv("STT_COMPUTE_TYPE", "int8")
+        self.cpu_threads = cpu_threads or int(os.getenv("STT_CPU_THREADS", 0))
+        self.model = None
+
+    def load(self):
+        from faster_whisper import WhisperModel
+
+        # size may also be a path to a locally converted CTranslate2 model
+        self.model = WhisperModel(
+            self.size,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads
+        )
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        segments, info = self.model.transcribe(audio, language=language, beam_size=1)
+
+        # segments is a lazy generator; decoding happens while iterating
+        segment_list: List[Dict] = [
+            {
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+            }
+            for segment in segments
+        ]
+
+        return {
+            "text": "".join(segment["text"] for segment in segment_list),
+            "language": info.language,
+            "segments": segment_list,
+        }
+
+    def detect_language(self, audio: np.ndarray,
+                        candidates: Optional[Iterable[str]] = None) -> Optional[Tuple[str, float]]:
+        if not hasattr(self.model, "detect_language"):
+            return None
+        _, _, all_probabilities = self.model.detect_language(audio[:DETECTION_SAMPLES])
+        return best_language(dict(all_probabilities), candidates)
+
+
+class VoskBackend(STTBackend):
+    """Kaldi/Vosk: one shared Model, a fresh KaldiRecognizer per request.
+
+    Recognizers are cheap and hold all per-utterance decoder state, so
+    concurrent requests never see each other's audio. Much faster than
+    Whisper on short answers, but a model covers a single language.
+    """
+
+    name = "vosk"
+    concurrency = int(os.getenv("VOSK_WORKERS", 4))
+
+    # 0.25 s of 16-bit PCM per AcceptWaveform call
+    CHUNK_BYTES = 8000
+
+    def __init__(self, size: str, language: Optional[str] = None):
+        # "size" is a model directory; anything else means the configured model
+        super().__init__(size if os.path.isdir(size) else os.getenv("VOSK_MODEL_PATH", "./models/vosk/"))
+        self.language = language or os.getenv("VOSK_LANGUAGE", "hi")
+        self.model = None
+
+    def load(self):
+        from vosk import Model, SetLogLevel
+
+        if not os.path.isdir(self.size):
+            raise FileNotFoundError(f"Vosk model not found at {self.size}")
+        SetLogLevel(-1)
+        self.model = Model(self.size)
+
+    def supports(self, language: Optional[str]) -> bool:
+        return language in (None, self.language)
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, 16000)
+        recognizer.SetWords(True)
+
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        results = []
+        for offset in range(0, len(pcm), self.CHUNK_BYTES):
+            # True at each endpoint (pause); the finished utterance is in Result()
+            if recognizer.AcceptWaveform(pcm[offset:offset + self.CHUNK_BYTES]):
+                results.append(json.loads(recognizer.Result()))
+        results.append(json.loads(recognizer.FinalResult()))
+
+        segments = []
+        for result in results:
+            words = result.get("result", [])
+            if not words:
+                continue
+            confidence = sum(word.get("conf", 0.5) for word in words) / len(words)
+            segments.append({
+                "start": words[0]["start"],
+                "end": words[-1]["end"],
+                "text": result.get("text", ""),
+                "avg_logprob": math.log(max(confidence, 1e-6)),
+            })
+
+        return {
+            "text": " ".join(segment["text"] for segment in segments if segment["text"]),
+            "language": self.language,
+            "segments": segments,
+        }
+
+
+BACKENDS = {
+    "whisper": lambda size: WhisperBackend(size),
+    "whisper-int8": lambda size: WhisperBackend(size, quantize=True),
+    "faster-whisper": lambda size: FasterWhisperBackend(size),
+    "vosk": lambda size: VoskBackend(size),
+}
+
+
+def parse_backend_spec(spec: str, default_kind: str = "whisper", default_size: str = "tiny"):
+    """'faster-whisper:small' -> ("faster-whisper", "small"); a bare kind or size takes the default for the other"""
+    kind, sep, size = spec.strip().partition(":")
+    if not sep and kind not in BACKENDS:
+        kind, size = default_kind, kind
+    kind = kind or default_kind
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown STT backend '{kind}' (expected one of {', '.join(BACKENDS)})")
+    return kind, size or default_size
+
+
+def create_stt_backend(spec: str, default_kind: str = "whisper", default_size: str = "tiny") -> STTBackend:
+    """Build (but do not load) a backend from a 'kind[:size]' spec"""
+    kind, size = parse_backend_spec(spec, default_kind, default_size)
+    return BACKENDS[kind](size)
+
+
+def parse_language_specs(value: str) -> Dict[str, str]:
+    """'hi=tiny,ta=faster-whisper:small' -> {"hi": "tiny", "ta": "faster-whisper:small"}"""
+    specs = {}
+    for item in value.split(","):
+        lang, sep, spec = item.partition("=")
+        if sep and lang.strip() and spec.strip():
+            specs[lang.strip()] = spec.strip()
+    return specs
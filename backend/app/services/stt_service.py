@@ -1,95 +1,201 @@
-import torch
-import whisper
 import librosa
 import numpy as np
-import json
-import asyncio
 import io
 import os
-from typing import Optional, Dict
+import threading
+from typing import Dict, List, Optional
 import logging
 
+from ..utils.metrics import async_stage, stage
+from ..utils.vad import VoiceActivityDetector
+from .language_router import LanguageRouter
+from .stt_backends import (
+    STTBackend, create_stt_backend, parse_backend_spec, parse_language_specs
+)
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class STTService:
     def __init__(self):
-        try:
-            # Load Whisper tiny for offline use
-            logger.info("Loading Whisper model...")
-            self.whisper_model = whisper.load_model("tiny")
-            logger.info("✅ Whisper model loaded successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to load Whisper model: {e}")
-            self.whisper_model = None
+        # Backend spec is "kind[:size]", e.g. "whisper:tiny", "whisper-int8:base",
+        # "faster-whisper:small"; STT_LANGUAGE_MODELS overrides it per language
+        # ("hi=tiny,ta=small" - a bare size keeps the default backend kind)
+        self.default_kind, self.default_size = parse_backend_spec(
+            os.getenv("STT_BACKEND", "whisper"), default_size=os.getenv("STT_MODEL_SIZE", "tiny")
+        )
+        self.language_specs = parse_language_specs(os.getenv("STT_LANGUAGE_MODELS", ""))
+        
+        self._backends: Dict[str, Optional[STTBackend]] = {}
+        self._backend_lock = threading.Lock()
+        
+        # Load the default backend up front for offline use
+        self.backend = self._get_backend(f"{self.default_kind}:{self.default_size}")
+        # ...and the per-language ones: backend_for runs on the event loop,
+        # where a first-use model load would stall every request
+        for spec in self.language_specs.values():
+            self._get_backend(spec)
+        
+        # Trim silence and skip empty clips before they reach the model
+        self.vad = VoiceActivityDetector() if os.getenv("STT_VAD_ENABLED", "true").lower() == "true" else None
+        
+        # Optional low-latency backend for short answers (e.g. STT_SHORT_BACKEND=vosk)
+        short_spec = os.getenv("STT_SHORT_BACKEND", "")
+        self.short_backend = self._get_backend(short_spec) if short_spec else None
+        self.short_max_seconds = float(os.getenv("STT_SHORT_MAX_SECONDS", 5))
         
         # Initialize Vosk as fallback
-        self.vosk_model = None
-        self.recognizer = None
+        self.vosk_backend = None
         self._init_vosk()
             
         self.supported_langs = ["hi", "en", "bn", "ta", "te", "mr", "gu"]
+        self.language_router = LanguageRouter(self.supported_langs)
+    
+    def _get_backend(self, spec: str) -> Optional[STTBackend]:
+        """Create and load a backend once; failures are cached as None"""
+        kind, size = parse_backend_spec(spec, self.default_kind, self.default_size)
+        label = f"{kind}:{size}"
+        
+        with self._backend_lock:
+            if label not in self._backends:
+                try:
+                    logger.info(f"Loading STT backend {label}...")
+                    backend = create_stt_backend(label)
+                    backend.load()
+                    self._backends[label] = backend
+                    logger.info(f"✅ STT backend {label} loaded successfully")
+                except Exception as e:
+                    logger.error(f"❌ Failed to load STT backend {label}: {e}")
+                    self._backends[label] = None
+            return self._backends[label]
+    
+    def backend_for(self, lang: Optional[str], speech_seconds: Optional[float] = None) -> Optional[STTBackend]:
+        """Backend for a language (and clip length), falling back to the default backend"""
+        if (self.short_backend and speech_seconds is not None
+                and speech_seconds <= self.short_max_seconds and self.short_backend.supports(lang)):
+            return self.short_backend
+        
+        if lang in self.language_specs:
+            backend = self._get_backend(self.language_specs[lang])
+            if backend:
+                return backend
+        return self.backend
     
     def _init_vosk(self):
         """Initialize Vosk model as fallback"""
-        try:
-            from vosk import Model, KaldiRecognizer
-            vosk_path = os.getenv("VOSK_MODEL_PATH", "./models/vosk/")
-            if os.path.exists(vosk_path):
-                self.vosk_model = Model(vosk_path)
-                self.recognizer = KaldiRecognizer(self.vosk_model, 16000)
-                logger.info("✅ Vosk model loaded successfully")
-        except Exception as e:
-            logger.warning(f"⚠️ Vosk model not available: {e}")
+        if self.short_backend and self.short_backend.name == "vosk":
+            self.vosk_backend = self.short_backend
+        elif os.path.exists(os.getenv("VOSK_MODEL_PATH", "./models/vosk/")):
+            self.vosk_backend = self._get_backend("vosk")
+        else:
+            logger.warning("⚠️ Vosk model not available")
     
-    async def transcribe(self, audio_data: bytes, lang: str = "hi") -> Dict:
-        """Transcribe audio to text with language detection"""
+    async def transcribe(self, audio_data: bytes, lang: Optional[str] = "hi",
+                         session_id: Optional[str] = None,
+                         survey_languages: Optional[List[str]] = None) -> Dict:
+        """Transcribe audio to text with language detection.
+        
+        lang is the enumerator's declared language; session_id lets a language
+        detected once be reused for the rest of the interview.
+        """
+        language, source = self.language_router.resolve(session_id, lang, survey_languages)
+        backend = None
         try:
-            if not self.whisper_model:
+            # Convert audio bytes to numpy array
+            audio_array = await self._bytes_to_audio_array(audio_data)
+            if audio_array.size == 0:
                 return {
                     "text": "",
-                    "language": lang,
+                    "language": language or lang,
                     "confidence": 0.0,
                     "success": False,
-                    "error": "Whisper model not loaded"
+                    "error": "Could not decode audio"
                 }
             
-            # Convert audio bytes to numpy array
-            audio_array = await self._bytes_to_audio_array(audio_data)
+            with stage("vad", audio_array.nbytes):
+                speech = self._split_speech(audio_array)
             
-            # Use Whisper for transcription
-            result = self.whisper_model.transcribe(
-                audio_array, 
-                language=lang if lang in self.supported_langs else None
-            )
+            # Nothing but silence/noise - answer without running the model
+            if speech["is_empty"]:
+                return {
+                    "text": "",
+                    "language": language or lang,
+                    "confidence": 0.0,
+                    "no_speech": True,
+                    "audio_seconds": speech["input_seconds"],
+                    "speech_seconds": 0.0,
+                    "success": True
+                }
             
-            detected_lang = result.get("language", lang)
-            text = result["text"].strip()
-            confidence = self._calculate_confidence(result)
+            # Unknown language: one detection pass on the first 30 s of speech,
+            # restricted to the survey's languages
+            if language is None and self.backend:
+                with async_stage("language_id"):
+                    detected = await self.backend.detect_language_async(speech["chunks"][0], survey_languages)
+                if detected:
+                    language, source = detected[0], "detected"
             
-            return {
-                "text": text,
-                "language": detected_lang,
-                "confidence": confidence,
-                "success": True
-            }
+            backend = self.backend_for(language, speech["speech_seconds"])
+            if not backend:
+                return {
+                    "text": "",
+                    "language": language or lang,
+                    "confidence": 0.0,
+                    "success": False,
+                    "error": "STT model not loaded"
+                }
+            
+            with async_stage("inference", sum(chunk.nbytes for chunk in speech["chunks"])):
+                result = await self._run_backend(backend, speech, language)
+            result["language_source"] = source if language else "model"
+            self.language_router.remember(session_id, result["language"])
+            return result
             
         except Exception as e:
             logger.error(f"Transcription error: {e}")
             
             # Fallback to Vosk if available
-            if self.vosk_model and self.recognizer:
+            if self.vosk_backend and backend is not self.vosk_backend and self.vosk_backend.supports(language):
                 return await self._vosk_transcribe(audio_data)
             
             return {
                 "text": "",
-                "language": lang,
+                "language": language or lang,
                 "confidence": 0.0,
                 "success": False,
                 "error": str(e)
             }
     
+    def _split_speech(self, audio_array: np.ndarray) -> Dict:
+        """VAD chunks of a clip, or the whole clip when VAD is disabled"""
+        if self.vad:
+            return self.vad.process(audio_array)
+        
+        seconds = round(len(audio_array) / 16000, 3)
+        return {"chunks": [audio_array], "is_empty": False, "input_seconds": seconds, "speech_seconds": seconds}
+    
+    async def _run_backend(self, backend: STTBackend, speech: Dict, lang: Optional[str]) -> Dict:
+        """Transcribe each speech chunk on the backend's thread pool and join the text"""
+        texts, segments = [], []
+        language = lang if lang in self.supported_langs else None
+        for chunk in speech["chunks"]:
+            result = await backend.transcribe_async(chunk, language=language)
+            # Later chunks reuse the first chunk's language instead of re-detecting
+            language = language or result.get("language")
+            texts.append(result["text"].strip())
+            segments.extend(result.get("segments", []))
+        
+        return {
+            "text": " ".join(t for t in texts if t),
+            "language": language or lang,
+            "confidence": self._calculate_confidence({"segments": segments}),
+            "model": backend.label,
+            "audio_seconds": speech["input_seconds"],
+            "speech_seconds": speech["speech_seconds"],
+            "success": True
+        }
+    
     async def _bytes_to_audio_array(self, audio_bytes: bytes) -> np.ndarray:
         """Convert audio bytes to numpy array for Whisper"""
         try:
@@ -97,7 +203,8 @@ class STTService:
             audio_io = io.BytesIO(audio_bytes)
             
             # Load audio using librosa
-            audio, sr = librosa.load(audio_io, sr=16000, mono=True)
+            with stage("decode", len(audio_bytes)):
+                audio, sr = librosa.load(audio_io, sr=16000, mono=True)
             return audio
             
         except Exception as e:
@@ -136,30 +243,25 @@ class STTService:
     
     async def _vosk_transcribe(self, audio_data: bytes) -> Dict:
         """Fallback transcription using Vosk"""
+        language = self.vosk_backend.language
         try:
             audio_array = await self._bytes_to_audio_array(audio_data)
-            
-            # Convert to the right format for Vosk
-            audio_int16 = (audio_array * 32768).astype(np.int16)
-            
-            # Process audio with Vosk
-            if self.recognizer.AcceptWaveform(audio_int16.tobytes()):
-                result = json.loads(self.recognizer.Result())
-            else:
-                result = json.loads(self.recognizer.PartialResult())
-            
-            return {
-                "text": result.get("text", ""),
-                "language": "hi",
-                "confidence": result.get("confidence", 0.5),
-                "success": True
-            }
+            speech = self._split_speech(audio_array)
+            if speech["is_empty"]:
+                return {
+                    "text": "",
+                    "language": language,
+                    "confidence": 0.0,
+                    "no_speech": True,
+                    "success": True
+                }
+            return await self._run_backend(self.vosk_backend, speech, language)
             
         except Exception as e:
             logger.error(f"Vosk transcription error: {e}")
             return {
                 "text": "",
-                "language": "hi",
+                "language": language,
                 "confidence": 0.0,
                 "success": False,
                 "error": str(e)
@@ -0,0 +1,270 @@
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.job import TranscriptionJobDB
+from ..models.response import AudioFileDB, ResponseDB
+from ..models.survey import SurveyDB
+from ..utils.metrics import trace
+from ..utils.privacy import PrivacyService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow()
+
+
+class TranscriptionQueue:
+    """DB-backed job queue that transcribes stored audio in the background"""
+
+    def __init__(self, stt_service, nlp_service, audio_storage,
+                 workers: Optional[int] = None,
+                 poll_interval: Optional[float] = None):
+        self.stt_service = stt_service
+        self.nlp_service = nlp_service
+        self.audio_storage = audio_storage
+        self.privacy_service = PrivacyService()
+
+        self.num_workers = workers or int(os.getenv("TRANSCRIPTION_WORKERS", 2))
+        self.poll_interval = poll_interval or float(os.getenv("TRANSCRIPTION_POLL_INTERVAL", 1.0))
+        self.retry_base_delay = float(os.getenv("TRANSCRIPTION_RETRY_BASE_SECONDS", 5))
+        self.retry_max_delay = float(os.getenv("TRANSCRIPTION_RETRY_MAX_SECONDS", 300))
+        # Jobs left 'running' longer than this belong to a crashed worker
+        self.stale_after = timedelta(seconds=float(os.getenv("TRANSCRIPTION_STALE_SECONDS", 600)))
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._next_stale_check = 0.0
+
+    @staticmethod
+    def enqueue(db: Session, audio_file_id: str, max_attempts: int = 3) -> TranscriptionJobDB:
+        """Add a pending transcription job for a stored audio file"""
+        job = TranscriptionJobDB(
+            id=str(uuid.uuid4()),
+            audio_file_id=audio_file_id,
+            status="pending",
+            attempts=0,
+            max_attempts=max_attempts,
+            next_run_at=_utcnow()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def notify(self):
+        """Wake idle workers after a new job was enqueued"""
+        self._wakeup.set()
+
+    async def start(self):
+        """Recover abandoned jobs and start the worker pool"""
+        self._stopping = False
+        self._requeue_stale_jobs()
+        self._next_stale_check = time.monotonic() + self.stale_after.total_seconds() / 2
+
+        for index in range(self.num_workers):
+            self._tasks.append(asyncio.create_task(self._worker(index)))
+
+        logger.info(f"✅ Transcription queue started with {self.num_workers} workers")
+
+    async def stop(self):
+        """Stop workers; in-flight jobs are recovered on next start"""
+        self._stopping = True
+        self._wakeup.set()
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, index: int):
+        while not self._stopping:
+            # One bad job or a DB hiccup must not end the worker; a stale
+            # "running" job is picked up again by _requeue_stale_jobs
+            try:
+                if time.monotonic() >= self._next_stale_check:
+                    self._next_stale_check = time.monotonic() + self.stale_after.total_seconds() / 2
+                    self._requeue_stale_jobs()
+
+                job_id = self._claim_next_job()
+                if job_id is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._run_job(job_id)
+            except Exception:
+                logger.exception(f"❌ Transcription worker {index} iteration failed")
+                await asyncio.sleep(self.poll_interval)
+
+    def _claim_next_job(self) -> Optional[str]:
+        """Atomically move one due job from pending to running"""
+        db = SessionLocal()
+        try:
+            now = _utcnow()
+            candidates = (
+                db.query(TranscriptionJobDB.id)
+                .filter(TranscriptionJobDB.status == "pending")
+                .filter(TranscriptionJobDB.next_run_at <= now)
+                .order_by(TranscriptionJobDB.next_run_at)
+                .limit(self.num_workers)
+                .all()
+            )
+
+            for (job_id,) in candidates:
+                # Conditional update so two workers never claim the same job
+                claimed = (
+                    db.query(TranscriptionJobDB)
+                    .filter(TranscriptionJobDB.id == job_id)
+                    .filter(TranscriptionJobDB.status == "pending")
+                    .update(
+                        {
+                            "status": "running",
+                            "locked_at": now,
+                            "attempts": TranscriptionJobDB.attempts + 1
+                        },
+                        synchronize_session=False
+                    )
+                )
+                db.commit()
+                if claimed:
+                    return job_id
+
+            return None
+        finally:
+            db.close()
+
+    def _requeue_stale_jobs(self):
+        """Return jobs abandoned mid-run to pending, or fail them when that
+        was their last attempt: a clip that crashes the worker (out of
+        memory on a huge file) must not be retried forever"""
+        db = SessionLocal()
+        try:
+            cutoff = _utcnow() - self.stale_after
+            stale = (
+                db.query(TranscriptionJobDB)
+                .filter(TranscriptionJobDB.status == "running")
+                .filter(TranscriptionJobDB.locked_at < cutoff)
+            )
+            failed = (
+                stale.filter(TranscriptionJobDB.attempts >= TranscriptionJobDB.max_attempts)
+                .update(
+                    {
+                        "status": "failed",
+                        "locked_at": None,
+                        "last_error": "Worker stopped during the last attempt"
+                    },
+                    synchronize_session=False
+                )
+            )
+            count = stale.update({"status": "pending", "locked_at": None}, synchronize_session=False)
+            db.commit()
+            if failed:
+                logger.warning(f"⚠️ Failed {failed} stale transcription jobs out of attempts")
+            if count:
+                logger.warning(f"⚠️ Re-queued {count} stale transcription jobs")
+        finally:
+            db.close()
+
+    async def _run_job(self, job_id: str):
+        db = SessionLocal()
+        try:
+            job = db.query(TranscriptionJobDB).filter(TranscriptionJobDB.id == job_id).first()
+            if not job:
+                logger.warning(f"⚠️ Transcription job {job_id} disappeared after it was claimed")
+                return
+
+            try:
+                audio = db.query(AudioFileDB).filter(AudioFileDB.id == job.audio_file_id).first()
+                if not audio:
+                    raise ValueError(f"Audio file {job.audio_file_id} not found")
+
+                with trace("transcription_job"):
+                    result = await self._process(audio, *self._interview_context(db, audio))
+
+                audio.transcription = result["transcription"]["text"]
+                audio.confidence = result["transcription"]["confidence"]
+                if not audio.language:
+                    audio.language = result["transcription"]["language"]
+
+                job.status = "completed"
+                # Extracted names and phone numbers are encrypted like response answers
+                job.result = {**result, "extracted_data": self.privacy_service.encrypt_sensitive_data(
+                    result["extracted_data"]
+                )}
+                job.last_error = None
+                job.completed_at = _utcnow()
+                db.commit()
+
+            except Exception as e:
+                logger.error(f"Transcription job {job_id} failed (attempt {job.attempts}): {e}")
+                db.rollback()
+                job.last_error = str(e)
+
+                if job.attempts >= job.max_attempts:
+                    job.status = "failed"
+                else:
+                    # Exponential backoff between attempts
+                    delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (job.attempts - 1))
+                    job.status = "pending"
+                    job.next_run_at = _utcnow() + timedelta(seconds=delay)
+                job.locked_at = None
+                db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _interview_context(db: Session, audio: AudioFileDB):
+        """(session id, survey languages, GPS point) so language is settled
+        once per interview and place names resolve near the interview"""
+        response = db.query(ResponseDB).filter(ResponseDB.id == audio.response_id).first()
+        if not response:
+            return audio.response_id, None, None
+        survey = db.query(SurveyDB).filter(SurveyDB.id == response.survey_id).first()
+        coordinates = None
+        if response.location_lat is not None and response.location_lng is not None:
+            coordinates = (response.location_lat, response.location_lng)
+        return response.id, (survey.languages if survey else None), coordinates
+
+    async def _process(self, audio: AudioFileDB, session_id: Optional[str] = None,
+                       survey_languages: Optional[List[str]] = None,
+                       coordinates: Optional[Tuple[float, float]] = None) -> Dict:
+        """Run Whisper and field extraction for one stored clip"""
+        audio_bytes = await self.audio_storage.read(audio.file_path)
+
+        # Awaited directly, as in /process-voice: model inference already runs on
+        # the STT backends' thread pools
+        transcription = await self.stt_service.transcribe(
+            audio_bytes, audio.language, session_id=session_id, survey_languages=survey_languages
+        )
+        if not transcription.get("success"):
+            raise RuntimeError(transcription.get("error", "Speech recognition failed"))
+
+        language = transcription.get("language")
+        extraction = await self.nlp_service.extract_fields(
+            transcription.get("text", ""), audio.question_id, language=language,
+            coordinates=coordinates
+        )
+
+        return {
+            "transcription": {
+                "text": transcription.get("text", ""),
+                "language": language,
+                "confidence": transcription.get("confidence", 0.0)
+            },
+            "extracted_data": extraction.get("extracted_data", {}),
+            "extraction_confidence": extraction.get("confidence", 0.0)
+        }
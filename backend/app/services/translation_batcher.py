@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TranslationBatcher:
+    """Coalesces concurrent sentence translations into padded model batches.
+
+    Requests queue up for at most max_wait_ms (or until max_batch_size
+    sentences are waiting), then one executor thread runs generate() under
+    torch.inference_mode, keeping the event loop free.
+    """
+
+    def __init__(self, model_provider: Callable[[], Tuple[object, object]],
+                 max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None,
+                 micro_batch_size: Optional[int] = None,
+                 max_length: int = 256):
+        # Resolved per batch, so a registry may swap or evict the model
+        self.model_provider = model_provider
+        self.max_batch_size = max_batch_size or int(os.getenv("TRANSLATION_MAX_BATCH", 32))
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else float(
+            os.getenv("TRANSLATION_MAX_WAIT_MS", 10))) / 1000
+        self.micro_batch_size = micro_batch_size or int(os.getenv("TRANSLATION_MICRO_BATCH", 8))
+        self.max_length = max_length
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # One generate() at a time per model; torch parallelises inside each call
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate")
+
+    async def translate(self, sentences: List[str]) -> List[str]:
+        """Translate sentences, sharing model batches with concurrent callers"""
+        if not sentences:
+            return []
+
+        self._ensure_worker()
+        loop = asyncio.get_event_loop()
+        futures = []
+        for sentence in sentences:
+            future = loop.create_future()
+            await self._queue.put((sentence, future))
+            futures.append(future)
+
+        return list(await asyncio.gather(*futures))
+
+    def _ensure_worker(self):
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._collect_batches())
+
+    async def _collect_batches(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            sentences = [sentence for sentence, _ in batch]
+            try:
+                translations = await loop.run_in_executor(self._executor, self.generate, sentences)
+                for (_, future), translation in zip(batch, translations):
+                    if not future.done():
+                        future.set_result(translation)
+            except Exception as e:
+                logger.error(f"Batched translation failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def generate(self, sentences: List[str]) -> List[str]:
+        """Translate a list of sentences synchronously (runs in the executor)"""
+        import torch
+
+        model, tokenizer = self.model_provider()
+
+        # Concurrent callers often ask for the same prompt - translate it once
+        requested = sentences
+        sentences = list(dict.fromkeys(requested))
+
+        # Sort by length so each micro-batch pads to similar lengths
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        results: List[Optional[str]] = [None] * len(sentences)
+
+        started = time.perf_counter()
+        with torch.inference_mode():
+            for offset in range(0, len(order), self.micro_batch_size):
+                indices = order[offset:offset + self.micro_batch_size]
+                encoded = tokenizer(
+                    [sentences[i] for i in indices],
+                    return_tensors="pt",
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length
+                )
+                generated = model.generate(**encoded, max_length=self.max_length)
+                decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+                for i, text in zip(indices, decoded):
+                    results[i] = text
+
+        logger.debug(f"Translated {len(sentences)} sentences in {time.perf_counter() - started:.3f}s")
+        translations = dict(zip(sentences, results))
+        return [translations[sentence] for sentence in requested]
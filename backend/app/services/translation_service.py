@@ -1,42 +1,40 @@
-from transformers import MarianMTModel, MarianTokenizer
-import json
+import os
 import re
+import unicodedata
+from collections import OrderedDict
 from typing import Dict, Optional
 
+from .model_registry import TranslationModelRegistry
+from .translation_batcher import TranslationBatcher
+from ..utils.dialect_mapper import DialectMapper
+
+# Split after sentence-final punctuation (danda, double danda, ?, !, .)
+SENTENCE_SPLIT = re.compile(r"(?<=[।॥?!.])\s+")
+
 class TranslationService:
     def __init__(self):
-        # Load dialect mappings
-        with open("data/dialect_mappings.json", "r", encoding="utf-8") as f:
-            self.dialect_mappings = json.load(f)
+        # Load dialect mappings (compiled once, hot-reloaded on change)
+        self.dialect_mapper = DialectMapper(
+            os.getenv("DIALECT_MAPPINGS_PATH", "data/dialect_mappings.json")
+        )
             
-        # Load MarianMT models
-        self.models = {}
-        self.tokenizers = {}
+        # MarianMT pairs loaded on demand, LRU-evicted under a memory budget
+        self.registry = TranslationModelRegistry()
         
-        # Load Hindi-English model
-        model_name = "Helsinki-NLP/opus-mt-hi-en"
-        self.models["hi-en"] = MarianMTModel.from_pretrained(model_name)
-        self.tokenizers["hi-en"] = MarianTokenizer.from_pretrained(model_name)
+        # One dynamic batcher per pair, plus a memo of translated sentences
+        self._batchers: Dict[str, TranslationBatcher] = {}
+        self._memo: "OrderedDict[tuple, str]" = OrderedDict()
+        self.memo_size = int(os.getenv("TRANSLATION_CACHE_SIZE", 10000))
     
     def map_dialect_to_standard(self, text: str, source_dialect: str) -> str:
         """Map dialectal words to standard Hindi/English"""
-        mapped_text = text
-        
-        if source_dialect in self.dialect_mappings:
-            dialect_dict = self.dialect_mappings[source_dialect]
-            
-            for dialect_word, standard_word in dialect_dict.items():
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(dialect_word) + r'\b'
-                mapped_text = re.sub(pattern, standard_word, mapped_text, flags=re.IGNORECASE)
-        
-        return mapped_text
+        return self.dialect_mapper.map(text, source_dialect)
     
     async def translate_to_standard(self, text: str, source_lang: str, target_lang: str = "hi") -> Dict:
         """Translate text to standard language"""
         try:
             # First map dialect to standard
-            if source_lang in ["bhojpuri", "marwari", "awadhi"]:
+            if self.dialect_mapper.has_dialect(source_lang):
                 mapped_text = self.map_dialect_to_standard(text, source_lang)
             else:
                 mapped_text = text
@@ -50,15 +48,18 @@ class TranslationService:
                     "method": "dialect_mapping"
                 }
             
-            # Use neural translation if model available
-            model_key = f"{source_lang}-{target_lang}"
-            if model_key in self.models:
-                translated = await self._neural_translate(mapped_text, model_key)
+            # Use neural translation if a direct or English-pivot route exists
+            route = self.registry.route(source_lang, target_lang)
+            if route:
+                translated = mapped_text
+                for model_key in route:
+                    translated = await self._neural_translate(translated, model_key)
                 return {
                     "original": text,
                     "translated": translated,
-                    "confidence": 0.8,
-                    "method": "neural"
+                    "confidence": 0.8 if len(route) == 1 else 0.7,
+                    "method": "neural" if len(route) == 1 else "neural_pivot",
+                    "route": route
                 }
             
             # Fallback to dictionary-based translation
@@ -79,12 +80,37 @@ class TranslationService:
     
     async def _neural_translate(self, text: str, model_key: str) -> str:
         """Perform neural translation"""
-        model = self.models[model_key]
-        tokenizer = self.tokenizers[model_key]
+        sentences = [s for s in SENTENCE_SPLIT.split(text.strip()) if s]
+        keys = [self._normalize(sentence) for sentence in sentences]
         
-        # Tokenize and translate
-        tokens = tokenizer.encode(text, return_tensors="pt")
-        translated_tokens = model.generate(tokens, max_length=100)
-        translated_text = tokenizer.decode(translated_tokens[0], skip_special_tokens=True)
+        translated = {}
+        for key in keys:
+            cached = self._memo.get((model_key, key))
+            if cached is not None:
+                self._memo.move_to_end((model_key, key))
+                translated[key] = cached
         
-        return translated_text
+        # Only unseen sentences go to the model, deduplicated
+        missing = [key for key in dict.fromkeys(keys) if key not in translated]
+        if missing:
+            results = await self._get_batcher(model_key).translate(missing)
+            for key, result in zip(missing, results):
+                translated[key] = result
+                self._remember(model_key, key, result)
+        
+        return " ".join(translated[key] for key in keys)
+    
+    def _get_batcher(self, model_key: str) -> TranslationBatcher:
+        if model_key not in self._batchers:
+            self._batchers[model_key] = TranslationBatcher(lambda: self.registry.get(model_key))
+        return self._batchers[model_key]
+    
+    def _remember(self, model_key: str, key: str, translation: str):
+        self._memo[(model_key, key)] = translation
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+    
+    @staticmethod
+    def _normalize(sentence: str) -> str:
+        """Memo key: NFC-normalized text with collapsed whitespace"""
+        return " ".join(unicodedata.normalize("NFC", sentence).split())
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Formats the disk tier may hold, in lookup order
+CACHE_FORMATS = ["wav", "mp3", "ogg"]
+
+
+class TTSCache:
+    """Two-tier (memory LRU + disk) cache of synthesized prompt audio"""
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_memory_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.getenv("TTS_CACHE_DIR", "tts_cache")
+        self.max_memory_bytes = max_memory_bytes or int(
+            os.getenv("TTS_CACHE_MEMORY_MB", 64)
+        ) * 1024 * 1024
+
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, lang: str, slow: bool, voice: Optional[str]) -> str:
+        """Stable cache key for a synthesis request"""
+        payload = json.dumps([text.strip(), lang, bool(slow), voice or ""], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Return (audio_bytes, format) from memory, then disk"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        for fmt in CACHE_FORMATS:
+            path = self._path(key, fmt)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    audio = f.read()
+                self._remember(key, audio, fmt)
+                self.hits += 1
+                return audio, fmt
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, audio: bytes, fmt: str):
+        """Store audio in both tiers"""
+        if not audio:
+            return
+
+        path = self._path(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write-then-rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write TTS cache entry: {e}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+        self._remember(key, audio, fmt)
+
+    def _remember(self, key: str, audio: bytes, fmt: str):
+        if len(audio) > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous:
+                self._memory_bytes -= len(previous[0])
+
+            self._memory[key] = (audio, fmt)
+            self._memory_bytes += len(audio)
+
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (evicted, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{fmt}")
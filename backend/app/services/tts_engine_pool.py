@@ -0,0 +1,119 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Voice name fragments used to pick a voice for a language
+LANGUAGE_VOICE_NAMES = {
+    "hi": "hindi",
+    "en": "english",
+    "bn": "bengali",
+    "ta": "tamil"
+}
+
+# pyttsx3 drivers can only render to a path, so each worker reuses one
+# scratch file on tmpfs (/dev/shm) and hands the bytes back in memory
+_SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Per-process engine state, populated by _init_worker in each pool process
+_engine = None
+_default_voice = None
+_scratch_path = None
+
+
+def _init_worker():
+    """Create this worker process's private pyttsx3 engine"""
+    global _engine, _default_voice, _scratch_path
+    import pyttsx3
+
+    _engine = pyttsx3.init()
+    _engine.setProperty('volume', 1.0)
+    _default_voice = _engine.getProperty('voice')
+    _scratch_path = os.path.join(_SCRATCH_DIR, f"bharatpulse-tts-{os.getpid()}.wav")
+
+
+def _resolve_voice(voice: Optional[str], lang: str) -> str:
+    voices = _engine.getProperty('voices')
+
+    if voice:
+        for v in voices:
+            if voice in (v.id, v.name):
+                return v.id
+
+    name_fragment = LANGUAGE_VOICE_NAMES.get(lang)
+    if name_fragment:
+        for v in voices:
+            if name_fragment in v.name.lower():
+                return v.id
+
+    return _default_voice
+
+
+def _synthesize(text: str, rate: int, voice: Optional[str], lang: str) -> bytes:
+    """Render one utterance inside a worker process"""
+    # Every property is set on every call so nothing leaks between requests
+    _engine.setProperty('rate', rate)
+    _engine.setProperty('voice', _resolve_voice(voice, lang))
+
+    _engine.save_to_file(text, _scratch_path)
+    _engine.runAndWait()
+
+    try:
+        with open(_scratch_path, 'rb') as f:
+            return f.read()
+    finally:
+        os.unlink(_scratch_path)
+
+
+def _list_voices() -> Dict[str, str]:
+    return {v.id: v.name for v in _engine.getProperty('voices')}
+
+
+class TTSPoolBusy(Exception):
+    """Raised when the synthesis queue stays full past the timeout"""
+
+
+class TTSEnginePool:
+    """Pool of isolated pyttsx3 engines, one per worker process"""
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 queue_timeout: Optional[float] = None):
+        self.workers = workers or int(os.getenv("TTS_ENGINE_WORKERS", 2))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("TTS_ENGINE_QUEUE", 16))
+        self.queue_timeout = queue_timeout or float(os.getenv("TTS_QUEUE_TIMEOUT", 10))
+
+        # Spawned (not forked) workers never inherit driver state from the parent
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        # Bounds running + waiting syntheses
+        self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+
+    async def synthesize(self, text: str, rate: int = 150, voice: Optional[str] = None,
+                         lang: str = "hi") -> bytes:
+        """Synthesize in a worker process and return WAV bytes"""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise TTSPoolBusy("Offline TTS queue is full")
+
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.executor, _synthesize, text, rate, voice, lang)
+        finally:
+            self._slots.release()
+
+    def list_voices(self, timeout: float = 30) -> Dict[str, str]:
+        """Voice id -> name, as seen by a worker engine"""
+        return self.executor.submit(_list_voices).result(timeout=timeout)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,20 +1,25 @@
-import pyttsx3
 import asyncio
 import base64
 import io
-import os
-import tempfile
 from gtts import gTTS
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from .tts_cache import TTSCache
+from .tts_engine_pool import TTSEnginePool, TTSPoolBusy
+from ..utils.audio_codec import OUTPUT_PROFILES, sniff_format, transcode_bytes
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TTSService:
     def __init__(self):
-        self.engine = None
-        self._init_pyttsx3()
+        self.engine_pool = None
+        self._init_engine_pool()
+        
+        # Prompt audio cache and in-flight syntheses (one render per key)
+        self.cache = TTSCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
         
         # Language voice mapping
         self.voice_mapping = {
@@ -24,36 +29,30 @@ class TTSService:
             "ta": "ta"
         }
     
-    def _init_pyttsx3(self):
-        """Initialize pyttsx3 for offline TTS"""
+    def _init_engine_pool(self):
+        """Start isolated pyttsx3 worker processes for offline TTS"""
         try:
-            self.engine = pyttsx3.init()
-            voices = self.engine.getProperty('voices')
-            
-            # Find Hindi voice if available
-            for voice in voices:
-                if 'hindi' in voice.name.lower():
-                    self.engine.setProperty('voice', voice.id)
-                    break
-            
-            # Set speech rate and volume
-            self.engine.setProperty('rate', 150)
-            self.engine.setProperty('volume', 1.0)
-            logger.info("✅ pyttsx3 TTS initialized successfully")
+            self.engine_pool = TTSEnginePool()
+            # Fails fast if pyttsx3 cannot initialise in the workers
+            self.engine_pool.list_voices()
+            logger.info(f"✅ pyttsx3 TTS pool initialized with {self.engine_pool.workers} workers")
             
         except Exception as e:
             logger.warning(f"⚠️ pyttsx3 initialization failed: {e}")
-            self.engine = None
+            if self.engine_pool:
+                self.engine_pool.shutdown()
+            self.engine_pool = None
+    
+    def close(self):
+        """Stop offline TTS worker processes"""
+        if self.engine_pool:
+            self.engine_pool.shutdown()
     
-    async def synthesize(self, text: str, lang: str = "hi", slow: bool = False) -> str:
+    async def synthesize(self, text: str, lang: str = "hi", slow: bool = False,
+                         voice: Optional[str] = None, profile: Optional[str] = None) -> str:
         """Synthesize text to speech and return base64 audio"""
         try:
-            # Try offline TTS first
-            if self.engine and lang == "hi":
-                audio_data = await self._offline_tts(text, slow)
-            else:
-                # Use online TTS as fallback
-                audio_data = await self._online_tts(text, lang, slow)
+            audio_data, _ = await self.synthesize_audio(text, lang, slow, voice, profile)
             
             if audio_data:
                 # Convert to base64
@@ -66,43 +65,106 @@ class TTSService:
             logger.error(f"TTS synthesis error: {e}")
             return ""
     
-    async def _offline_tts(self, text: str, slow: bool = False) -> bytes:
-        """Generate speech using pyttsx3 (offline)"""
-        if not self.engine:
-            raise Exception("pyttsx3 engine not available")
+    async def synthesize_audio(self, text: str, lang: str = "hi", slow: bool = False,
+                               voice: Optional[str] = None,
+                               profile: Optional[str] = None) -> Tuple[bytes, str]:
+        """Synthesize text to speech and return (audio_bytes, format), using the cache
+        
+        profile selects a bandwidth-friendly encoding from OUTPUT_PROFILES; the
+        engine's native WAV/MP3 is returned when it is unset or ffmpeg is missing.
+        """
+        if profile not in OUTPUT_PROFILES:
+            return await self._synthesize_source(text, lang, slow, voice)
         
-        def generate_speech():
-            try:
-                # Adjust rate for slow speech
-                rate = 100 if slow else 150
-                self.engine.setProperty('rate', rate)
-                
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                    temp_filename = temp_file.name
-                
-                # Generate speech
-                self.engine.save_to_file(text, temp_filename)
-                self.engine.runAndWait()
-                
-                # Read the generated file
-                with open(temp_filename, 'rb') as f:
-                    audio_data = f.read()
-                
-                # Clean up
-                os.unlink(temp_filename)
-                
-                return audio_data
-                
-            except Exception as e:
-                logger.error(f"Offline TTS generation error: {e}")
-                return b""
+        variant_key = f"{self.cache.make_key(text, lang, slow, voice)}-{profile}"
+        cached = self.cache.get(variant_key)
+        if cached:
+            return cached
         
-        # Run in thread to avoid blocking
-        loop = asyncio.get_event_loop()
-        audio_data = await loop.run_in_executor(None, generate_speech)
+        source = await self._synthesize_source(text, lang, slow, voice)
+        if not source[0]:
+            return source
         
-        return audio_data
+        settings = OUTPUT_PROFILES[profile]
+        encoded = await transcode_bytes(source[0], settings["args"])
+        if not encoded:
+            return source
+        
+        self.cache.put(variant_key, encoded, settings["format"])
+        return encoded, settings["format"]
+    
+    async def _synthesize_source(self, text: str, lang: str, slow: bool,
+                                 voice: Optional[str]) -> Tuple[bytes, str]:
+        """Render with the TTS engine (cached), in its native format"""
+        key = self.cache.make_key(text, lang, slow, voice)
+        
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        
+        # Concurrent requests for the same prompt share one synthesis
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+        
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        try:
+            # Try offline TTS first
+            if self.engine_pool and lang == "hi":
+                audio_data = await self._offline_tts(text, slow, voice)
+            else:
+                # Use online TTS as fallback
+                audio_data = await self._online_tts(text, lang, slow)
+            
+            result = (audio_data, sniff_format(audio_data) if audio_data else "wav")
+            if audio_data:
+                self.cache.put(key, *result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    async def prerender(self, texts: List[str], languages: List[str],
+                        slow: bool = False, voice: Optional[str] = None) -> Dict:
+        """Warm the cache with every prompt in every language"""
+        stats = {"rendered": 0, "cached": 0, "failed": 0}
+        
+        for lang in languages or ["hi"]:
+            for text in dict.fromkeys(t for t in texts if t and t.strip()):
+                key = self.cache.make_key(text, lang, slow, voice)
+                if self.cache.get(key):
+                    stats["cached"] += 1
+                    continue
+                try:
+                    audio_data, _ = await self.synthesize_audio(text, lang, slow, voice)
+                    stats["rendered" if audio_data else "failed"] += 1
+                except Exception as e:
+                    logger.warning(f"⚠️ Prompt pre-render failed ({lang}): {e}")
+                    stats["failed"] += 1
+        
+        logger.info(f"✅ TTS pre-render finished: {stats}")
+        return stats
+    
+    async def _offline_tts(self, text: str, slow: bool = False,
+                           voice: Optional[str] = None) -> bytes:
+        """Generate speech using pyttsx3 (offline)"""
+        if not self.engine_pool:
+            raise Exception("pyttsx3 engine not available")
+        
+        # Rate and voice travel with the request, never via shared engine state
+        rate = 100 if slow else 150
+        try:
+            return await self.engine_pool.synthesize(text, rate=rate, voice=voice, lang="hi")
+        except TTSPoolBusy:
+            raise
+        except Exception as e:
+            logger.error(f"Offline TTS generation error: {e}")
+            return b""
     
     async def _online_tts(self, text: str, lang: str, slow: bool = False) -> bytes:
         """Generate speech using gTTS (requires internet)"""
@@ -123,7 +185,7 @@ class TTSService:
         except Exception as e:
             logger.error(f"Online TTS failed: {e}")
             # Try offline TTS as final fallback
-            if self.engine:
+            if self.engine_pool:
                 return await self._offline_tts(text, slow)
             return b""
     
@@ -131,11 +193,10 @@ class TTSService:
         """Get list of available voices"""
         voices = {}
         
-        if self.engine:
-            engine_voices = self.engine.getProperty('voices')
-            for voice in engine_voices:
-                lang_code = self._extract_lang_code(voice.name)
-                voices[lang_code] = voice.name
+        if self.engine_pool:
+            for voice_name in self.engine_pool.list_voices().values():
+                lang_code = self._extract_lang_code(voice_name)
+                voices[lang_code] = voice_name
         
         return voices
     
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import shutil
+from typing import List, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+# Opus in an Ogg container tuned for speech: mono, 16 kHz, VoIP mode
+OPUS_SPEECH_ARGS = [
+    "-ac", "1",
+    "-ar", "16000",
+    "-c:a", "libopus",
+    "-b:a", "24k",
+    "-application", "voip",
+    "-f", "ogg",
+]
+
+_ffmpeg_path: Optional[str] = None
+_ffmpeg_checked = False
+
+
+def ffmpeg_available() -> bool:
+    """Check once whether the ffmpeg binary is on PATH"""
+    global _ffmpeg_path, _ffmpeg_checked
+    if not _ffmpeg_checked:
+        _ffmpeg_path = shutil.which(FFMPEG_BINARY)
+        _ffmpeg_checked = True
+        if not _ffmpeg_path:
+            logger.warning("⚠️ ffmpeg not found - audio transcoding disabled")
+    return _ffmpeg_path is not None
+
+
+async def transcode_file(source_path: str, target_path: str, output_args: List[str]) -> bool:
+    """Transcode an audio file with ffmpeg, returning True on success"""
+    if not ffmpeg_available():
+        return False
+
+    process = await asyncio.create_subprocess_exec(
+        _ffmpeg_path, "-nostdin", "-loglevel", "error", "-y",
+        "-i", source_path, *output_args, target_path,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+
+    if process.returncode != 0:
+        logger.error(f"ffmpeg transcoding failed: {stderr.decode(errors='ignore').strip()}")
+        if os.path.exists(target_path):
+            os.unlink(target_path)
+        return False
+
+    return True
+
+
+def sniff_format(data: bytes) -> str:
+    """Guess the container format of encoded audio from its magic bytes"""
+    if data[:4] == b"RIFF":
+        return "wav"
+    if data[:4] == b"OggS":
+        return "ogg"
+    if data[:3] == b"ID3" or (len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return "wav"
+
+
+# Output profiles for prompt audio sent to clients; speech needs far less
+# than music-grade bitrates, especially on 2G links
+OUTPUT_PROFILES = {
+    "opus-16k": {
+        "format": "ogg",
+        "media_type": "audio/ogg",
+        "args": ["-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "16k",
+                 "-application", "voip", "-f", "ogg"],
+    },
+    "opus-8k": {
+        "format": "ogg",
+        "media_type": "audio/ogg",
+        "args": ["-ac", "1", "-ar", "8000", "-c:a", "libopus", "-b:a", "8k",
+                 "-application", "voip", "-f", "ogg"],
+    },
+    "mp3": {
+        "format": "mp3",
+        "media_type": "audio/mpeg",
+        "args": ["-ac", "1", "-ar", "16000", "-c:a", "libmp3lame", "-b:a", "32k", "-f", "mp3"],
+    },
+    "wav-8k": {
+        "format": "wav",
+        "media_type": "audio/wav",
+        "args": ["-ac", "1", "-ar", "8000", "-c:a", "pcm_s16le", "-f", "wav"],
+    },
+}
+
+MEDIA_TYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+}
+
+
+async def transcode_bytes(data: bytes, output_args: List[str]) -> Optional[bytes]:
+    """Transcode in-memory audio through ffmpeg pipes, None on failure"""
+    if not ffmpeg_available():
+        return None
+
+    process = await asyncio.create_subprocess_exec(
+        _ffmpeg_path, "-nostdin", "-loglevel", "error",
+        "-i", "pipe:0", *output_args, "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(data)
+
+    if process.returncode != 0 or not stdout:
+        logger.error(f"ffmpeg transcoding failed: {stderr.decode(errors='ignore').strip()}")
+        return None
+
+    return stdout
+
+
+def negotiate_profile(accept: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+    """Pick an output profile from an explicit ?format= or the Accept header"""
+    if requested:
+        return requested if requested in OUTPUT_PROFILES else None
+
+    if not accept:
+        return None
+
+    # Walk media ranges by descending q-value (stable, so ties keep client order)
+    ranges = []
+    for part in accept.split(","):
+        media_range, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((quality, media_range.lower()))
+
+    for _, media_range in sorted(ranges, key=lambda r: -r[0]):
+        if media_range in ("audio/ogg", "audio/opus"):
+            return "opus-16k"
+        if media_range in ("audio/mpeg", "audio/mp3"):
+            return "mp3"
+        if media_range in ("audio/wav", "audio/x-wav", "audio/wave", "audio/*", "*/*"):
+            return None
+
+    return None
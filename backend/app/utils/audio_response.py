@@ -0,0 +1,72 @@
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def audio_response(request: Request, audio: bytes, media_type: str,
+                   etag: str, max_age: int = 86400) -> Response:
+    """Binary audio response with ETag revalidation and single byte-range support"""
+    etag_value = f'"{etag}"'
+    headers = {
+        "ETag": etag_value,
+        "Cache-Control": f"public, max-age={max_age}",
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if etag_value in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and _range_applies(request, etag_value):
+        byte_range = _parse_range(range_header, len(audio))
+
+        if byte_range == "unsatisfiable":
+            headers["Content-Range"] = f"bytes */{len(audio)}"
+            return Response(status_code=416, headers=headers)
+
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(audio)}"
+            return Response(
+                content=audio[start:end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers=headers
+            )
+
+    return Response(content=audio, media_type=media_type, headers=headers)
+
+
+def _range_applies(request: Request, etag_value: str) -> bool:
+    """If-Range: only honour the range when the client's copy is current"""
+    if_range = request.headers.get("if-range")
+    return not if_range or if_range.strip() == etag_value
+
+
+def _parse_range(header: str, size: int):
+    """Parse 'bytes=a-b' / 'bytes=a-' / 'bytes=-n'; multi-range requests get the full body"""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if not start_text:
+            # Suffix range: last N bytes
+            length = int(end_text)
+            if length <= 0:
+                return "unsatisfiable"
+            return max(0, size - length), size - 1
+
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        return "unsatisfiable"
+
+    return start, min(end, size - 1)
@@ -0,0 +1,142 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# \w alone misses Indic combining vowel signs (matras), which would split
+# words like "बाड़ी" - include the Devanagari..Malayalam blocks explicitly
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u0D7F]+")
+
+# Trie key marking "a dialect phrase ends here"; never a valid token
+_END = ""
+
+
+class DialectMapper:
+    """Maps dialect words/phrases to standard forms in a single pass.
+
+    Each dialect's dictionary is compiled at load time into a token trie, so
+    a lookup costs one dict access per token regardless of dictionary size.
+    Multi-word entries match across whitespace, the longest entry wins, and
+    matching is case-insensitive like the old per-word regex loop.
+    """
+
+    def __init__(self, path: str = "data/dialect_mappings.json",
+                 reload_interval: Optional[float] = None):
+        self.path = path
+        self.reload_interval = reload_interval if reload_interval is not None else float(
+            os.getenv("DIALECT_RELOAD_INTERVAL", 5)
+        )
+
+        self._tries: Dict[str, dict] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+        self.reload()
+
+    @staticmethod
+    def compile(mappings: Dict[str, str]) -> dict:
+        """Build a token trie from {dialect phrase: standard phrase}"""
+        trie: dict = {}
+        for dialect_phrase, standard_phrase in mappings.items():
+            tokens = [t.casefold() for t in TOKEN_PATTERN.findall(dialect_phrase)]
+            if not tokens:
+                continue
+            node = trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = standard_phrase
+        return trie
+
+    def reload(self) -> bool:
+        """(Re)load the mappings file; keeps the previous tries on error"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+
+            tries = {dialect.lower(): self.compile(mapping) for dialect, mapping in raw.items()}
+
+            with self._lock:
+                self._tries = tries
+                self._mtime = mtime
+            logger.info(f"✅ Dialect mappings loaded for: {', '.join(sorted(tries)) or 'none'}")
+            return True
+
+        except FileNotFoundError:
+            logger.warning(f"⚠️ Dialect mappings not found at {self.path}")
+        except Exception as e:
+            logger.error(f"❌ Failed to load dialect mappings: {e}")
+        return False
+
+    def maybe_reload(self):
+        """Pick up edits to the mappings file, checking at most every reload_interval"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def dialects(self) -> List[str]:
+        return sorted(self._tries)
+
+    def has_dialect(self, dialect: str) -> bool:
+        return dialect.lower() in self._tries
+
+    def map(self, text: str, dialect: str) -> str:
+        """Replace every dialect phrase in text with its standard form"""
+        self.maybe_reload()
+
+        trie = self._tries.get(dialect.lower())
+        if not trie or not text:
+            return text
+
+        matches = list(TOKEN_PATTERN.finditer(text))
+        folded = [m.group(0).casefold() for m in matches]
+
+        pieces = []
+        last_end = 0
+        i = 0
+        while i < len(matches):
+            node = trie.get(folded[i])
+            if node is None:
+                i += 1
+                continue
+
+            # Extend across whitespace-separated tokens, remembering the longest hit
+            best_end, replacement = (i, node[_END]) if _END in node else (None, None)
+            j = i + 1
+            while j < len(matches) and text[matches[j - 1].end():matches[j].start()].isspace():
+                node = node.get(folded[j])
+                if node is None:
+                    break
+                if _END in node:
+                    best_end, replacement = j, node[_END]
+                j += 1
+
+            if best_end is None:
+                i += 1
+                continue
+
+            pieces.append(text[last_end:matches[i].start()])
+            pieces.append(replacement)
+            last_end = matches[best_end].end()
+            i = best_end + 1
+
+        if not pieces:
+            return text
+
+        pieces.append(text[last_end:])
+        return "".join(pieces)
@@ -0,0 +1,377 @@
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .option_index import OptionIndex
+
+# Numbers (Indian "1,50,000" grouping, decimals, "5k") or words; \w alone
+# misses Indic combining vowel signs, so the Devanagari..Malayalam blocks
+# are listed explicitly as in utils.dialect_mapper
+TOKEN_PATTERN = re.compile(r"\d+(?:,\d+)*(?:\.\d+)?k?|[\w\u0900-\u0D7F]+")
+
+
+def normalize(text: str) -> str:
+    """Casefolded text with nukta dropped and chandrabindu as anusvara (हज़ार = हजार, हाँ = हां)"""
+    text = unicodedata.normalize("NFD", str(text).casefold())
+    return unicodedata.normalize("NFC", text.replace("\u093C", "").replace("\u0901", "\u0902"))
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+def _words(table: Dict[str, Any]) -> Dict[str, Any]:
+    return {normalize(word): value for word, value in table.items()}
+
+
+# Hindi numbers below 100 are irregular words rather than tens + units
+HINDI_NUMBERS = [
+    "शून्य", "एक", "दो", "तीन", "चार", "पांच", "छह", "सात", "आठ", "नौ",
+    "दस", "ग्यारह", "बारह", "तेरह", "चौदह", "पंद्रह", "सोलह", "सत्रह", "अठारह", "उन्नीस",
+    "बीस", "इक्कीस", "बाईस", "तेईस", "चौबीस", "पच्चीस", "छब्बीस", "सत्ताईस", "अट्ठाईस", "उनतीस",
+    "तीस", "इकतीस", "बत्तीस", "तैंतीस", "चौंतीस", "पैंतीस", "छत्तीस", "सैंतीस", "अड़तीस", "उनतालीस",
+    "चालीस", "इकतालीस", "बयालीस", "तैंतालीस", "चौवालीस", "पैंतालीस", "छियालीस", "सैंतालीस", "अड़तालीस", "उनचास",
+    "पचास", "इक्यावन", "बावन", "तिरेपन", "चौवन", "पचपन", "छप्पन", "सत्तावन", "अट्ठावन", "उनसठ",
+    "साठ", "इकसठ", "बासठ", "तिरेसठ", "चौंसठ", "पैंसठ", "छियासठ", "सड़सठ", "अड़सठ", "उनहत्तर",
+    "सत्तर", "इकहत्तर", "बहत्तर", "तिहत्तर", "चौहत्तर", "पचहत्तर", "छिहत्तर", "सतहत्तर", "अठहत्तर", "उन्यासी",
+    "अस्सी", "इक्यासी", "बयासी", "तिरासी", "चौरासी", "पचासी", "छियासी", "सत्तासी", "अट्ठासी", "नवासी",
+    "नब्बे", "इक्यानवे", "बानवे", "तिरानवे", "चौरानवे", "पचानवे", "छियानवे", "सत्तानवे", "अट्ठानवे", "निन्यानवे",
+]
+
+ENGLISH_NUMBERS = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen",
+]
+ENGLISH_TENS = ["twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+
+NUMBER_WORDS = _words({
+    **{word: value for value, word in enumerate(HINDI_NUMBERS)},
+    **{word: value for value, word in enumerate(ENGLISH_NUMBERS)},
+    **{word: (index + 2) * 10 for index, word in enumerate(ENGLISH_TENS)},
+    # Spelling variants and romanized Hindi heard in transcripts
+    "छः": 6, "छे": 6, "अठ्ठाईस": 28, "पन्द्रह": 15, "fourty": 40,
+    "ek": 1, "char": 4, "panch": 5, "paanch": 5, "chhe": 6, "saat": 7,
+    "aath": 8, "nau": 9, "das": 10, "bees": 20, "tees": 30, "chalis": 40, "pachas": 50,
+    "pachaas": 50, "sattar": 70, "assi": 80, "nabbe": 90,
+    "डेढ़": 1.5, "ढाई": 2.5, "dedh": 1.5, "dhai": 2.5, "half": 0.5, "आधा": 0.5,
+})
+HUNDRED_WORDS = _words({"सौ": 1, "hundred": 1, "sau": 1})
+SCALE_WORDS = _words({
+    "हजार": 10 ** 3, "thousand": 10 ** 3, "hazar": 10 ** 3, "hazaar": 10 ** 3, "hajar": 10 ** 3,
+    "लाख": 10 ** 5, "lakh": 10 ** 5, "lakhs": 10 ** 5, "lac": 10 ** 5, "lacs": 10 ** 5,
+    "करोड़": 10 ** 7, "करोड": 10 ** 7, "crore": 10 ** 7, "crores": 10 ** 7, "karod": 10 ** 7,
+    "million": 10 ** 6,
+})
+# साढ़े तीन = 3.5, सवा दो = 2.25, पौने चार = 3.75: they adjust the number that follows
+FRACTION_PREFIXES = _words({
+    "साढ़े": 0.5, "सवा": 0.25, "पौने": -0.25,
+    "sadhe": 0.5, "saade": 0.5, "sava": 0.25, "sawa": 0.25, "paune": -0.25,
+})
+NUMBER_CONNECTORS = {"and", "a", "an"}
+
+
+def _digits(token: str) -> Optional[float]:
+    thousands = token.endswith("k")
+    try:
+        value = float(token.rstrip("k").replace(",", ""))
+    except ValueError:
+        return None
+    return value * 1000 if thousands else value
+
+
+def _place(value: float) -> int:
+    """Lowest non-zero decimal place of a whole number (300 -> 100, 25 -> 1)"""
+    place = 1
+    value = int(value)
+    while value and value % (place * 10) == 0:
+        place *= 10
+    return place
+
+
+def _clean(value: float):
+    return int(value) if float(value).is_integer() else round(value, 4)
+
+
+def parse_numbers(text: str) -> List[Tuple[Any, int, int]]:
+    """(value, first token, end token) of every number phrase: "पचास हज़ार",
+    "5 lakh", "two and a half lakh", "साढ़े तीन सौ", "1,50,000"."""
+    tokens = tokenize(text)
+    found = []
+    total, current, pending, start = 0.0, None, 0.0, None
+
+    def finish(end):
+        nonlocal total, current, pending, start
+        if start is not None and (current is not None or total):
+            found.append((_clean(total + (current or 0)), start, end))
+        total, current, pending, start = 0.0, None, 0.0, None
+
+    for index, token in enumerate(tokens):
+        value = _digits(token) if token[0].isdigit() else NUMBER_WORDS.get(token)
+        if value is not None:
+            if current is not None and not (
+                float(current).is_integer() and value < _place(current) or value == 0.5
+            ):
+                finish(index)
+            start = index if start is None else start
+            current = (current or 0) + value + pending
+            pending = 0.0
+        elif token in FRACTION_PREFIXES:
+            if current is not None:
+                finish(index)
+            start = index if start is None else start
+            pending = FRACTION_PREFIXES[token]
+        elif token in HUNDRED_WORDS and start is not None or token in SCALE_WORDS:
+            start = index if start is None else start
+            # A prefix right before the scale adjusts an implied one: सवा लाख = 1.25 lakh
+            base = (current if current is not None else 1) + pending
+            pending = 0.0
+            if token in HUNDRED_WORDS:
+                current = base * 100
+            else:
+                total += base * SCALE_WORDS[token]
+                current = None
+        elif token in NUMBER_CONNECTORS and start is not None:
+            continue
+        elif start is not None:
+            finish(index)
+    finish(len(tokens))
+    return found
+
+
+class Extractor(ABC):
+    """A compiled extractor: pure, text in, value (or None) out.
+
+    batch() runs many answers at once; spoken answers repeat a lot ("हाँ",
+    "नहीं", the same few options), so each distinct normalized answer is
+    parsed only once.
+    """
+
+    # Whether a value from this extractor replaces one the field's regex patterns found
+    overrides_patterns = False
+
+    @abstractmethod
+    def __call__(self, text: str):
+        """The value in one answer, or None"""
+
+    def batch(self, texts: Iterable[str]) -> List[Any]:
+        texts = list(texts)
+        results = {}
+        for text in texts:
+            key = normalize(text or "").strip()
+            if key not in results:
+                results[key] = self(text) if key else None
+        return [results[normalize(text or "").strip()] for text in texts]
+
+
+class NumberExtractor(Extractor):
+    """First number in the answer, from digits or Hindi/English number words"""
+
+    def __call__(self, text: str):
+        numbers = parse_numbers(text or "")
+        return numbers[0][0] if numbers else None
+
+
+MONTHS = _words({
+    **{name: index for index, name in enumerate(
+        ["january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"], 1)},
+    **{name: index for index, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)},
+    "sept": 9,
+    **{name: index for index, name in enumerate(
+        ["जनवरी", "फरवरी", "मार्च", "अप्रैल", "मई", "जून", "जुलाई",
+         "अगस्त", "सितंबर", "अक्टूबर", "नवंबर", "दिसंबर"], 1)},
+    "सितम्बर": 9, "नवम्बर": 11, "दिसम्बर": 12, "फ़रवरी": 2, "अप्रेल": 4,
+})
+# Survey answers are about the past: "कल" is yesterday here
+RELATIVE_DAYS = _words({"आज": 0, "today": 0, "कल": 1, "yesterday": 1, "परसों": 2})
+AGO_WORDS = _words({"पहले": 1, "ago": 1, "back": 1})
+
+NUMERIC_DATE = re.compile(r"\b(\d{1,4})[/\-.](\d{1,2})[/\-.](\d{2,4})\b")
+
+DURATION_UNITS = _words({
+    "साल": ("year", 365), "वर्ष": ("year", 365), "बरस": ("year", 365), "year": ("year", 365),
+    "years": ("year", 365), "yr": ("year", 365), "yrs": ("year", 365), "saal": ("year", 365),
+    "महीने": ("month", 30), "महीना": ("month", 30), "महीनों": ("month", 30), "माह": ("month", 30),
+    "month": ("month", 30), "months": ("month", 30), "mahine": ("month", 30),
+    "हफ्ते": ("week", 7), "हफ्ता": ("week", 7), "सप्ताह": ("week", 7), "week": ("week", 7), "weeks": ("week", 7),
+    "दिन": ("day", 1), "दिनों": ("day", 1), "day": ("day", 1), "days": ("day", 1), "din": ("day", 1),
+    "घंटे": ("hour", 1 / 24), "घंटा": ("hour", 1 / 24), "hour": ("hour", 1 / 24), "hours": ("hour", 1 / 24),
+})
+
+
+def _date(year: int, month: int, day: int) -> Optional[str]:
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+class DateExtractor(Extractor):
+    """ISO date ("2023-08-15", or "2023-08" without a day) from numeric,
+    named-month or relative answers, relative to reference (default today)"""
+
+    def __init__(self, reference: Optional[date] = None):
+        self.reference = reference
+
+    def __call__(self, text: str):
+        text = normalize(text or "")
+        match = NUMERIC_DATE.search(text)
+        if match:
+            first, second, third = (int(part) for part in match.groups())
+            # 2023-08-15, otherwise Indian day-first 15/08/2023
+            return _date(first, second, third) if len(match.group(1)) == 4 else _date(third, second, first)
+
+        tokens = TOKEN_PATTERN.findall(text)
+        reference = self.reference or date.today()
+        for index, token in enumerate(tokens):
+            month = MONTHS.get(token)
+            if month:
+                numbers = [int(_digits(t)) for t in tokens[max(0, index - 1):index + 3]
+                           if t[0].isdigit() and _digits(t) is not None and float(_digits(t)).is_integer()]
+                year = next((n for n in numbers if n > 31), None)
+                day = next((n for n in numbers if 1 <= n <= 31), None)
+                if year is None:
+                    # "15 अगस्त": the latest such date not after the reference
+                    candidate = _date(reference.year, month, day or 1)
+                    if candidate and candidate > reference.isoformat():
+                        candidate = _date(reference.year - 1, month, day or 1)
+                    return candidate if day else (candidate or "")[:7] or None
+                return _date(year, month, day) if day else f"{year:04d}-{month:02d}"
+            if token in RELATIVE_DAYS:
+                return (reference - timedelta(days=RELATIVE_DAYS[token])).isoformat()
+
+        # "3 दिन पहले" / "two weeks ago"
+        if any(token in AGO_WORDS for token in tokens):
+            duration = DurationExtractor()(text)
+            if duration:
+                return (reference - timedelta(days=round(duration["days"]))).isoformat()
+        return None
+
+
+class DurationExtractor(Extractor):
+    """{"value", "unit", "days"} from "दो साल", "2 years 3 months", "ढाई महीने"; days sums all parts"""
+
+    def __call__(self, text: str):
+        tokens = tokenize(text or "")
+        parts = []
+        for value, _, end in parse_numbers(text or ""):
+            unit = DURATION_UNITS.get(tokens[end]) if end < len(tokens) else None
+            if unit:
+                parts.append((value, *unit))
+        if not parts:
+            return None
+        value, unit, _ = max(parts, key=lambda part: part[2])
+        return {"value": value, "unit": unit, "days": _clean(sum(v * days for v, _, days in parts))}
+
+
+YES_WORDS = _words(dict.fromkeys([
+    "हाँ", "हां", "हा", "जी", "जीहां", "बिल्कुल", "बिलकुल", "सही", "ठीक", "जरूर",
+    "yes", "yeah", "yep", "haan", "han", "haa", "ji", "sure", "correct", "right", "ok", "okay",
+], True))
+NO_WORDS = _words(dict.fromkeys([
+    "नहीं", "नही", "मत",
+    "no", "nope", "nah", "nahi", "nahin", "nai", "never", "not", "dont", "don",
+], False))
+# Also the tag particle ("है ना", "हाँ ना"): a negation only without a yes-word
+WEAK_NO_WORDS = _words(dict.fromkeys(["ना", "न", "na"], False))
+
+
+# "Don't know" is not "no": (first word, then any of) pairs
+DONT_KNOW = {
+    normalize(first): {normalize(word) for word in words}
+    for first, words in {
+        "पता": ["नहीं", "नही"], "मालूम": ["नहीं", "नही"], "pata": ["nahi", "nahin"],
+        "maloom": ["nahi", "nahin"], "don": ["know"], "dont": ["know"], "not": ["sure"],
+    }.items()
+}
+
+
+class YesNoExtractor(Extractor):
+    """True/False for yes/no answers; a negation anywhere wins ("जी नहीं",
+    "not really") except ना/na, which only says no without a yes-word
+    ("हाँ ना", "है ना, हाँ" are yes); "पता नहीं"/"don't know" gives None"""
+
+    def __call__(self, text: str):
+        tokens = tokenize(text or "")
+        for index, token in enumerate(tokens):
+            # "don't know" tokenizes as don, t, know
+            if DONT_KNOW.get(token, set()) & set(tokens[index + 1:index + 3]):
+                return None
+        if any(token in NO_WORDS for token in tokens):
+            return False
+        if any(token in YES_WORDS for token in tokens):
+            return True
+        if any(token in WEAK_NO_WORDS for token in tokens):
+            return False
+        return None
+
+
+class ChoiceExtractor(Extractor):
+    """Matches an answer to the question's allowed options.
+
+    Options are strings or {"value": ..., "labels": [...]} with spoken
+    variants. They are compiled once into a utils.option_index.OptionIndex,
+    which finds labels inside the answer ("मैं किसान का काम करता हूँ") in any
+    spelling ("kisaan") and near misses of a transcription ("kisn").
+    """
+
+    # An allowed option beats free text a pattern pulled out
+    overrides_patterns = True
+
+    def __init__(self, options: List[Any], multiple: bool = False, min_similarity: float = 0.5):
+        self.multiple = multiple
+        self.min_similarity = min_similarity
+        self.index = OptionIndex(options or [])
+
+    def __call__(self, text: str):
+        limit = max(1, len(self.index)) if self.multiple else 1
+        # An ambiguous mention (two options spelled alike) is no answer
+        values = [match.value for match in self.index.match(text or "", limit, self.min_similarity)
+                  if not match.alternatives]
+        if self.multiple:
+            return values
+        return values[0] if values else None
+
+
+# Question.type / extract "type" -> factory(question options)
+EXTRACTORS: Dict[str, Callable[[Optional[List[Any]]], Extractor]] = {}
+
+
+def register(*types: str):
+    """Register an extractor factory for question/extract types"""
+    def decorator(factory):
+        for name in types:
+            EXTRACTORS[name] = factory
+        return factory
+    return decorator
+
+
+register("number", "integer", "numeric", "currency", "amount")(lambda options: NumberExtractor())
+register("date")(lambda options: DateExtractor())
+register("duration")(lambda options: DurationExtractor())
+register("yes_no", "yesno", "boolean")(lambda options: YesNoExtractor())
+register("choice", "single_choice", "select")(lambda options: ChoiceExtractor(options))
+register("multiple_choice", "multi_select")(lambda options: ChoiceExtractor(options, multiple=True))
+
+
+def _factory(type_name: Optional[str], options: Optional[List[Any]]):
+    factory = EXTRACTORS.get(str(type_name or "").lower())
+    if factory in (EXTRACTORS.get("choice"), EXTRACTORS.get("multiple_choice")) and not options:
+        return None
+    return factory
+
+
+def has_extractor(type_name: Optional[str], options: Optional[List[Any]] = None) -> bool:
+    """Whether build_extractor returns an extractor, without compiling one"""
+    return _factory(type_name, options) is not None
+
+
+def build_extractor(type_name: Optional[str], options: Optional[List[Any]] = None) -> Optional[Extractor]:
+    """Compiled extractor for a type, or None when the type has none (free text)"""
+    factory = _factory(type_name, options)
+    return factory(options) if factory is not None else None
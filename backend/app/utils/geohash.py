@@ -0,0 +1,148 @@
+import math
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(BASE32)}
+
+# Stored precision: 9 characters is a ~4.8 m x 4.8 m cell
+GEOHASH_PRECISION = 9
+
+EARTH_RADIUS_M = 6371008.8
+
+BBox = Tuple[float, float, float, float]  # (min_lat, min_lng, max_lat, max_lng)
+
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a point; a prefix of a hash is the enclosing coarser cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash: str) -> BBox:
+    """(min_lat, min_lng, max_lat, max_lng) of a cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """Center (lat, lng) of a cell"""
+    min_lat, min_lng, max_lat, max_lng = decode_bbox(geohash)
+    return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a cell in degrees"""
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def covering_cells(bbox: BBox, precision: int) -> List[str]:
+    """Cells of one precision that together cover a bounding box"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    height, width = cell_size(precision)
+    # Snap to the cell grid so each step lands in the next cell
+    lat0 = math.floor((min_lat + 90) / height) * height - 90
+    lng0 = math.floor((min_lng + 180) / width) * width - 180
+    rows = int(math.floor((max_lat - lat0) / height)) + 1
+    cols = int(math.floor((max_lng - lng0) / width)) + 1
+
+    cells = set()
+    for i in range(rows):
+        lat = min(89.999999, lat0 + (i + 0.5) * height)
+        for j in range(cols):
+            lng = min(179.999999, lng0 + (j + 0.5) * width)
+            cells.add(encode(lat, lng, precision))
+    return sorted(cells)
+
+
+def cover_bbox(bbox: BBox, max_cells: int = 64, max_precision: int = GEOHASH_PRECISION) -> List[str]:
+    """Finest covering of a bounding box that stays within max_cells cells"""
+    best = [""]
+    for precision in range(1, max_precision + 1):
+        height, width = cell_size(precision)
+        estimate = (math.floor((bbox[2] - bbox[0]) / height) + 2) * (math.floor((bbox[3] - bbox[1]) / width) + 2)
+        if estimate > max_cells * 4:
+            break
+        cells = covering_cells(bbox, precision)
+        if len(cells) > max_cells:
+            break
+        best = cells
+    return best
+
+
+def _successor(prefix: str) -> Optional[str]:
+    """First geohash string ordered after every hash starting with prefix"""
+    while prefix:
+        index = _DECODE[prefix[-1]]
+        if index + 1 < len(BASE32):
+            return prefix[:-1] + BASE32[index + 1]
+        prefix = prefix[:-1]
+    return None
+
+
+def prefix_ranges(prefixes: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """Merge sorted prefixes into [start, end) string ranges for index range scans.
+
+    The base32 alphabet is in ASCII order, so all hashes under a prefix are
+    contiguous in a B-tree index and neighbouring cells often join up.
+    """
+    ranges: List[Tuple[str, Optional[str]]] = []
+    for prefix in sorted(prefixes):
+        end = _successor(prefix)
+        if ranges and ranges[-1][1] is None:
+            break
+        if ranges and ranges[-1][1] >= prefix:
+            start, previous_end = ranges[-1]
+            ranges[-1] = (start, None if end is None else max(previous_end, end))
+        else:
+            ranges.append((prefix, end))
+    return ranges
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(lat: float, lng: float, radius_m: float) -> BBox:
+    """Bounding box that contains a circle"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlng = math.degrees(radius_m / (EARTH_RADIUS_M * max(0.01, math.cos(math.radians(lat)))))
+    return max(-90.0, lat - dlat), max(-180.0, lng - dlng), min(90.0, lat + dlat), min(180.0, lng + dlng)
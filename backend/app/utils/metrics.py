@@ -0,0 +1,317 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+                prefix = label_text + "," if label_text else ""
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label_text}}} {total:.6f}")
+                lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_SECONDS = Histogram(
+    "bharatpulse_request_seconds", "End-to-end request wall time", ("endpoint", "status"), SECONDS_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    "bharatpulse_stage_seconds", "Wall time per pipeline stage", ("endpoint", "stage"), SECONDS_BUCKETS
+)
+STAGE_CPU_SECONDS = Histogram(
+    "bharatpulse_stage_cpu_seconds", "CPU time per pipeline stage, including worker threads",
+    ("endpoint", "stage"), SECONDS_BUCKETS
+)
+STAGE_BYTES = Histogram(
+    "bharatpulse_stage_bytes", "Bytes processed per pipeline stage", ("endpoint", "stage"), BYTES_BUCKETS
+)
+HISTOGRAMS = [REQUEST_SECONDS, STAGE_SECONDS, STAGE_CPU_SECONDS, STAGE_BYTES]
+
+
+class Stage:
+    """One timed stage of a request; CPU time from worker threads is added via add_cpu()"""
+
+    def __init__(self, name: str, nbytes: int = 0):
+        self.name = name
+        self.bytes = nbytes
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def add_bytes(self, nbytes: int):
+        self.bytes += nbytes
+
+    def add_cpu(self, seconds: float):
+        self.cpu += seconds
+
+
+class RequestTrace:
+    """Stages recorded for one request or background job"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.stages: List[Stage] = []
+        self._active: List[Stage] = []
+
+    def record(self):
+        """Feed finished stages into the histograms under the final endpoint label"""
+        for finished in self.stages:
+            STAGE_SECONDS.observe(finished.wall, self.endpoint, finished.name)
+            STAGE_CPU_SECONDS.observe(finished.cpu, self.endpoint, finished.name)
+            if finished.bytes:
+                STAGE_BYTES.observe(finished.bytes, self.endpoint, finished.name)
+
+    def summary(self) -> Dict:
+        return {
+            stage.name: {"wall_ms": round(stage.wall * 1000, 2), "cpu_ms": round(stage.cpu * 1000, 2),
+                         "bytes": stage.bytes}
+            for stage in self.stages
+        }
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def stage(name: str, nbytes: int = 0):
+    """Time a synchronous pipeline stage of the current request (no-op outside a trace).
+
+    CPU is this thread's time, so the block must not await - on the event
+    loop thread that would count other requests' work. Use async_stage there.
+    """
+    with _timed_stage(name, nbytes, time.thread_time) as current:
+        yield current
+
+
+@contextmanager
+def async_stage(name: str, nbytes: int = 0):
+    """Time a stage that awaits: wall time, plus CPU credited by worker threads via add_cpu()"""
+    with _timed_stage(name, nbytes, None) as current:
+        yield current
+
+
+@contextmanager
+def _timed_stage(name: str, nbytes: int, cpu_clock: Optional[Callable[[], float]]):
+    trace = _current_trace.get()
+    current = Stage(name, nbytes)
+    if trace is None:
+        yield current
+        return
+
+    trace._active.append(current)
+    wall_start = time.perf_counter()
+    cpu_start = cpu_clock() if cpu_clock else 0.0
+    try:
+        yield current
+    finally:
+        current.wall += time.perf_counter() - wall_start
+        if cpu_clock:
+            current.cpu += cpu_clock() - cpu_start
+        trace._active.remove(current)
+        trace.stages.append(current)
+
+
+def add_cpu(seconds: float):
+    """Credit CPU spent on another thread (e.g. a model executor) to the innermost stage"""
+    trace = _current_trace.get()
+    if trace and trace._active:
+        trace._active[-1].add_cpu(seconds)
+
+
+def cpu_timed(func, *args, **kwargs):
+    """Run func and return (result, thread CPU seconds); meant for executor threads"""
+    start = time.thread_time()
+    result = func(*args, **kwargs)
+    return result, time.thread_time() - start
+
+
+@contextmanager
+def trace(endpoint: str):
+    """Collect stages for work that does not come through the HTTP middleware"""
+    current = RequestTrace(endpoint)
+    token = _current_trace.set(current)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield current
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        _current_trace.reset(token)
+        current.record()
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint, status)
+
+
+def render_metrics() -> str:
+    """All histograms in Prometheus text exposition format"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+class SlowRequestProfiler:
+    """Profiles a sample of requests and dumps the profile when one is slow.
+
+    PROFILE_MODE: "off" (default), "slow" (log stage breakdown of slow
+    requests) or "sample" (also profile PROFILE_SAMPLE_RATE of requests with
+    pyinstrument, or cProfile when it is not installed, and write the
+    profile of any that exceed PROFILE_SLOW_MS to PROFILE_DIR).
+    """
+
+    def __init__(self):
+        self.mode = os.getenv("PROFILE_MODE", "off").lower()
+        self.slow_seconds = float(os.getenv("PROFILE_SLOW_MS", 2000)) / 1000
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", 0.05))
+        self.output_dir = os.getenv("PROFILE_DIR", "profiles")
+        # Only one profiler can be attached to the interpreter at a time
+        self._busy = threading.Lock()
+
+    def start(self):
+        """Begin profiling this request if sampled; returns a handle or None"""
+        if self.mode != "sample" or random.random() >= self.sample_rate:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+
+        try:
+            return self._start_profiler()
+        except Exception as e:
+            self._busy.release()
+            logger.warning(f"⚠️ Could not start profiler: {e}")
+            return None
+
+    @staticmethod
+    def _start_profiler():
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return ("cprofile", profiler)
+
+        # Statistical and async-aware: attributes awaits to this request only
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        return ("pyinstrument", profiler)
+
+    def finish(self, handle, trace: RequestTrace, elapsed: float):
+        """Stop profiling and dump/log when the request was slow"""
+        try:
+            if handle:
+                kind, profiler = handle
+                if kind == "pyinstrument":
+                    profiler.stop()
+                else:
+                    profiler.disable()
+        finally:
+            if handle:
+                self._busy.release()
+
+        if self.mode == "off" or elapsed < self.slow_seconds:
+            return
+
+        logger.warning(f"⚠️ Slow request {trace.endpoint}: {elapsed * 1000:.0f} ms {trace.summary()}")
+        if handle:
+            self._dump(handle, trace, elapsed)
+
+    def _dump(self, handle, trace: RequestTrace, elapsed: float):
+        kind, profiler = handle
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = "".join(c if c.isalnum() else "_" for c in trace.endpoint).strip("_") or "root"
+        base = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{elapsed * 1000:.0f}ms")
+        try:
+            if kind == "pyinstrument":
+                with open(base + ".txt", "w", encoding="utf-8") as f:
+                    f.write(profiler.output_text(unicode=True))
+                path = base + ".txt"
+            else:
+                profiler.dump_stats(base + ".prof")
+                path = base + ".prof"
+            logger.info(f"Profile written to {path}")
+        except Exception as e:
+            logger.error(f"❌ Failed to write profile: {e}")
+
+
+class MetricsMiddleware:
+    """ASGI middleware: per-request trace, request histogram and slow-request profiling"""
+
+    def __init__(self, app):
+        self.app = app
+        self.profiler = SlowRequestProfiler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        current = RequestTrace(scope.get("path", ""))
+        token = _current_trace.set(current)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        handle = self.profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_trace.reset(token)
+
+            # Label by route template (/api/surveys/{survey_id}), not the raw path.
+            # Newer FastAPI keeps included routes unprefixed and records the
+            # prefixed one as the effective route context
+            effective = scope.get("fastapi", {}).get("effective_route_context")
+            current.endpoint = (getattr(effective, "path", None)
+                                or getattr(scope.get("route"), "path", None)
+                                or "unmatched")
+            current.record()
+            REQUEST_SECONDS.observe(elapsed, current.endpoint, str(status["code"]))
+            self.profiler.finish(handle, current, elapsed)
@@ -0,0 +1,403 @@
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Words as in utils.dialect_mapper: \w plus the Devanagari..Malayalam blocks
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u0D7F]+")
+
+# The Indic blocks from Bengali to Malayalam follow the Devanagari layout
+# 0x80 apart, so one table romanizes all of them (approximately)
+INDIC_START, INDIC_END = 0x0900, 0x0D7F
+
+CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "ळ": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+}
+
+VOWELS = {
+    "अ": "a", "आ": "a", "इ": "i", "ई": "i", "उ": "u", "ऊ": "u", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऍ": "e", "ऑ": "o", "ऎ": "e", "ऒ": "o",
+}
+
+MATRAS = {
+    "ा": "a", "ि": "i", "ी": "i", "ु": "u", "ू": "u", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॅ": "e", "ॉ": "o", "ॆ": "e", "ॊ": "o",
+}
+
+# Long vowels as spelled when vowel length matters (रामनगर vs रामानगर)
+LONG_VOWELS = {"आ": "aa", "ई": "ii", "ऊ": "uu", "ा": "aa", "ी": "ii", "ू": "uu"}
+
+# Nukta letters that change sound; the rest (क़, ज़) read as the plain letter
+NUKTA_SOUNDS = {"d": "r", "dh": "rh", "ph": "f"}
+
+NUKTA = "\u093C"
+VIRAMA = "\u094D"
+ANUSVARA = "\u0902"
+VISARGA = "\u0903"
+
+# Spelling variants that romanized transcripts and our romanization disagree
+# on: long vowels written doubled, w/v, z/j, f/ph, aspirates written or not
+_LATIN_FOLDS = [
+    (re.compile(r"aon$"), "anv"),  # गांव is written "gaon"
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"ee"), "i"),
+    (re.compile(r"oo"), "u"),
+    (re.compile(r"c(?!h)"), "k"),
+    (re.compile(r"([bcdfgjklmnpqrstvwxyz])h"), r"\1"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+_LATIN_TABLE = str.maketrans({"w": "v", "z": "j", "q": "k", "x": "s", "y": "i"})
+
+
+def _devanagari(char: str) -> str:
+    codepoint = ord(char)
+    if INDIC_START + 0x80 <= codepoint <= INDIC_END:
+        return chr(codepoint - (codepoint - INDIC_START) // 0x80 * 0x80)
+    return char
+
+
+def romanize(word: str, long_vowels: bool = False) -> str:
+    """Latin letters of an Indic word (NFD) with the inherent 'a' written
+    out except at the end, and ड़ as r (मजदूर -> majadur, खेड़ा -> kheraa);
+    other text is returned unchanged. long_vowels doubles आ/ई/ऊ"""
+    letters = []
+    bare = False  # last letter a consonant still carrying the inherent 'a'
+    for char in word:
+        char = _devanagari(char)
+        if char == NUKTA:
+            if letters and bare and letters[-1] in NUKTA_SOUNDS:
+                letters[-1] = NUKTA_SOUNDS[letters[-1]]
+            continue
+        if bare and char not in MATRAS and char != VIRAMA:
+            letters.append("a")
+        bare = False
+        if char in CONSONANTS:
+            letters.append(CONSONANTS[char])
+            bare = True
+        elif char in MATRAS:
+            letters.append(LONG_VOWELS[char] if long_vowels and char in LONG_VOWELS else MATRAS[char])
+        elif char in VOWELS:
+            letters.append(LONG_VOWELS[char] if long_vowels and char in LONG_VOWELS else VOWELS[char])
+        elif char in (ANUSVARA, VISARGA):
+            letters.append("n" if char == ANUSVARA else "h")
+        elif not "\u0900" <= char <= "\u097F":
+            letters.append(char)
+    return "".join(letters)
+
+
+@lru_cache(maxsize=65536)
+def word_key(word: str) -> str:
+    """Phonetic key of one token: किसान, kisaan and kisan all give "ksn".
+
+    Besides the spelling folds, every 'a' after the first letter is dropped:
+    whether a medial 'a' is written is the least reliable part of a
+    spelling (रामपुर is "Rampur", सुमनगर "Sumanagar", मजदूर "mazdoor").
+    """
+    key = _folded(word)
+    key = key[:1] + key[1:].replace("a", "")
+    return _LATIN_FOLDS[-1][0].sub(r"\1", key)
+
+
+def _folded(word: str) -> str:
+    key = romanize(word)
+    for pattern, replacement in _LATIN_FOLDS:
+        key = pattern.sub(replacement, key)
+    return key.translate(_LATIN_TABLE)
+
+
+class Spelling(NamedTuple):
+    """How a label or answer span is written, for telling apart labels that
+    share phonetic keys (Rampur and Rampura both key as "rmpr")"""
+    folded: str  # word_key's spelling folds, every vowel kept
+    native: Optional[str]  # Indic text with vowel length, None if any word is Latin
+
+
+@lru_cache(maxsize=65536)
+def _word_spelling(word: str) -> Tuple[str, Optional[str]]:
+    indic = any(INDIC_START <= ord(char) <= INDIC_END for char in word)
+    return _folded(word), romanize(word, long_vowels=True) if indic else None
+
+
+def spelling(words: Iterable[str]) -> Spelling:
+    """Spelling of tokenize()d words"""
+    parts = [_word_spelling(word) for word in words]
+    native = None if any(part[1] is None for part in parts) else "".join(part[1] for part in parts)
+    return Spelling("".join(part[0] for part in parts), native)
+
+
+def spelling_distance(a: Spelling, b: Spelling, limit: Optional[int] = None) -> float:
+    """Edit distance of two spellings (at most limit + 1): with vowel length
+    when both are Indic script, else on the folded Latin forms. Comparing
+    across scripts adds half an edit, so a label in the answer's own script
+    wins a tie"""
+    if a.native is not None and b.native is not None:
+        x, y = a.native, b.native
+    else:
+        x, y = a.folded, b.folded
+    across = (a.native is None) != (b.native is None)
+    return bounded_distance(x, y, len(x) + len(y) if limit is None else limit) + 0.5 * across
+
+
+def tokenize(text: str) -> List[str]:
+    """NFD tokens of text casefolded, without Latin accents; chandrabindu as anusvara"""
+    text = unicodedata.normalize("NFD", str(text).casefold())
+    return TOKEN_PATTERN.findall(re.sub(r"[\u0300-\u036F]", "", text).replace("\u0901", "\u0902"))
+
+
+def phonetic_keys(text: str) -> List[str]:
+    return [key for key in map(word_key, tokenize(text)) if key]
+
+
+def keyed_words(text: str) -> Tuple[List[str], List[str]]:
+    """(phonetic keys, the words they came from) of text, words without a key dropped"""
+    words = [word for word in tokenize(text) if word_key(word)]
+    return [word_key(word) for word in words], words
+
+
+def _grams(key: str) -> List[str]:
+    padded = f" {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def bounded_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of a and b, or limit + 1 once it must exceed limit.
+
+    Only the diagonal band |i - j| <= limit of the table can stay within
+    the limit, so only that band is computed.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        smallest = current[low - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < smallest:
+                smallest = cost
+        if smallest > limit:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+
+class OptionMatch(NamedTuple):
+    value: Any
+    score: float  # 1 - edit distance / key length, 1.0 for an exact mention
+    start: int  # token span of the answer that matched
+    end: int
+    # Values spelled as close to the answer as value (ambiguous mention);
+    # score is then divided by the number of candidates
+    alternatives: Tuple[Any, ...] = ()
+
+
+class OptionIndex:
+    """Finds a question's options in a spoken answer by sound, not spelling.
+
+    Every option label is reduced to phonetic keys (romanized, spelling
+    variants folded, so "किसान", "kisaan" and "Kisan" agree)
+    that go into an exact map and a trigram inverted index. An answer first
+    has its token windows looked up in the exact map; if none is an option,
+    labels sharing enough trigrams with it are verified with a bounded edit
+    distance against the answer's windows.
+
+    A label within k edits of an answer window misses at most 3k of its
+    trigrams, so it shares at least two of any 3k + 2 of them: only each
+    label's rarest 3k + 2 trigrams are indexed, and a label becomes a
+    candidate of a window once two of them are in it. Common trigrams
+    ("pur", "gan") then fan out to few labels, and matching stays
+    sub-millisecond with thousands of options (the villages of a district),
+    where a scan would not.
+
+    Distinct labels can share keys (Rampur/Rampura, Ramnagar/Ramanagar).
+    Each key keeps all of its options, and a matched key goes to the option
+    whose label spelling is closest to the answer's by edit distance; when
+    several are equally close the match is ambiguous and says so.
+
+    Options are strings or {"value": ..., "labels": [...]} like
+    Question.options.
+    """
+
+    # Labels verified per answer, best trigram overlap first
+    max_candidates = 12
+    # Answer windows whose candidates are remembered
+    cache_size = 4096
+
+    def __init__(self, options: Iterable[Any], max_candidates: Optional[int] = None):
+        if max_candidates is not None:
+            self.max_candidates = max_candidates
+        self.choices: List[List[Tuple[Any, Spelling]]] = []  # (value, label spelling) per key
+        self.keys: List[Tuple[str, ...]] = []
+        self.exact: Dict[Tuple[str, ...], int] = {}
+        self.joined: List[str] = []  # key without spaces: "Ram pur" matches "rampur"
+        self.grams: List[Tuple[str, ...]] = []
+        self.missing: List[int] = []  # trigrams a label may miss and still match
+        self.required: List[int] = []  # indexed trigrams a candidate shares
+        self.postings: Dict[Tuple[str, int], List[int]] = {}  # (trigram, key length) -> labels
+        self.option_count = 0
+        self._cache: Dict[Tuple[str, int], List[Tuple[float, int]]] = {}
+
+        interned: Dict[str, str] = {}
+        for option in options or []:
+            self.option_count += 1
+            value = option.get("value") if isinstance(option, dict) else option
+            labels = [value, *(option.get("labels") or [])] if isinstance(option, dict) else [option]
+            for label in labels:
+                key, words = keyed_words(str(label))
+                key = tuple(key)
+                if not key:
+                    continue
+                choice = (value, spelling(words))
+                if key in self.exact:
+                    if choice not in self.choices[self.exact[key]]:
+                        self.choices[self.exact[key]].append(choice)
+                else:
+                    self.exact[key] = len(self.keys)
+                    self.choices.append([choice])
+                    self.keys.append(key)
+                    self.joined.append("".join(key))
+                    self.grams.append(tuple(interned.setdefault(gram, gram) for gram in set(_grams(self.joined[-1]))))
+                    self.missing.append(3 * self.allowed_distance(len(self.joined[-1])))
+        self.key_sizes = [len(key) for key in self.keys]
+        self.lengths = [len(joined) for joined in self.joined]
+        self.sizes = sorted(set(self.key_sizes), reverse=True)
+        self.widths = sorted({width for size in self.sizes for width in (size, size + 1)})
+
+        frequency = Counter(chain.from_iterable(self.grams))
+        for entry, grams in enumerate(self.grams):
+            rarest = sorted(grams, key=lambda gram: (frequency[gram], gram))[:self.missing[entry] + 2]
+            self.required.append(max(1, len(rarest) - self.missing[entry]))
+            for gram in rarest:
+                self.postings.setdefault((gram, self.lengths[entry]), []).append(entry)
+
+    def __len__(self) -> int:
+        return self.option_count
+
+    @staticmethod
+    def allowed_distance(length: int) -> int:
+        """Edits tolerated for a label key of this length: none up to 3 letters, then one per 4"""
+        return 0 if length <= 3 else max(1, length // 4)
+
+    def match(self, text: str, limit: int = 1, min_score: float = 0.0) -> List[OptionMatch]:
+        """Options mentioned in text, best first, over non-overlapping spans"""
+        tokens, words = keyed_words(text or "")
+        if not tokens or not self.keys:
+            return []
+
+        # Exact mentions, longest label first
+        found: List[OptionMatch] = []
+        index = 0
+        while index < len(tokens) and len(found) < limit:
+            for size in self.sizes:
+                entry = self.exact.get(tuple(tokens[index:index + size])) if index + size <= len(tokens) else None
+                if entry is not None:
+                    found.append(self._option(entry, 1.0, words, index, index + size))
+                    index += size - 1
+                    break
+            index += 1
+        if found:
+            return self._distinct(found, limit)
+
+        return self._distinct(self._fuzzy(tokens, words, min_score), limit)
+
+    def _option(self, entry: int, score: float, words: List[str], start: int, end: int) -> OptionMatch:
+        """Match of a key: the option whose label is spelled closest to words[start:end]"""
+        choices = self.choices[entry]
+        if len(choices) == 1:
+            return OptionMatch(choices[0][0], score, start, end)
+
+        mention = spelling(words[start:end])
+        closest: List[Tuple[float, Any]] = []
+        for value, label in choices:
+            distance = spelling_distance(mention, label)
+            for position, (other, other_value) in enumerate(closest):
+                if other_value == value:
+                    closest[position] = (min(distance, other), value)
+                    break
+            else:
+                closest.append((distance, value))
+        best = min(distance for distance, _ in closest)
+        tied = [value for distance, value in closest if distance == best]
+        return OptionMatch(tied[0], round(score / len(tied), 4), start, end, tuple(tied[1:]))
+
+    def _fuzzy(self, tokens: List[str], words: List[str], min_score: float) -> List[OptionMatch]:
+        candidates = []
+        for width in self.widths:
+            for start in range(len(tokens) - width + 1):
+                window = "".join(tokens[start:start + width])
+                for overlap, entry in self._window_candidates(window, width):
+                    candidates.append((overlap, entry, start, width, window))
+        candidates.sort(key=lambda item: -item[0])
+
+        best: Dict[int, Tuple[float, OptionMatch]] = {}
+        for _, entry, start, width, window in candidates[:self.max_candidates]:
+            key = self.joined[entry]
+            limit = self.allowed_distance(len(key))
+            distance = bounded_distance(key, window, limit)
+            if distance > limit:
+                continue
+            score = round(1 - distance / max(len(key), len(window)), 4)
+            if entry not in best or score > best[entry][0]:
+                best[entry] = (score, self._option(entry, score, words, start, start + width))
+        matches = [match for _, match in best.values() if match.score >= min_score]
+        return sorted(matches, key=lambda match: -match.score)
+
+    def _window_candidates(self, window: str, width: int) -> List[Tuple[float, int]]:
+        """(trigram overlap, entry) of labels of about width words close
+        enough to one answer window. Cached: filler words ("गांव", "village",
+        "रहता हूँ") recur across answers."""
+        cached = self._cache.get((window, width))
+        if cached is not None:
+            return cached
+
+        grams = set(_grams(window))
+        # Only labels whose length is within their edit budget of the window's
+        lengths = [length for length in range(len(window) // 2, len(window) * 2 + 1)
+                   if abs(length - len(window)) <= self.allowed_distance(length)]
+        hits = Counter(chain.from_iterable(
+            self.postings.get((gram, length), ()) for gram in grams for length in lengths
+        ))
+        required, sizes = self.required, self.key_sizes
+        found = []
+        for entry in [entry for entry, count in hits.items()
+                      if count >= required[entry] and sizes[entry] <= width <= sizes[entry] + 1]:
+            shared = len(grams.intersection(self.grams[entry]))
+            if len(self.grams[entry]) - shared <= self.missing[entry]:
+                found.append((shared / len(self.grams[entry]), entry))
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[(window, width)] = found
+        return found
+
+    @staticmethod
+    def _distinct(matches: List[OptionMatch], limit: int) -> List[OptionMatch]:
+        """First match per value, skipping spans another match already used"""
+        chosen: List[OptionMatch] = []
+        for match in matches:
+            if len(chosen) >= limit:
+                break
+            if any(match.value == other.value or (match.start < other.end and other.start < match.end)
+                   for other in chosen):
+                continue
+            chosen.append(match)
+        return chosen
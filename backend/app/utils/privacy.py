@@ -4,19 +4,34 @@ from cryptography.fernet import Fernet
 from typing import Dict, Any
 import re
 
+# Answer fields encrypted at rest; everything else in a response is stored in the clear
+SENSITIVE_FIELDS = ['name', 'phone', 'address', 'email']
+
+# PII patterns for detection
+PII_PATTERNS = {
+    'phone': r'(\+91|91|0)?[-\s]?[6-9]\d{9}',
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'aadhaar': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
+    'pan': r'\b[A-Z]{5}\d{4}[A-Z]\b'
+}
+
+def mask_pii_in_text(text: str) -> str:
+    """Mask PII patterns in free text"""
+    masked_text = text
+    
+    for pii_type, pattern in PII_PATTERNS.items():
+        # Transcripts and normalised answers are often lower case
+        masked_text = re.sub(pattern, f'[{pii_type.upper()}_MASKED]', masked_text, flags=re.IGNORECASE)
+    
+    return masked_text
+
 class PrivacyService:
     def __init__(self):
         # Generate or load encryption key
         self.key = self._get_or_generate_key()
         self.cipher_suite = Fernet(self.key)
         
-        # PII patterns for detection
-        self.pii_patterns = {
-            'phone': r'(\+91|91|0)?[-\s]?[6-9]\d{9}',
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'aadhaar': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-            'pan': r'\b[A-Z]{5}\d{4}[A-Z]\b'
-        }
+        self.pii_patterns = PII_PATTERNS
     
     def _get_or_generate_key(self) -> bytes:
         """Get existing key or generate new one"""
@@ -35,9 +50,7 @@ class PrivacyService:
         """Encrypt sensitive fields in survey response"""
         encrypted_data = data.copy()
         
-        sensitive_fields = ['name', 'phone', 'address', 'email']
-        
-        for field in sensitive_fields:
+        for field in SENSITIVE_FIELDS:
             if field in encrypted_data and encrypted_data[field]:
                 original_value = str(encrypted_data[field])
                 encrypted_value = self.cipher_suite.encrypt(
@@ -51,9 +64,7 @@ class PrivacyService:
         """Decrypt sensitive fields"""
         decrypted_data = data.copy()
         
-        sensitive_fields = ['name', 'phone', 'address', 'email']
-        
-        for field in sensitive_fields:
+        for field in SENSITIVE_FIELDS:
             if field in decrypted_data and decrypted_data[field]:
                 try:
                     encrypted_value = decrypted_data[field].encode()
@@ -94,12 +105,7 @@ class PrivacyService:
     
     def _mask_pii_in_text(self, text: str) -> str:
         """Mask PII patterns in free text"""
-        masked_text = text
-        
-        for pii_type, pattern in self.pii_patterns.items():
-            masked_text = re.sub(pattern, f'[{pii_type.upper()}_MASKED]', masked_text)
-        
-        return masked_text
+        return mask_pii_in_text(text)
     
     def generate_consent_text(self, lang: str = "hi") -> str:
         """Generate consent text in specified language"""
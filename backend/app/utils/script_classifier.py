@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, Optional
+
+# Unicode blocks of the Indic scripts we see in survey answers
+SCRIPT_RANGES = {
+    "devanagari": (0x0900, 0x097F),
+    "bengali": (0x0980, 0x09FF),
+    "gurmukhi": (0x0A00, 0x0A7F),
+    "gujarati": (0x0A80, 0x0AFF),
+    "oriya": (0x0B00, 0x0B7F),
+    "tamil": (0x0B80, 0x0BFF),
+    "telugu": (0x0C00, 0x0C7F),
+    "kannada": (0x0C80, 0x0CFF),
+    "malayalam": (0x0D00, 0x0D7F),
+}
+
+# Languages written in each script, most likely first
+SCRIPT_LANGUAGES = {
+    "devanagari": ["hi", "mr"],
+    "bengali": ["bn"],
+    "gurmukhi": ["pa"],
+    "gujarati": ["gu"],
+    "oriya": ["or"],
+    "tamil": ["ta"],
+    "telugu": ["te"],
+    "kannada": ["kn"],
+    "malayalam": ["ml"],
+    "latin": ["en"],
+}
+
+
+def _build_table():
+    """str.translate table over U+0000..U+0D7F: letters become a control-char
+    script code, everything else is deleted; higher codepoints pass through
+    unchanged and are never counted"""
+    table = {codepoint: None for codepoint in range(0x0D80)}
+    codes = {}
+    for index, (script, (start, end)) in enumerate(SCRIPT_RANGES.items(), 1):
+        codes[script] = chr(index)
+        for codepoint in range(start, end + 1):
+            table[codepoint] = chr(index)
+
+    codes["latin"] = chr(len(SCRIPT_RANGES) + 1)
+    for letter in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ":
+        table[ord(letter)] = codes["latin"]
+    return table, codes
+
+
+_TABLE, _CODES = _build_table()
+
+
+def script_counts(text: str) -> Dict[str, int]:
+    """Letters per script: one translate pass, then a fast count per script code"""
+    coded = text.translate(_TABLE)
+    counts = {script: coded.count(code) for script, code in _CODES.items()}
+    return {script: count for script, count in counts.items() if count}
+
+
+def classify_script(text: str, candidates: Optional[Iterable[str]] = None,
+                    default: str = "en") -> str:
+    """Language of the dominant script, preferring candidate languages (e.g. mr over hi)"""
+    counts = script_counts(text)
+    if not counts:
+        return default
+
+    # Latin wins ties, matching the old Devanagari-vs-Latin comparison
+    script = max(counts, key=lambda s: (counts[s], s == "latin"))
+    languages = SCRIPT_LANGUAGES[script]
+
+    if candidates:
+        candidates = set(candidates)
+        for language in languages:
+            if language in candidates:
+                return language
+    return languages[0]
@@ -0,0 +1,149 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """Vectorized energy + spectral-flatness VAD for 16 kHz mono float audio.
+
+    Frames are speech when their energy clears an adaptive noise floor and
+    their spectrum is peaky (voiced) rather than flat (hiss, fan, traffic).
+    Speech runs are padded, leading/trailing silence is dropped, and long
+    recordings are cut at pauses into chunks no longer than Whisper's
+    30-second window.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30,
+                 energy_margin_db: Optional[float] = None,
+                 min_energy_db: float = -55.0,
+                 max_flatness: float = 0.5,
+                 min_speech_ms: Optional[int] = None,
+                 min_silence_ms: int = 300,
+                 padding_ms: int = 200,
+                 split_silence_ms: int = 1500,
+                 max_chunk_seconds: float = 30.0):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.frame_ms = frame_ms
+        self.energy_margin_db = energy_margin_db if energy_margin_db is not None else float(
+            os.getenv("VAD_ENERGY_MARGIN_DB", 10)
+        )
+        self.min_energy_db = min_energy_db
+        self.max_flatness = max_flatness
+        self.min_speech_frames = self._frames(min_speech_ms if min_speech_ms is not None else int(
+            os.getenv("VAD_MIN_SPEECH_MS", 250)
+        ))
+        self.min_silence_frames = self._frames(min_silence_ms)
+        self.padding_frames = self._frames(padding_ms)
+        self.split_silence_frames = self._frames(split_silence_ms)
+        self.max_chunk_frames = self._frames(max_chunk_seconds * 1000)
+
+        self._window = np.hanning(self.frame_length).astype(np.float32)
+
+    def _frames(self, ms: float) -> int:
+        return max(1, int(round(ms / self.frame_ms)))
+
+    def frame_features(self, audio: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(energy in dBFS, spectral flatness) per non-overlapping frame"""
+        count = len(audio) // self.frame_length
+        frames = np.asarray(audio[:count * self.frame_length], dtype=np.float32).reshape(count, self.frame_length)
+
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        return energy_db, flatness
+
+    def speech_mask(self, energy_db: np.ndarray, flatness: np.ndarray) -> np.ndarray:
+        """Boolean speech/non-speech decision per frame, smoothed"""
+        if not len(energy_db):
+            return np.zeros(0, dtype=bool)
+
+        noise_floor = np.percentile(energy_db, 10)
+        threshold = max(noise_floor + self.energy_margin_db, self.min_energy_db)
+        mask = (energy_db > threshold) & (flatness < self.max_flatness)
+
+        # Bridge short gaps (stops, breaths) first, then drop short blips (clicks)
+        mask = self._fill_runs(mask, False, self.min_silence_frames)
+        mask = self._fill_runs(mask, True, self.min_speech_frames)
+        return mask
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(starts, ends, values) of runs of equal values; ends are exclusive"""
+        change = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [len(mask)]))
+        return starts, ends, mask[starts]
+
+    def _fill_runs(self, mask: np.ndarray, value: bool, shorter_than: int) -> np.ndarray:
+        """Flip interior runs of `value` shorter than the limit"""
+        mask = mask.copy()
+        starts, ends, values = self._runs(mask)
+        for start, end, run_value in zip(starts, ends, values):
+            interior = start > 0 and end < len(mask)
+            if run_value == value and end - start < shorter_than and (interior or value):
+                mask[start:end] = not value
+        return mask
+
+    def speech_regions(self, mask: np.ndarray) -> List[Tuple[int, int]]:
+        """Padded speech regions as (start_frame, end_frame)"""
+        if not mask.any():
+            return []
+
+        starts, ends, values = self._runs(mask)
+        regions = []
+        for start, end in zip(starts[values], ends[values]):
+            start = max(0, start - self.padding_frames)
+            end = min(len(mask), end + self.padding_frames)
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+        return regions
+
+    def chunk_regions(self, regions: List[Tuple[int, int]], energy_db: np.ndarray) -> List[Tuple[int, int]]:
+        """Group regions into chunks, cutting at long pauses or the max chunk length"""
+        chunks = []
+        for start, end in regions:
+            if chunks:
+                chunk_start, chunk_end = chunks[-1]
+                if start - chunk_end < self.split_silence_frames and end - chunk_start <= self.max_chunk_frames:
+                    chunks[-1] = (chunk_start, end)
+                    continue
+            chunks.append((start, end))
+
+        # A region longer than the window is cut at the quietest frame of the
+        # window's last few seconds, so the cut rarely lands mid-word
+        search = min(self.split_silence_frames * 3, self.max_chunk_frames // 2)
+        split = []
+        for start, end in chunks:
+            while end - start > self.max_chunk_frames:
+                window_end = start + self.max_chunk_frames
+                cut = window_end - search + int(np.argmin(energy_db[window_end - search:window_end]))
+                split.append((start, cut))
+                start = cut
+            split.append((start, end))
+        return split
+
+    def process(self, audio: np.ndarray) -> Dict:
+        """Speech chunks of a clip plus how much audio was dropped"""
+        input_seconds = len(audio) / self.sample_rate
+        energy_db, flatness = self.frame_features(audio)
+        regions = self.speech_regions(self.speech_mask(energy_db, flatness))
+
+        chunks = [
+            audio[start * self.frame_length:min(len(audio), end * self.frame_length)]
+            for start, end in self.chunk_regions(regions, energy_db)
+        ]
+        speech_seconds = sum(len(chunk) for chunk in chunks) / self.sample_rate
+
+        return {
+            "chunks": chunks,
+            "is_empty": not chunks,
+            "input_seconds": round(input_seconds, 3),
+            "speech_seconds": round(speech_seconds, 3),
+            "seconds_saved": round(input_seconds - speech_seconds, 3),
+        }
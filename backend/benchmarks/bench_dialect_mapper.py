@@ -0,0 +1,126 @@
+"""Dialect mapping throughput: per-word re.sub loop vs compiled token trie.
+
+    python -m benchmarks.bench_dialect_mapper [--entries 10000] [--output out.json]
+
+Builds synthetic Bhojpuri/Marwari/Awadhi dictionaries (romanized and
+Devanagari single words plus two-word phrases) and maps utterances where
+roughly a fifth of the tokens are dialect entries.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import tempfile
+import time
+
+from app.utils.dialect_mapper import DialectMapper
+from benchmarks.common import emit, summarize, time_calls
+
+DIALECTS = ["bhojpuri", "marwari", "awadhi"]
+LATIN = "abcdeghijklmnoprstuvy"
+DEVANAGARI = "कखगघचछजझटठडढतथदधनपफबभमयरलवसह"
+MATRAS = "ािीुूेैोौं"
+
+
+def _word(rng: random.Random, devanagari: bool) -> str:
+    if devanagari:
+        return "".join(rng.choice(DEVANAGARI) + rng.choice(MATRAS) for _ in range(rng.randint(2, 4)))
+    return "".join(rng.choice(LATIN) for _ in range(rng.randint(3, 9)))
+
+
+def build_mappings(entries: int, seed: int = 7):
+    rng = random.Random(seed)
+    mappings = {}
+    for dialect in DIALECTS:
+        table = {}
+        while len(table) < entries:
+            devanagari = rng.random() < 0.5
+            phrase = _word(rng, devanagari)
+            if rng.random() < 0.1:
+                phrase += " " + _word(rng, devanagari)
+            table[phrase] = _word(rng, devanagari)
+        mappings[dialect] = table
+    return mappings
+
+
+def build_utterances(mappings, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    utterances = []
+    for i in range(count):
+        dialect = DIALECTS[i % len(DIALECTS)]
+        keys = list(mappings[dialect])
+        tokens = []
+        for _ in range(rng.randint(8, 30)):
+            tokens.append(rng.choice(keys) if rng.random() < 0.2 else _word(rng, rng.random() < 0.5))
+        utterances.append((dialect, " ".join(tokens)))
+    return utterances
+
+
+def legacy_map(mappings, text: str, dialect: str) -> str:
+    """The original TranslationService.map_dialect_to_standard loop"""
+    mapped_text = text
+    for dialect_word, standard_word in mappings[dialect].items():
+        pattern = r'\b' + re.escape(dialect_word) + r'\b'
+        mapped_text = re.sub(pattern, standard_word, mapped_text, flags=re.IGNORECASE)
+    return mapped_text
+
+
+def run(entries: int, utterance_count: int, legacy_count: int):
+    mappings = build_mappings(entries)
+    utterances = build_utterances(mappings, utterance_count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dialect_mappings.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(mappings, f, ensure_ascii=False)
+
+        load_ms = time_calls(lambda: DialectMapper(path, reload_interval=3600), repeat=3, warmup=0)
+        mapper = DialectMapper(path, reload_interval=3600)
+
+        def trie_pass():
+            for dialect, text in utterances:
+                mapper.map(text, dialect)
+
+        trie_ms = time_calls(trie_pass, repeat=5)
+
+        legacy_subset = utterances[:legacy_count]
+        start = time.perf_counter()
+        for dialect, text in legacy_subset:
+            legacy_map(mappings, text, dialect)
+        legacy_seconds = time.perf_counter() - start
+
+    trie_per_call_ms = min(trie_ms) / len(utterances)
+    legacy_per_call_ms = legacy_seconds * 1000 / len(legacy_subset)
+
+    return {
+        "entries_per_dialect": entries,
+        "utterances": len(utterances),
+        "load_and_compile": summarize(load_ms),
+        "trie": {
+            "per_call_ms": round(trie_per_call_ms, 5),
+            "calls_per_sec": round(1000 / trie_per_call_ms, 1),
+        },
+        "legacy_regex_loop": {
+            "calls_measured": len(legacy_subset),
+            "per_call_ms": round(legacy_per_call_ms, 3),
+            "calls_per_sec": round(1000 / legacy_per_call_ms, 2),
+        },
+        "speedup": round(legacy_per_call_ms / trie_per_call_ms, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--utterances", type=int, default=3000)
+    parser.add_argument("--legacy-utterances", type=int, default=30,
+                        help="the regex loop is slow; time it on a subset")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    emit("dialect_mapper", run(args.entries, args.utterances, args.legacy_utterances), args.output)
+
+
+if __name__ == "__main__":
+    main()
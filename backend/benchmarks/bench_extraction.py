@@ -0,0 +1,114 @@
+"""Question-targeted extraction plans vs the all-fields extract_fields path.
+
+    python -m benchmarks.bench_extraction [--answers 5000] [--spacy auto]
+                                          [--output out.json]
+
+Times NLPService.extract_fields per question type (name, age, income,
+occupation, location) twice over the same spoken answers: without a plan,
+running spaCy NER and every pattern group as before, and with the plan
+compiled from the synthetic survey's extract config. --spacy picks the NER
+model: "real" (installed spaCy models), a FakeCost spec such as "0/3"
+standing in for a small model, or "auto" (real when loaded, else "0/3").
+"""
+import argparse
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import emit, per_second, summarize
+from benchmarks.generators import spoken_answers, synthetic_survey
+
+
+class FakeSpacy:
+    """Callable in place of a spaCy pipeline: pays a FakeCost, finds no entities"""
+
+    def __init__(self, cost):
+        self.cost = cost
+
+    def __call__(self, text: str):
+        self.cost.block()
+        return SimpleNamespace(ents=[])
+
+
+def configure_spacy(nlp_service, spec: str) -> str:
+    from benchmarks.stubs import FakeCost
+
+    loaded = bool(nlp_service.nlp_en or nlp_service.nlp_hi)
+    if spec == "real" or (spec == "auto" and loaded):
+        return "real" if loaded else "none"
+    fake = FakeSpacy(FakeCost.parse("0/3" if spec == "auto" else spec))
+    nlp_service.nlp_en = nlp_service.nlp_hi = fake
+    return f"fake:{fake.cost.spec}"
+
+
+async def time_calls(nlp_service, answers, plans, questions):
+    by_field = {}
+    for language, field, text in answers:
+        plan = plans[questions[field]] if plans else None
+        start = time.perf_counter()
+        await nlp_service.extract_fields(text, questions[field], language=language, plan=plan)
+        by_field.setdefault(field, []).append((time.perf_counter() - start) * 1000)
+    return by_field
+
+
+async def bench(count: int, spacy: str):
+    from app.models.survey import SurveyModel
+    from app.services.nlp_service import NLPService
+
+    nlp_service = NLPService()
+    spacy_used = configure_spacy(nlp_service, spacy)
+
+    definition = synthetic_survey(questions=5)
+    survey = SurveyModel(id="bench", version=1, **{
+        key: definition[key] for key in ("title", "languages", "questions", "logic", "responses")
+    })
+    questions = {question.extract[0]["field"]: question.id for question in survey.questions}
+
+    start = time.perf_counter()
+    plans = nlp_service.plans_for(survey)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    answers = spoken_answers(count, seed=5)
+    await time_calls(nlp_service, answers[:50], plans, questions)
+
+    all_fields = await time_calls(nlp_service, answers, None, questions)
+    planned = await time_calls(nlp_service, answers, plans, questions)
+
+    by_type = {}
+    for field in questions:
+        before, after = summarize(all_fields[field]), summarize(planned[field])
+        plan = plans[questions[field]]
+        by_type[field] = {
+            "extractors": plan.pattern_fields + (["spacy"] if plan.use_spacy else []),
+            "all_fields": before,
+            "planned": after,
+            "speedup": round(before["p50_ms"] / after["p50_ms"], 1) if after["p50_ms"] else None,
+        }
+
+    total_before = sum(sum(samples) for samples in all_fields.values()) / 1000
+    total_after = sum(sum(samples) for samples in planned.values()) / 1000
+    return {
+        "config": {"answers": count, "spacy": spacy_used},
+        "plan_compile_ms": round(compile_ms, 3),
+        "by_question_type": by_type,
+        "answers_per_sec": {
+            "all_fields": per_second(len(answers), total_before),
+            "planned": per_second(len(answers), total_after),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=5000)
+    parser.add_argument("--spacy", default="auto", help='"auto", "real" or a FakeCost spec like "0/3"')
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = asyncio.run(bench(args.answers, args.spacy))
+    emit("extraction", results, os.path.abspath(args.output) if args.output else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Throughput and accuracy of each typed extractor in app.utils.extractors.
+
+    python -m benchmarks.bench_extractors [--answers 20000] [--only number,date,...]
+                                          [--seed 13] [--output out.json]
+
+Generates spoken-style answers with a known value per extractor - amounts
+in Hindi/English number words with lakh/crore ("साढ़े तीन लाख", "सवा लाख",
+"two lakh fifty thousand") or digits, dates in numeric/named-month/relative
+forms, durations, yes/no phrases and occupation choices with typos - then
+reports per-answer latency, answers/sec one at a time vs batch(), and the
+share parsed to the expected value.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import emit, per_second, summarize
+
+SECTIONS = ["number", "date", "duration", "yes_no", "choice"]
+
+HINDI_MONTHS = ["जनवरी", "फरवरी", "मार्च", "अप्रैल", "मई", "जून", "जुलाई",
+                "अगस्त", "सितंबर", "अक्टूबर", "नवंबर", "दिसंबर"]
+
+OCCUPATIONS = [
+    ("farmer", ["किसान", "kisan", "farmer"]), ("labourer", ["मजदूर", "mazdoor", "labourer"]),
+    ("shopkeeper", ["दुकानदार", "dukandar", "shopkeeper"]), ("teacher", ["शिक्षक", "अध्यापक", "teacher"]),
+    ("driver", ["ड्राइवर", "चालक", "driver"]), ("tailor", ["दर्जी", "darzi", "tailor"]),
+    ("weaver", ["बुनकर", "bunkar", "weaver"]), ("fisherman", ["मछुआरा", "machhuara", "fisherman"]),
+    ("carpenter", ["बढ़ई", "badhai", "carpenter"]), ("homemaker", ["गृहिणी", "housewife", "homemaker"]),
+]
+
+YES_NO = [
+    ("हाँ", True), ("हां जी", True), ("जी हाँ, है", True), ("बिल्कुल", True), ("yes", True), ("haan ji", True),
+    ("नहीं", False), ("जी नहीं", False), ("नहीं है", False), ("no", False), ("nahi", False),
+    ("not really", False), ("पता नहीं", None), ("don't know", None), ("शायद", None),
+]
+
+# A fraction prefix right before the scale word, with the one implied
+FRACTION_AMOUNTS = [
+    ("सवा लाख", 125000), ("सवा सौ", 125), ("पौने लाख", 75000), ("पौने दो लाख", 175000),
+    ("साढ़े सौ", 150), ("sawa lakh", 125000), ("paune hazar", 750), ("sava sau rupaye", 125),
+]
+
+
+def hindi_number(value: int) -> str:
+    from app.utils.extractors import HINDI_NUMBERS
+
+    words = []
+    for scale, name in ((10 ** 7, "करोड़"), (10 ** 5, "लाख"), (10 ** 3, "हज़ार"), (100, "सौ")):
+        if value >= scale:
+            words += [hindi_number(value // scale), name]
+            value %= scale
+    if value or not words:
+        words.append(HINDI_NUMBERS[value])
+    return " ".join(words)
+
+
+def english_number(value: int) -> str:
+    from app.utils.extractors import ENGLISH_NUMBERS, ENGLISH_TENS
+
+    words = []
+    for scale, name in ((10 ** 7, "crore"), (10 ** 5, "lakh"), (10 ** 3, "thousand"), (100, "hundred")):
+        if value >= scale:
+            words += [english_number(value // scale), name]
+            value %= scale
+    if value >= 20:
+        words.append(ENGLISH_TENS[value // 10 - 2])
+        value %= 10
+    if value or not words:
+        words.append(ENGLISH_NUMBERS[value])
+    return " ".join(words)
+
+
+def number_cases(rng, count):
+    cases = []
+    for _ in range(count):
+        value = rng.choice([rng.randint(1, 99), rng.randint(1, 99) * 1000,
+                            rng.randint(1, 99) * 10 ** 5 + rng.randint(0, 9) * 10 ** 4, rng.randint(100, 99999)])
+        style = rng.randrange(6)
+        if style == 0:
+            text = f"महीने में {hindi_number(value)} रुपये"
+        elif style == 1:
+            text = f"about {english_number(value)} rupees"
+        elif style == 2:
+            text = f"{value:,} रुपये"
+        elif style == 3:
+            lakhs = rng.randint(1, 20)
+            text, value = f"साढ़े {hindi_number(lakhs)} लाख", lakhs * 10 ** 5 + 50000
+        elif style == 4:
+            text, value = rng.choice(FRACTION_AMOUNTS)
+        else:
+            text = f"लगभग {value} रुपए"
+        cases.append((text, value))
+    return cases
+
+
+def date_cases(rng, count, reference):
+    cases = []
+    for _ in range(count):
+        day = reference - timedelta(days=rng.randint(1, 30 * 365))
+        style = rng.randrange(5)
+        if style == 0:
+            text = f"{day.day:02d}/{day.month:02d}/{day.year}"
+        elif style == 1:
+            text = f"{day.day} {HINDI_MONTHS[day.month - 1]} {day.year} को"
+        elif style == 2:
+            text = f"on {day.strftime('%B')} {day.day}, {day.year}"
+        elif style == 3:
+            ago = rng.randint(2, 20)
+            day = reference - timedelta(days=ago)
+            text = f"{ago} दिन पहले"
+        else:
+            text = f"{day.isoformat()}"
+        cases.append((text, day.isoformat()))
+    return cases
+
+
+def duration_cases(rng, count):
+    units = [("साल", 365), ("years", 365), ("महीने", 30), ("months", 30), ("हफ्ते", 7), ("दिन", 1)]
+    cases = []
+    for _ in range(count):
+        unit, days = rng.choice(units)
+        value = rng.randint(1, 40)
+        spoken = hindi_number(value) if rng.random() < 0.5 else str(value)
+        cases.append((f"{spoken} {unit} से", value * days))
+    return cases
+
+
+def choice_cases(rng, count):
+    cases = []
+    for _ in range(count):
+        value, labels = rng.choice(OCCUPATIONS)
+        label = rng.choice(labels)
+        if rng.random() < 0.2 and len(label) > 4 and label.isascii():
+            position = rng.randrange(1, len(label) - 1)
+            label = label[:position] + label[position + 1:]
+        template = rng.choice(["मैं {} हूँ", "{} का काम करता हूँ", "I work as a {}", "{}"])
+        cases.append((template.format(label), value))
+    return cases
+
+
+def measure(extractor, cases, compare=lambda got, expected: got == expected):
+    texts = [text for text, _ in cases]
+    samples = []
+    results = []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(extractor(text))
+        samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    batched = extractor.batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    correct = sum(1 for got, (_, expected) in zip(results, cases) if compare(got, expected))
+    return {
+        "answers": len(cases),
+        "distinct_answers": len(set(texts)),
+        "latency": summarize(samples),
+        "per_sec": per_second(len(texts), sum(samples) / 1000),
+        "batch_per_sec": per_second(len(texts), batch_seconds),
+        "batch_matches_single": batched == results,
+        "accuracy": round(correct / len(cases), 4) if cases else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=20000)
+    parser.add_argument("--only", help=f"comma-separated subset of {','.join(SECTIONS)}")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    sections = args.only.split(",") if args.only else SECTIONS
+
+    from app.utils.extractors import (
+        ChoiceExtractor, DateExtractor, DurationExtractor, NumberExtractor, YesNoExtractor
+    )
+
+    rng = random.Random(args.seed)
+    reference = date(2025, 6, 1)
+    results = {"config": {"answers": args.answers, "seed": args.seed}}
+    if "number" in sections:
+        results["number"] = measure(NumberExtractor(), number_cases(rng, args.answers))
+    if "date" in sections:
+        results["date"] = measure(DateExtractor(reference), date_cases(rng, args.answers, reference))
+    if "duration" in sections:
+        results["duration"] = measure(
+            DurationExtractor(), duration_cases(rng, args.answers),
+            lambda got, expected: got is not None and got["days"] == expected
+        )
+    if "yes_no" in sections:
+        results["yes_no"] = measure(YesNoExtractor(), [rng.choice(YES_NO) for _ in range(args.answers)])
+    if "choice" in sections:
+        options = [{"value": value, "labels": labels} for value, labels in OCCUPATIONS]
+        results["choice"] = measure(ChoiceExtractor(options), choice_cases(rng, args.answers))
+
+    emit("extractors", results, os.path.abspath(args.output) if args.output else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Per-response cost and detection quality of FraudDetectionEngine.
+
+    python -m benchmarks.bench_fraud [--responses 200000] [--devices 500]
+                                     [--fraud-share 0.05] [--seed 3] [--output out.json]
+
+Replays a synthetic interview stream: honest enumerators doing a handful of
+interviews a day in their own village, and a share of devices that
+fabricate interviews - copying their previous answers with one change,
+"interviewing" minutes apart, or sitting at one spot. Reports evaluate()
+latency, how much state the engine keeps, and precision/recall of each
+flag type against the injected behaviour.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from benchmarks.common import emit, peak_memory, per_second, summarize
+from benchmarks.generators import synthetic_answers
+
+FRAUD_KINDS = ["copy", "rapid", "sitting"]
+
+# Which flag catches which behaviour
+FLAG_FOR_KIND = {"copy": "near_duplicate", "rapid": "impossible_duration", "sitting": "gps_cluster"}
+
+
+def interview_stream(count: int, devices: int, fraud_share: float, seed: int):
+    """(response, injected kind or None) in sync order"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 6, 9, 0)
+    enumerators = []
+    for index in range(devices):
+        kind = rng.choice(FRAUD_KINDS) if rng.random() < fraud_share else None
+        enumerators.append({
+            "device_id": f"dev-{index}",
+            "kind": kind,
+            "clock": start + timedelta(minutes=rng.randint(0, 120)),
+            "village": (rng.uniform(8.0, 32.0), rng.uniform(69.0, 89.0)),
+            "previous": None,
+        })
+
+    for number in range(count):
+        enumerator = rng.choice(enumerators)
+        kind = enumerator["kind"]
+        if kind == "rapid":
+            enumerator["clock"] += timedelta(minutes=rng.uniform(1, 2.5))
+        else:
+            enumerator["clock"] += timedelta(minutes=rng.uniform(30, 90))
+        if enumerator["clock"].hour >= 18:
+            enumerator["clock"] = enumerator["clock"].replace(hour=9) + timedelta(days=1)
+
+        if kind == "copy" and enumerator["previous"]:
+            answers = dict(enumerator["previous"])
+            answers["household_size"] = rng.randint(1, 9)
+        else:
+            answers = synthetic_answers(rng)
+        enumerator["previous"] = answers
+
+        lat, lng = enumerator["village"]
+        spread = 0.00005 if kind == "sitting" else 0.003
+        response = SimpleNamespace(
+            id=f"r{number}",
+            survey_id="survey-1",
+            responses={"q1": rng.choice(["yes", "no"]), **answers},
+            created_at=enumerator["clock"],
+            device_info={"device_id": enumerator["device_id"]},
+            location_lat=lat + rng.gauss(0, spread),
+            location_lng=lng + rng.gauss(0, spread),
+        )
+        yield response, kind
+
+
+def run(engine, stream):
+    samples = []
+    outcomes = []
+    for response, kind in stream:
+        start = time.perf_counter()
+        flags = engine.evaluate(response)
+        samples.append((time.perf_counter() - start) * 1000)
+        outcomes.append((kind, {flag["type"] for flag in flags}))
+    return samples, outcomes
+
+
+def quality(outcomes):
+    results = {}
+    for kind, flag_type in FLAG_FOR_KIND.items():
+        flagged = sum(1 for _, flags in outcomes if flag_type in flags)
+        true_positive = sum(1 for injected, flags in outcomes if flag_type in flags and injected == kind)
+        injected = sum(1 for injected, _ in outcomes if injected == kind)
+        results[flag_type] = {
+            "flagged": flagged,
+            "injected": injected,
+            "precision": round(true_positive / flagged, 4) if flagged else None,
+            "recall": round(true_positive / injected, 4) if injected else None,
+        }
+    honest = [flags for injected, flags in outcomes if injected is None]
+    results["honest_flagged_share"] = round(sum(1 for flags in honest if flags) / len(honest), 5) if honest else 0.0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=200000)
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--fraud-share", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    from app.services.fraud_detection import FraudDetectionEngine
+
+    stream = list(interview_stream(args.responses, args.devices, args.fraud_share, args.seed))
+    engine = FraudDetectionEngine()
+    start = time.perf_counter()
+    samples, outcomes = run(engine, stream)
+    elapsed = time.perf_counter() - start
+
+    # Separate run: tracing allocations slows evaluate() down
+    with peak_memory() as usage:
+        traced = FraudDetectionEngine()
+        run(traced, stream)
+
+    results = {
+        "config": vars(args) | {"output": None},
+        "evaluate": summarize(samples),
+        "responses_per_sec": per_second(len(samples), elapsed),
+        "state": {
+            "signatures": len(engine._slots),
+            "lsh_buckets": len(engine._buckets),
+            "devices": len(engine._devices),
+            "cells": len(engine._cells),
+            "peak_mb": round(usage["peak_bytes"] / 2 ** 20, 2),
+        },
+        "quality": quality(outcomes),
+    }
+    emit("fraud", results, os.path.abspath(args.output) if args.output else None)
+
+
+if __name__ == "__main__":
+    main()
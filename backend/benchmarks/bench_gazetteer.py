@@ -0,0 +1,197 @@
+"""Location resolution against a national-size gazetteer with GazetteerService.
+
+    python -m benchmarks.bench_gazetteer [--villages 650000] [--queries 5000]
+                                         [--seed 23] [--output out.json]
+
+Writes a synthetic gazetteer CSV - 36 states, ~21 districts per state, ~9
+blocks per district and the villages spread over the blocks, each with a
+Devanagari and a romanized name and coordinates near its parent - then
+reports:
+
+- compile: CSV -> memory-mapped index time and size on disk
+- load: opening the compiled index (what each restart or worker pays), next
+  to parsing the CSV into a name -> places dict, the in-memory alternative
+- lookups: latency and accuracy for answers naming a village in Devanagari,
+  romanized or romanized with a typo, alone, followed by its district, or
+  alone with a GPS point near the village. "name" accuracy counts a result
+  with the right name; "place" accuracy the right village, which without
+  the district or GPS is a guess between the villages sharing the name.
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import emit, peak_memory, per_second, summarize
+from benchmarks.generators import place_name, romanized_spelling
+
+STYLES = ["devanagari", "romanized", "romanized_typo"]
+CONTEXTS = ["alone", "with_district", "gps"]
+TEMPLATES = {
+    "alone": ["मैं {village} गांव में रहता हूँ", "{village}", "I live in {village} village"],
+    "with_district": ["{village}, जिला {district}", "{village} गांव, {district} जिला", "{village}, {district} district"],
+    "gps": ["{village} से हूँ", "{village}", "hamara gaon {village} hai"],
+}
+
+
+def canonical_spelling(spellings):
+    return "".join(options[0] for options in spellings).capitalize()
+
+
+def write_gazetteer(path, rng, villages):
+    """Synthetic gazetteer CSV; returns the villages as
+    (code, name, spellings, district name, lat, lng)"""
+    fields = ["code", "level", "name", "name_hi", "parent_code", "lat", "lng"]
+    villages_out = []
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        district_code = block_code = 0
+        village_code = 100000
+        blocks_total = 36 * 21 * 9
+        for state_code in range(1, 37):
+            state, spellings = place_name(rng)
+            state_lat, state_lng = rng.uniform(10.0, 30.0), rng.uniform(71.0, 87.0)
+            writer.writerow([state_code, "state", canonical_spelling(spellings), state, "",
+                             round(state_lat, 5), round(state_lng, 5)])
+            for _ in range(rng.randint(17, 25)):
+                district_code += 1
+                district, spellings = place_name(rng)
+                district_name = canonical_spelling(spellings)
+                district_lat, district_lng = state_lat + rng.uniform(-2, 2), state_lng + rng.uniform(-2, 2)
+                writer.writerow([district_code, "district", district_name, district, state_code,
+                                 round(district_lat, 5), round(district_lng, 5)])
+                for _ in range(rng.randint(7, 11)):
+                    block_code += 1
+                    block, spellings = place_name(rng)
+                    block_lat, block_lng = district_lat + rng.uniform(-0.3, 0.3), district_lng + rng.uniform(-0.3, 0.3)
+                    writer.writerow([block_code, "block", canonical_spelling(spellings), block, district_code,
+                                     round(block_lat, 5), round(block_lng, 5)])
+                    for _ in range(rng.randint(1, 2 * villages // blocks_total)):
+                        village_code += 1
+                        village, spellings = place_name(rng)
+                        lat, lng = block_lat + rng.uniform(-0.1, 0.1), block_lng + rng.uniform(-0.1, 0.1)
+                        writer.writerow([village_code, "village", canonical_spelling(spellings), village,
+                                         block_code, round(lat, 5), round(lng, 5)])
+                        villages_out.append((village_code, village, spellings, district, district_name, lat, lng))
+    return villages_out
+
+
+def parse_csv(path):
+    """The in-memory alternative to the compiled index: name -> rows"""
+    places = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            for name in (row["name"], row["name_hi"]):
+                places.setdefault(name.casefold(), []).append(row)
+    return places
+
+
+def queries(rng, villages, count):
+    cases = []
+    for _ in range(count):
+        code, village, spellings, district, district_name, lat, lng = rng.choice(villages)
+        style, context = rng.choice(STYLES), rng.choice(CONTEXTS)
+        if style == "devanagari":
+            mention, district_mention = village, district
+        else:
+            mention = romanized_spelling(rng, spellings, typo=style == "romanized_typo")
+            district_mention = district_name
+        text = rng.choice(TEMPLATES[context]).format(village=mention, district=district_mention)
+        point = (lat + rng.uniform(-0.02, 0.02), lng + rng.uniform(-0.02, 0.02)) if context == "gps" else (None, None)
+        cases.append((text, point, code, village, style, context))
+    return cases
+
+
+def bench_lookups(gazetteer, cases):
+    from app.utils.option_index import phonetic_keys
+
+    samples = {context: [] for context in CONTEXTS}
+    tried = {(style, context): 0 for style in STYLES for context in CONTEXTS}
+    named, placed = dict(tried), dict(tried)
+    for text, (lat, lng), code, village, style, context in cases:
+        start = time.perf_counter()
+        found = gazetteer.resolve(text, lat, lng, level="village")
+        samples[context].append((time.perf_counter() - start) * 1000)
+        tried[(style, context)] += 1
+        if found:
+            named[(style, context)] += phonetic_keys(found[0]["name_hi"]) == phonetic_keys(village)
+            placed[(style, context)] += found[0]["code"] == code
+
+    def share(counts, context):
+        return {style: round(counts[(style, context)] / tried[(style, context)], 4)
+                for style in STYLES if tried[(style, context)]}
+
+    return {
+        context: {
+            "latency": summarize(samples[context]),
+            "per_sec": per_second(len(samples[context]), sum(samples[context]) / 1000),
+            "name_accuracy": share(named, context),
+            "place_accuracy": share(placed, context),
+        }
+        for context in CONTEXTS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--villages", type=int, default=650000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=23)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    from app.services.gazetteer import GazetteerService
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="bharatpulse-gazetteer-")
+    try:
+        path, index_dir = os.path.join(workdir, "gazetteer.csv"), os.path.join(workdir, "gazetteer_index")
+        villages = write_gazetteer(path, rng, args.villages)
+
+        start = time.perf_counter()
+        GazetteerService(path, index_dir).compile()
+        compile_seconds = time.perf_counter() - start
+        files = {name: os.path.getsize(os.path.join(index_dir, name)) for name in sorted(os.listdir(index_dir))}
+
+        start = time.perf_counter()
+        gazetteer = GazetteerService(path, index_dir)
+        gazetteer.load()
+        load_ms = (time.perf_counter() - start) * 1000
+        with peak_memory() as load_usage:
+            GazetteerService(path, index_dir).load()
+
+        start = time.perf_counter()
+        parse_csv(path)
+        parse_ms = (time.perf_counter() - start) * 1000
+        with peak_memory() as parse_usage:
+            parse_csv(path)
+
+        results = {
+            "config": {"villages": len(villages), "places": len(gazetteer), "queries": args.queries, "seed": args.seed},
+            "compile": {
+                "seconds": round(compile_seconds, 2),
+                "csv_bytes": os.path.getsize(path),
+                "index_bytes": sum(files.values()),
+                "files": files,
+            },
+            "load": {
+                "mmap_index_ms": round(load_ms, 2),
+                "mmap_index_peak_bytes": load_usage["peak_bytes"],
+                "parse_csv_ms": round(parse_ms, 2),
+                "parse_csv_peak_bytes": parse_usage["peak_bytes"],
+            },
+            "lookups": bench_lookups(gazetteer, queries(rng, villages, args.queries)),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    emit("gazetteer", results, output)
+
+
+if __name__ == "__main__":
+    main()
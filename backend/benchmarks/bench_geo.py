@@ -0,0 +1,210 @@
+"""Bounding-box, radius and map-cell queries over a large response table.
+
+    python -m benchmarks.bench_geo [--rows 1000000] [--surveys 1] [--queries 30]
+                                   [--seed 7] [--output out.json]
+
+Bulk-loads synthetic responses clustered around villages across India into a
+throwaway SQLite database, then times district (~50 km), block (~10 km) and
+village (~1 km) boxes two ways: a plain latitude/longitude range filter (what
+the survey_id index alone allows) and GeoIndexService's geohash range scans.
+Both must return the same rows. Radius queries and per-cell counts at each
+aggregated zoom level (counter rows vs GROUP BY over responses) are timed too.
+"""
+import argparse
+import math
+import os
+import random
+import time
+from collections import Counter
+
+from benchmarks.common import emit, per_second, scratch_workdir, summarize
+
+# Mainland India, roughly
+INDIA_BBOX = (8.0, 68.5, 32.0, 88.0)
+
+BOX_SIZES_KM = {"district": 50.0, "block": 10.0, "village": 1.0}
+
+KM_PER_DEGREE = 111.2
+
+
+def synthetic_locations(rows: int, seed: int):
+    """Points clustered like survey fieldwork: districts, villages within them, households around each"""
+    rng = random.Random(seed)
+    min_lat, min_lng, max_lat, max_lng = INDIA_BBOX
+    districts = [(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(max(1, rows // 20000))]
+    villages = []
+    for lat, lng in districts:
+        for _ in range(40):
+            villages.append((lat + rng.gauss(0, 0.2), lng + rng.gauss(0, 0.2)))
+    for _ in range(rows):
+        lat, lng = rng.choice(villages)
+        yield lat + rng.gauss(0, 0.004), lng + rng.gauss(0, 0.004)
+
+
+def load(db, rows: int, surveys: int, seed: int, batch_size: int = 20000):
+    from app.models.analytics import SurveyStatCounterDB
+    from app.models.response import ResponseDB
+    from app.services.analytics_service import SurveyAnalyticsService
+    from app.services.geo_service import GEO_AGGREGATE_PRECISIONS
+    from app.utils import geohash
+
+    table = ResponseDB.__table__
+    cells = {survey: Counter() for survey in range(surveys)}
+    points = []
+    batch = []
+    start = time.perf_counter()
+    for i, (lat, lng) in enumerate(synthetic_locations(rows, seed)):
+        survey = i % surveys
+        cell = geohash.encode(lat, lng)
+        for precision in GEO_AGGREGATE_PRECISIONS:
+            cells[survey][(f"geo:{precision}", cell[:precision])] += 1
+        batch.append({
+            "id": f"r{i}", "survey_id": f"survey-{survey}", "respondent_id": f"p{i}",
+            "responses": {}, "location_lat": lat, "location_lng": lng, "geohash": cell,
+            "is_complete": True, "is_synced": True,
+        })
+        if i % 97 == 0:
+            points.append((f"survey-{survey}", lat, lng))
+        if len(batch) >= batch_size:
+            db.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(table.insert(), batch)
+    db.commit()
+    insert_seconds = time.perf_counter() - start
+
+    # Same counter rows incremental aggregation would have written
+    analytics = SurveyAnalyticsService()
+    for survey, counts in cells.items():
+        analytics._apply(db, f"survey-{survey}", {key: [count, 0.0] for key, count in counts.items()})
+    db.commit()
+    db.connection().exec_driver_sql("ANALYZE")
+    return points, {
+        "rows": rows,
+        "insert_rows_per_sec": per_second(rows, insert_seconds),
+        "counter_rows": db.query(SurveyStatCounterDB).count(),
+    }
+
+
+def box_around(lat: float, lng: float, size_km: float):
+    half_lat = size_km / 2 / KM_PER_DEGREE
+    half_lng = size_km / 2 / (KM_PER_DEGREE * math.cos(math.radians(lat)))
+    return lat - half_lat, lng - half_lng, lat + half_lat, lng + half_lng
+
+
+def naive_bbox(db, survey_id, bbox):
+    from app.models.response import ResponseDB
+    from app.services.geo_service import GeoIndexService
+
+    min_lat, min_lng, max_lat, max_lng = bbox
+    return db.query(*GeoIndexService.POINT_COLUMNS).filter(
+        ResponseDB.survey_id == survey_id,
+        ResponseDB.location_lat.between(min_lat, max_lat),
+        ResponseDB.location_lng.between(min_lng, max_lng)
+    ).all()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def bench_bbox(db, service, points, queries: int, rng: random.Random):
+    results = {}
+    for name, size_km in BOX_SIZES_KM.items():
+        naive_ms, indexed_ms, matched = [], [], []
+        for survey_id, lat, lng in rng.sample(points, min(queries, len(points))):
+            bbox = box_around(lat, lng, size_km)
+            expected, elapsed = timed(lambda: naive_bbox(db, survey_id, bbox))
+            naive_ms.append(elapsed)
+            found, elapsed = timed(lambda: service.within_bbox(db, survey_id, bbox, limit=10 ** 9))
+            indexed_ms.append(elapsed)
+            if sorted(row.id for row in expected) != sorted(point["id"] for point in found):
+                raise AssertionError(f"{name} box {bbox}: geohash query disagrees with full scan")
+            matched.append(len(found))
+
+        naive, indexed = summarize(naive_ms), summarize(indexed_ms)
+        results[name] = {
+            "box_km": size_km,
+            "mean_rows": round(sum(matched) / len(matched), 1),
+            "full_scan": naive,
+            "geohash": indexed,
+            "speedup": round(naive["p50_ms"] / indexed["p50_ms"], 1) if indexed["p50_ms"] else None,
+        }
+    return results
+
+
+def bench_radius(db, service, points, queries: int, rng: random.Random, radius_m: float = 2000):
+    samples = []
+    for survey_id, lat, lng in rng.sample(points, min(queries, len(points))):
+        _, elapsed = timed(lambda: service.within_radius(db, survey_id, lat, lng, radius_m, limit=10 ** 9))
+        samples.append(elapsed)
+    return {"radius_m": radius_m, **summarize(samples)}
+
+
+def bench_cells(db, service, queries: int):
+    from sqlalchemy import func
+    from app.models.response import ResponseDB
+    from app.services.geo_service import GEO_AGGREGATE_PRECISIONS
+
+    results = {}
+    for precision in GEO_AGGREGATE_PRECISIONS:
+        counters, grouped = [], []
+        for _ in range(queries):
+            cells, elapsed = timed(lambda: service.cell_counts(db, "survey-0", precision))
+            counters.append(elapsed)
+            rows, elapsed = timed(lambda: db.query(
+                func.substr(ResponseDB.geohash, 1, precision), func.count()
+            ).filter(ResponseDB.survey_id == "survey-0").group_by(
+                func.substr(ResponseDB.geohash, 1, precision)
+            ).all())
+            grouped.append(elapsed)
+        if {cell["cell"]: cell["count"] for cell in cells} != dict(rows):
+            raise AssertionError(f"precision {precision}: counter rows disagree with GROUP BY")
+
+        counter_stats, group_stats = summarize(counters), summarize(grouped)
+        results[f"precision_{precision}"] = {
+            "cells": len(cells),
+            "counters": counter_stats,
+            "group_by": group_stats,
+            "speedup": round(group_stats["p50_ms"] / counter_stats["p50_ms"], 1) if counter_stats["p50_ms"] else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--surveys", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=30, help="queries per box size / zoom level")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    scratch_workdir("bharatpulse-geo-")
+
+    from app.database import SessionLocal, create_tables
+    from app.services.geo_service import GeoIndexService
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        points, loaded = load(db, args.rows, args.surveys, args.seed)
+        service = GeoIndexService()
+        rng = random.Random(args.seed)
+        results = {
+            "config": {"rows": args.rows, "surveys": args.surveys, "queries": args.queries},
+            "load": loaded,
+            "bbox": bench_bbox(db, service, points, args.queries, rng),
+            "radius": bench_radius(db, service, points, args.queries, rng),
+            "cells": bench_cells(db, service, max(1, args.queries // 3)),
+        }
+    finally:
+        db.close()
+    emit("geo", results, output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Latency and throughput of the backend hot paths, for regression tracking.
+
+    python -m benchmarks.bench_hot_paths [--only privacy,nlp,...] [--rows 2000]
+                                         [--requests 200] [--concurrency 8]
+                                         [--stt-latency-ms 50] [--output out.json]
+
+Sections: PrivacyService encrypt/decrypt/anonymize rates, NLPService
+extract_fields ops/sec, process_voice latency and throughput with a stub
+STT model, batch_sync_responses rows/sec, export_survey_csv rows/sec and
+peak memory, and survey GET latency. API sections go through the full ASGI
+app (middleware included) over httpx, against a throwaway SQLite database
+in a temporary working directory, so the real database, encryption key and
+audio store are never touched. Compare two runs with benchmarks.compare.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.common import emit, peak_memory, per_second, scratch_workdir, summarize
+from benchmarks.generators import (
+    speech_like_wav, spoken_answers, synthetic_answers, synthetic_response, synthetic_survey
+)
+
+SECTIONS = ["privacy", "nlp", "process_voice", "batch_sync", "export_csv", "survey_get"]
+
+
+def bench_privacy(rows: int):
+    from app.utils.privacy import PrivacyService
+
+    service = PrivacyService()
+    records = [synthetic_answers(random.Random(i)) for i in range(rows)]
+
+    def run(func, items):
+        start = time.perf_counter()
+        output = [func(item) for item in items]
+        return output, per_second(len(items), time.perf_counter() - start)
+
+    encrypted, encrypt_rate = run(service.encrypt_sensitive_data, records)
+    decrypted, decrypt_rate = run(service.decrypt_sensitive_data, encrypted)
+    _, anonymize_rate = run(service.anonymize_response, decrypted)
+    _, mask_rate = run(service._mask_pii_in_text, [record["notes"] for record in records])
+
+    return {
+        "records": rows,
+        "encrypt_per_sec": encrypt_rate,
+        "decrypt_per_sec": decrypt_rate,
+        "anonymize_per_sec": anonymize_rate,
+        "mask_text_per_sec": mask_rate,
+        "round_trip_ok": decrypted == records,
+    }
+
+
+async def bench_nlp(nlp_service, count: int):
+    answers = spoken_answers(count, seed=3)
+    await nlp_service.extract_fields(answers[0][2], "q1")
+
+    by_language = {}
+    start = time.perf_counter()
+    for language, field, text in answers:
+        call_start = time.perf_counter()
+        await nlp_service.extract_fields(text, field, language=language)
+        by_language.setdefault(language, []).append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "spacy_loaded": bool(nlp_service.nlp_en or nlp_service.nlp_hi),
+        "ops_per_sec": per_second(len(answers), elapsed),
+        "latency": {language: summarize(samples) for language, samples in by_language.items()},
+    }
+
+
+async def bench_process_voice(client, survey_id: str, requests: int, concurrency: int):
+    clips = [speech_like_wav(seconds, seed=i, leading_silence=1.0, trailing_silence=2.0)
+             for i, seconds in enumerate([1.5, 3.0, 6.0])]
+
+    async def call(i: int):
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/process-voice",
+            params={"question_id": "q1", "user_lang": "hi", "session_id": f"s{i % 50}", "survey_id": survey_id},
+            files={"audio_file": ("answer.wav", clips[i % len(clips)], "audio/wav")},
+        )
+        return (time.perf_counter() - start) * 1000, response.status_code == 200
+
+    await call(0)
+
+    # Latency: one request at a time
+    sequential = [await call(i) for i in range(requests)]
+
+    # Throughput: `concurrency` requests in flight
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(i):
+        async with semaphore:
+            return await call(i)
+
+    start = time.perf_counter()
+    concurrent = await asyncio.gather(*(limited(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "clip_seconds": [1.5, 3.0, 6.0],
+        "latency": summarize([ms for ms, _ in sequential]),
+        "concurrency": concurrency,
+        "concurrent_latency": summarize([ms for ms, _ in concurrent]),
+        "requests_per_sec": per_second(requests, elapsed),
+        "errors": sum(not ok for _, ok in sequential + list(concurrent)),
+    }
+
+
+async def bench_batch_sync(client, survey_id: str, rows: int, batch_size: int):
+    payload = [synthetic_response(survey_id, seed=i) for i in range(rows)]
+    batches = [payload[i:i + batch_size] for i in range(0, rows, batch_size)]
+
+    async def sync_all():
+        synced = 0
+        start = time.perf_counter()
+        for batch in batches:
+            response = await client.post("/api/sync/batch", json={"responses": batch})
+            synced += response.json()["synced_responses"]
+        return synced, time.perf_counter() - start
+
+    inserted, insert_seconds = await sync_all()
+    # Devices re-send rows after a dropped connection; those become updates
+    updated, update_seconds = await sync_all()
+
+    return {
+        "rows": rows,
+        "batch_size": batch_size,
+        "insert_rows_per_sec": per_second(inserted, insert_seconds),
+        "update_rows_per_sec": per_second(updated, update_seconds),
+        "failed": 2 * rows - inserted - updated,
+    }
+
+
+async def bench_export_csv(client, survey_id: str, rows: int, repeat: int = 3):
+    results = {"rows": rows}
+    for anonymized in (True, False):
+        url = f"/api/export/csv/{survey_id}"
+        params = {"anonymized": str(anonymized).lower()}
+
+        timings = []
+        size = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = await client.get(url, params=params)
+            timings.append(time.perf_counter() - start)
+            size = len(response.content)
+
+        with peak_memory() as usage:
+            await client.get(url, params=params)
+
+        results["anonymized" if anonymized else "plain"] = {
+            "rows_per_sec": per_second(rows, min(timings)),
+            "best_ms": round(min(timings) * 1000, 2),
+            "csv_bytes": size,
+            "peak_mb": round(usage["peak_bytes"] / 1024 / 1024, 2),
+            "peak_bytes_per_row": round(usage["peak_bytes"] / rows) if rows else 0,
+        }
+    return results
+
+
+async def bench_survey_get(client, survey_id: str, requests: int):
+    for seed in range(1, 20):
+        await client.post("/api/surveys", json=synthetic_survey(seed=seed))
+
+    async def timed(url):
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get(url)
+            samples.append((time.perf_counter() - start) * 1000)
+        return summarize(samples)
+
+    await client.get(f"/api/surveys/{survey_id}")
+    return {
+        "get_one": await timed(f"/api/surveys/{survey_id}"),
+        "list_20": await timed("/api/surveys"),
+        "not_found": await timed("/api/surveys/missing"),
+    }
+
+
+async def run(args, sections):
+    results = {"config": {
+        "rows": args.rows, "requests": args.requests, "concurrency": args.concurrency,
+        "batch_size": args.batch_size, "stt_latency_ms": args.stt_latency_ms,
+    }}
+
+    if "privacy" in sections:
+        results["privacy"] = bench_privacy(args.rows)
+
+    nlp_service = None
+    if sections & {"nlp", "process_voice"}:
+        from app.services.nlp_service import NLPService
+        nlp_service = NLPService()
+    if "nlp" in sections:
+        results["nlp"] = await bench_nlp(nlp_service, args.requests * 5)
+
+    if not sections & {"process_voice", "batch_sync", "export_csv", "survey_get"}:
+        return results
+
+    import httpx
+    from app import main
+    from app.database import create_tables
+    from app.services.stt_service import STTService
+
+    create_tables()
+    if "process_voice" in sections:
+        main.stt_service = STTService()
+        main.nlp_service = nlp_service
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        survey = (await client.post("/api/surveys", json=synthetic_survey())).json()
+
+        if "process_voice" in sections:
+            results["process_voice"] = await bench_process_voice(
+                client, survey["id"], args.requests, args.concurrency
+            )
+        if sections & {"batch_sync", "export_csv"}:
+            sync = await bench_batch_sync(client, survey["id"], args.rows, args.batch_size)
+            if "batch_sync" in sections:
+                results["batch_sync"] = sync
+        if "export_csv" in sections:
+            results["export_csv"] = await bench_export_csv(client, survey["id"], args.rows)
+        if "survey_get" in sections:
+            results["survey_get"] = await bench_survey_get(client, survey["id"], args.requests)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default=",".join(SECTIONS), help=f"comma-separated subset of {', '.join(SECTIONS)}")
+    parser.add_argument("--rows", type=int, default=2000, help="responses for privacy, sync and export")
+    parser.add_argument("--requests", type=int, default=200, help="requests per API latency measurement")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--stt-latency-ms", type=int, default=50, help="simulated model inference time")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    sections = {name.strip() for name in args.only.split(",") if name.strip()}
+    unknown = sections - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    output = os.path.abspath(args.output) if args.output else None
+
+    scratch_workdir()
+    os.environ["STT_BACKEND"] = f"stub:{args.stt_latency_ms}"
+    os.environ["STT_SHORT_BACKEND"] = ""
+    os.environ["STT_LANGUAGE_MODELS"] = ""
+
+    from benchmarks import stubs
+    stubs.install()
+
+    results = asyncio.run(run(args, sections))
+    results["config"]["sections"] = [name for name in SECTIONS if name in sections]
+    emit("hot_paths", results, output)
+
+
+if __name__ == "__main__":
+    main()
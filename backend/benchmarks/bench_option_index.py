@@ -0,0 +1,168 @@
+"""Matching spoken answers against large option lists with OptionIndex.
+
+    python -m benchmarks.bench_option_index [--options 100,1000,5000]
+                                            [--answers 5000] [--scan-answers 200]
+                                            [--seed 17] [--output out.json]
+
+Generates village names as Devanagari labels, and answers that mention one
+in Devanagari, in a romanized spelling ("Raampur", "Sitapoor") or
+romanized with a typo, inside a sentence. For each option count it reports
+the index build time and memory, latency per answer and the share matched
+to the right village. Names are not deduplicated by phonetic key, so lists
+hold villages that key alike (रामपुर/रामापुर, "Rampur"/"Rampura"):
+accuracy is also reported for answers naming one of those, with the share
+of them reported as ambiguous. It also times a linear scan that
+edit-distance checks every label against the answer, the way matching
+works without an index.
+"""
+import argparse
+import os
+import random
+import time
+
+from benchmarks.common import emit, peak_memory, per_second, summarize
+from benchmarks.generators import place_name, romanized_spelling
+
+STYLES = ["devanagari", "romanized", "romanized_typo"]
+TEMPLATES = ["मैं {} गांव में रहता हूँ", "{} से हूँ", "I live in {} village", "{}", "hamara gaon {} hai"]
+
+
+def village_names(rng, count):
+    """count villages with distinct labels as (Devanagari label, [syllable
+    spellings]); labels may still share a phonetic key"""
+    villages, labels = [], set()
+    while len(villages) < count:
+        label, spellings = place_name(rng)
+        if label in labels:
+            continue
+        labels.add(label)
+        villages.append((label, spellings))
+    return villages
+
+
+def colliding(villages):
+    """Villages whose label shares its phonetic key with another village's"""
+    from collections import Counter
+
+    from app.utils.option_index import phonetic_keys
+
+    keys = [tuple(phonetic_keys(label)) for label, _ in villages]
+    counts = Counter(keys)
+    return {value for value, key in enumerate(keys) if counts[key] > 1}
+
+
+def spoken_cases(rng, villages, count):
+    cases = []
+    for _ in range(count):
+        value = rng.randrange(len(villages))
+        label, spellings = villages[value]
+        style = rng.choice(STYLES)
+        if style == "devanagari":
+            mention = label
+        else:
+            mention = romanized_spelling(rng, spellings, typo=style == "romanized_typo")
+        cases.append((rng.choice(TEMPLATES).format(mention), value, style))
+    return cases
+
+
+def linear_scan(entries, text):
+    """Best label by edit distance over every label and answer window"""
+    from app.utils.option_index import OptionIndex, bounded_distance, phonetic_keys
+
+    tokens = phonetic_keys(text)
+    best, best_distance = None, None
+    for value, key in entries:
+        limit = OptionIndex.allowed_distance(len(key))
+        for token in tokens:
+            distance = bounded_distance(key, token, limit)
+            if distance <= limit and (best_distance is None or distance < best_distance):
+                best, best_distance = value, distance
+    return best
+
+
+def bench(option_count, answers, scan_answers, seed):
+    from app.utils.option_index import OptionIndex
+
+    rng = random.Random(seed)
+    villages = village_names(rng, option_count)
+    options = [{"value": index, "labels": [label]} for index, (label, _) in enumerate(villages)]
+
+    start = time.perf_counter()
+    index = OptionIndex(options)
+    build_ms = (time.perf_counter() - start) * 1000
+    with peak_memory() as usage:
+        OptionIndex(options)
+
+    cases = spoken_cases(rng, villages, answers)
+    collides = colliding(villages)
+    samples, correct, tried = [], dict.fromkeys(STYLES, 0), dict.fromkeys(STYLES, 0)
+    collision_correct, collision_tried, collision_ambiguous = dict(correct), dict(tried), dict(tried)
+    for text, expected, style in cases:
+        start = time.perf_counter()
+        matches = index.match(text)
+        samples.append((time.perf_counter() - start) * 1000)
+        # An ambiguous match is not an answer, as in ChoiceExtractor
+        right = bool(matches) and matches[0].value == expected and not matches[0].alternatives
+        tried[style] += 1
+        correct[style] += right
+        if expected in collides:
+            collision_tried[style] += 1
+            collision_correct[style] += right
+            collision_ambiguous[style] += bool(matches) and bool(matches[0].alternatives)
+
+    entries = [(value, " ".join(key)) for key, choices in zip(index.keys, index.choices) for value, _ in choices]
+    scan_samples, scan_correct = [], 0
+    for text, expected, _ in cases[:scan_answers]:
+        start = time.perf_counter()
+        found = linear_scan(entries, text)
+        scan_samples.append((time.perf_counter() - start) * 1000)
+        scan_correct += found == expected
+
+    indexed, scanned = summarize(samples), summarize(scan_samples)
+    return {
+        "options": option_count,
+        "build_ms": round(build_ms, 2),
+        "index_peak_bytes": usage["peak_bytes"],
+        "indexed": {
+            "latency": indexed,
+            "per_sec": per_second(len(samples), sum(samples) / 1000),
+            "accuracy": round(sum(correct.values()) / len(cases), 4),
+            "accuracy_by_style": {style: round(correct[style] / tried[style], 4) for style in STYLES if tried[style]},
+        },
+        "colliding": {
+            "villages": len(collides),
+            "answers": sum(collision_tried.values()),
+            "accuracy_by_style": {style: round(collision_correct[style] / collision_tried[style], 4)
+                                  for style in STYLES if collision_tried[style]},
+            "ambiguous_by_style": {style: round(collision_ambiguous[style] / collision_tried[style], 4)
+                                   for style in STYLES if collision_tried[style]},
+        },
+        "linear_scan": {
+            "latency": scanned,
+            "accuracy": round(scan_correct / len(scan_samples), 4) if scan_samples else None,
+        },
+        "speedup_p50": round(scanned["p50_ms"] / indexed["p50_ms"], 1) if indexed["p50_ms"] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--options", default="100,1000,5000", help="comma-separated option counts")
+    parser.add_argument("--answers", type=int, default=5000)
+    parser.add_argument("--scan-answers", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {
+        "config": {"answers": args.answers, "scan_answers": args.scan_answers, "seed": args.seed},
+        "by_option_count": [
+            bench(int(count), args.answers, args.scan_answers, args.seed)
+            for count in args.options.split(",")
+        ],
+    }
+    emit("option_index", results, os.path.abspath(args.output) if args.output else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Real-time factor and WER of each STT backend on the bundled sample set.
+
+    python -m benchmarks.bench_stt [--backends whisper:tiny whisper-int8:tiny faster-whisper:tiny]
+                                   [--audio-dir recordings/] [--output out.json]
+
+Reference sentences live in benchmarks/data/stt_samples.tsv. Audio for a
+sample is read from --audio-dir/<id>.(wav|mp3|ogg) when present; otherwise
+it is rendered once with TTSService and saved there, so real field
+recordings can replace the synthetic ones without code changes.
+
+RTF = processing time / audio duration (below 1.0 is faster than real time).
+"""
+import argparse
+import asyncio
+import csv
+import io
+import os
+import time
+
+from app.services.stt_backends import create_stt_backend
+from app.utils.audio_codec import sniff_format
+from benchmarks.common import emit, summarize, word_error_rate
+
+SAMPLES_PATH = os.path.join(os.path.dirname(__file__), "data", "stt_samples.tsv")
+DEFAULT_BACKENDS = ["whisper:tiny", "whisper-int8:tiny", "faster-whisper:tiny", "whisper:base", "vosk"]
+
+
+def load_samples(path: str, languages=None):
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    return [row for row in rows if not languages or row["lang"] in languages]
+
+
+async def _load_audio(samples, audio_dir: str):
+    """{sample id: 16 kHz mono float32 array}, synthesizing missing clips"""
+    import librosa
+
+    os.makedirs(audio_dir, exist_ok=True)
+    tts = None
+    clips = {}
+
+    for sample in samples:
+        path = next(
+            (os.path.join(audio_dir, f"{sample['id']}.{ext}") for ext in ("wav", "mp3", "ogg")
+             if os.path.exists(os.path.join(audio_dir, f"{sample['id']}.{ext}"))),
+            None
+        )
+
+        if path is None:
+            if tts is None:
+                from app.services.tts_service import TTSService
+                tts = TTSService()
+            audio, _ = await tts.synthesize_audio(sample["text"], sample["lang"])
+            if not audio:
+                print(f"Skipping {sample['id']}: no audio and TTS failed")
+                continue
+            path = os.path.join(audio_dir, f"{sample['id']}.{sniff_format(audio) or 'wav'}")
+            with open(path, "wb") as f:
+                f.write(audio)
+
+        with open(path, "rb") as f:
+            clips[sample["id"]], _ = librosa.load(io.BytesIO(f.read()), sr=16000, mono=True)
+
+    if tts:
+        tts.close()
+    return clips
+
+
+def bench_backend(spec: str, samples, clips):
+    backend = create_stt_backend(spec)
+    try:
+        start = time.perf_counter()
+        backend.load()
+        load_seconds = time.perf_counter() - start
+    except Exception as e:
+        return {"error": f"load failed: {e}"}
+
+    # Warm up allocator / thread pools on one clip
+    warmup = next(sample for sample in samples if sample["id"] in clips)
+    backend.transcribe(clips[warmup["id"]], language=warmup["lang"])
+
+    per_language = {}
+    for sample in samples:
+        audio = clips.get(sample["id"])
+        if audio is None:
+            continue
+
+        start = time.perf_counter()
+        result = backend.transcribe(audio, language=sample["lang"])
+        elapsed = time.perf_counter() - start
+
+        stats = per_language.setdefault(sample["lang"], {"audio": 0.0, "cpu": 0.0, "pairs": [], "ms": []})
+        stats["audio"] += len(audio) / 16000
+        stats["cpu"] += elapsed
+        stats["pairs"].append((sample["text"], result["text"]))
+        stats["ms"].append(elapsed * 1000)
+
+    report = {"label": backend.label, "load_seconds": round(load_seconds, 2), "languages": {}}
+    for lang, stats in per_language.items():
+        report["languages"][lang] = {
+            "samples": len(stats["pairs"]),
+            "audio_seconds": round(stats["audio"], 2),
+            "rtf": round(stats["cpu"] / stats["audio"], 4) if stats["audio"] else None,
+            "wer": word_error_rate(stats["pairs"]),
+            "latency": summarize(stats["ms"]),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=DEFAULT_BACKENDS)
+    parser.add_argument("--samples", default=SAMPLES_PATH)
+    parser.add_argument("--languages", nargs="+")
+    parser.add_argument("--audio-dir", default=os.path.join("benchmarks", "data", "audio"))
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples, args.languages)
+    clips = asyncio.run(_load_audio(samples, args.audio_dir))
+    if not clips:
+        raise SystemExit("No audio available for the sample set")
+
+    results = {spec: bench_backend(spec, samples, clips) for spec in args.backends}
+    emit("stt_backends", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
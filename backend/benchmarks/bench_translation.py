@@ -0,0 +1,75 @@
+"""CPU sentences/sec for MarianMT: one-at-a-time vs batched (+ int8).
+
+    python -m benchmarks.bench_translation [--model Helsinki-NLP/opus-mt-hi-en] [--output out.json]
+
+Needs transformers, torch and the model checkpoint (downloaded or cached).
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import emit
+
+SENTENCES = [
+    "मेरा नाम सीता है।",
+    "मैं पैंतीस साल की हूँ।",
+    "हम खेती करते हैं और महीने में लगभग दस हज़ार रुपये कमाते हैं।",
+    "मेरे गांव में पानी की बहुत समस्या है।",
+    "बच्चे सरकारी स्कूल में पढ़ते हैं।",
+    "पिछले साल बारिश कम हुई थी इसलिए फसल अच्छी नहीं हुई।",
+    "अस्पताल हमारे घर से दस किलोमीटर दूर है।",
+    "हाँ",
+]
+
+
+def legacy_translate(model, tokenizer, sentences):
+    """The original _neural_translate: one sentence per generate(), autograd on"""
+    for sentence in sentences:
+        tokens = tokenizer.encode(sentence, return_tensors="pt")
+        translated = model.generate(tokens, max_length=100)
+        tokenizer.decode(translated[0], skip_special_tokens=True)
+
+
+def run(model_name: str, count: int, micro_batch: int):
+    import torch
+    from transformers import MarianMTModel, MarianTokenizer
+    from app.services.translation_batcher import TranslationBatcher
+
+    rng = random.Random(3)
+    sentences = [rng.choice(SENTENCES) + f" ({i})" for i in range(count)]
+
+    tokenizer = MarianTokenizer.from_pretrained(model_name)
+    model = MarianMTModel.from_pretrained(model_name)
+    model.eval()
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    results = {"model": model_name, "sentences": count, "torch_threads": torch.get_num_threads()}
+
+    start = time.perf_counter()
+    legacy_translate(model, tokenizer, sentences)
+    results["sequential_fp32"] = round(count / (time.perf_counter() - start), 2)
+
+    for label, candidate in (("batched_fp32", model), ("batched_int8", quantized)):
+        batcher = TranslationBatcher(lambda m=candidate: (m, tokenizer), micro_batch_size=micro_batch)
+        start = time.perf_counter()
+        batcher.generate(sentences)
+        results[label] = round(count / (time.perf_counter() - start), 2)
+
+    results["unit"] = "sentences/sec"
+    results["speedup_batched_int8"] = round(results["batched_int8"] / results["sequential_fp32"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="Helsinki-NLP/opus-mt-hi-en")
+    parser.add_argument("--sentences", type=int, default=64)
+    parser.add_argument("--micro-batch", type=int, default=8)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    emit("translation", run(args.model, args.sentences, args.micro_batch), args.output)
+
+
+if __name__ == "__main__":
+    main()
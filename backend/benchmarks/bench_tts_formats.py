@@ -0,0 +1,114 @@
+"""Payload size and encode time of each TTS output profile.
+
+    python -m benchmarks.bench_tts_formats [--input prompt.wav ...] [--output out.json]
+
+Without --input, prompts are rendered with TTSService; if no TTS engine is
+available a synthetic speech-like clip is used instead.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import time
+
+from app.utils.audio_codec import OUTPUT_PROFILES, ffmpeg_available, sniff_format, transcode_bytes
+from benchmarks.common import emit, summarize
+from benchmarks.generators import speech_like_wav
+
+SAMPLE_PROMPTS = [
+    "आपकी उम्र क्या है?",
+    "आप महीने में कितना कमाते हैं?",
+    "कृपया अपने गांव का नाम बताइए।",
+]
+
+# Effective goodput of a typical rural 2G (EDGE) connection
+LINK_KBPS = 40
+
+
+async def _load_sources(inputs, lang):
+    if inputs:
+        sources = []
+        for path in inputs:
+            with open(path, "rb") as f:
+                sources.append((path, f.read()))
+        return sources
+
+    try:
+        from app.services.tts_service import TTSService
+        tts = TTSService()
+        sources = []
+        for text in SAMPLE_PROMPTS:
+            audio, _ = await tts.synthesize_audio(text, lang)
+            if audio:
+                sources.append((text, audio))
+        tts.close()
+        if sources:
+            return sources
+    except Exception as e:
+        print(f"TTS unavailable ({e}); using synthetic clips")
+
+    return [(f"synthetic-{i}", speech_like_wav(2.5, 22050, seed=i)) for i in range(3)]
+
+
+def _payload_stats(audio: bytes) -> dict:
+    json_body = json.dumps({"audio_base64": base64.b64encode(audio).decode(), "success": True})
+    return {
+        "binary_bytes": len(audio),
+        "base64_json_bytes": len(json_body),
+    }
+
+
+async def run(inputs, lang, repeat):
+    sources = await _load_sources(inputs, lang)
+    results = {"ffmpeg": ffmpeg_available(), "link_kbps": LINK_KBPS, "profiles": {}}
+
+    native = {"bytes": [], "json_bytes": []}
+    for _, audio in sources:
+        stats = _payload_stats(audio)
+        native["bytes"].append(stats["binary_bytes"])
+        native["json_bytes"].append(stats["base64_json_bytes"])
+    results["profiles"]["native"] = {
+        "format": sniff_format(sources[0][1]),
+        "mean_bytes": sum(native["bytes"]) / len(sources),
+        "mean_base64_json_bytes": sum(native["json_bytes"]) / len(sources),
+        "seconds_on_2g_base64_json": round(sum(native["json_bytes"]) / len(sources) * 8 / (LINK_KBPS * 1000), 3),
+    }
+
+    if not results["ffmpeg"]:
+        return results
+
+    for profile, settings in OUTPUT_PROFILES.items():
+        sizes, encode_ms = [], []
+        for _, audio in sources:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                encoded = await transcode_bytes(audio, settings["args"])
+                encode_ms.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(encoded or b""))
+
+        mean_bytes = sum(sizes) / len(sizes)
+        results["profiles"][profile] = {
+            "format": settings["format"],
+            "mean_bytes": mean_bytes,
+            "vs_native_base64_json": round(mean_bytes / results["profiles"]["native"]["mean_base64_json_bytes"], 4),
+            "seconds_on_2g": round(mean_bytes * 8 / (LINK_KBPS * 1000), 3),
+            "encode": summarize(encode_ms),
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", action="append", help="WAV/MP3 prompt file (repeatable)")
+    parser.add_argument("--lang", default="hi")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.input, args.lang, args.repeat))
+    emit("tts_formats", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
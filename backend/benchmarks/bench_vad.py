@@ -0,0 +1,155 @@
+"""Audio seconds removed by the VAD stage and its effect on STT latency.
+
+    python -m benchmarks.bench_vad [--clips 60] [--audio-dir recordings/]
+                                   [--backend whisper:tiny] [--output out.json]
+
+The corpus mimics field recordings: short answers with 1-4 s of silence
+before and 2-6 s after, some with background noise, some empty (the
+respondent said nothing) and some long multi-answer recordings. Files in
+--audio-dir are added to it. Whisper pads every call to a 30 s window, so
+the encoder-window count is reported alongside wall time; --backend also
+times real transcription with and without VAD.
+"""
+import argparse
+import glob
+import io
+import math
+import random
+import time
+
+import numpy as np
+
+from app.utils.vad import VoiceActivityDetector
+from benchmarks.common import emit, summarize
+from benchmarks.generators import speech_like_samples
+
+SAMPLE_RATE = 16000
+WHISPER_WINDOW_SECONDS = 30
+
+
+def synthetic_corpus(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    noise = np.random.default_rng(seed)
+    corpus = []
+
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.1:
+            # Empty answer: only room tone
+            samples = speech_like_samples(0, leading_silence=rng.uniform(3, 8), seed=i)
+        elif kind < 0.2:
+            # Several answers in one long recording, separated by pauses
+            samples = []
+            for part in range(rng.randint(3, 5)):
+                samples += speech_like_samples(
+                    rng.uniform(4, 12), seed=i * 10 + part, trailing_silence=rng.uniform(1, 4)
+                )
+        else:
+            samples = speech_like_samples(
+                rng.uniform(0.6, 6), seed=i,
+                leading_silence=rng.uniform(1, 4), trailing_silence=rng.uniform(2, 6)
+            )
+
+        audio = np.asarray(samples, dtype=np.float32)
+        if rng.random() < 0.3:
+            audio = audio + noise.normal(0, rng.uniform(0.005, 0.02), len(audio)).astype(np.float32)
+        corpus.append((f"synthetic-{i}", audio))
+
+    return corpus
+
+
+def recorded_corpus(audio_dir: str):
+    import librosa
+
+    corpus = []
+    for path in sorted(glob.glob(f"{audio_dir}/*")):
+        with open(path, "rb") as f:
+            audio, _ = librosa.load(io.BytesIO(f.read()), sr=SAMPLE_RATE, mono=True)
+        corpus.append((path, audio))
+    return corpus
+
+
+def bench_vad(corpus):
+    vad = VoiceActivityDetector(SAMPLE_RATE)
+    vad.process(corpus[0][1])
+
+    input_seconds = speech_seconds = 0.0
+    windows_before = windows_after = 0
+    rejected = 0
+    timings = []
+    processed = []
+
+    for name, audio in corpus:
+        start = time.perf_counter()
+        result = vad.process(audio)
+        timings.append((time.perf_counter() - start) * 1000)
+
+        input_seconds += result["input_seconds"]
+        speech_seconds += result["speech_seconds"]
+        windows_before += max(1, math.ceil(result["input_seconds"] / WHISPER_WINDOW_SECONDS))
+        windows_after += len(result["chunks"])
+        rejected += result["is_empty"]
+        processed.append((name, audio, result))
+
+    return processed, {
+        "clips": len(corpus),
+        "empty_clips_rejected": rejected,
+        "input_seconds": round(input_seconds, 2),
+        "speech_seconds": round(speech_seconds, 2),
+        "seconds_saved": round(input_seconds - speech_seconds, 2),
+        "percent_saved": round(100 * (1 - speech_seconds / input_seconds), 1) if input_seconds else 0.0,
+        "whisper_windows_before": windows_before,
+        "whisper_windows_after": windows_after,
+        "vad_latency": summarize(timings),
+        "vad_ms_per_audio_second": round(sum(timings) / input_seconds, 4) if input_seconds else 0.0,
+    }
+
+
+def bench_backend(spec: str, processed, language: str):
+    from app.services.stt_backends import create_stt_backend
+
+    backend = create_stt_backend(spec)
+    backend.load()
+    backend.transcribe(processed[0][1], language=language)
+
+    full, trimmed = [], []
+    for _, audio, result in processed:
+        start = time.perf_counter()
+        backend.transcribe(audio, language=language)
+        full.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        for chunk in result["chunks"]:
+            backend.transcribe(chunk, language=language)
+        trimmed.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "backend": backend.label,
+        "without_vad": summarize(full),
+        "with_vad": summarize(trimmed),
+        "total_speedup": round(sum(full) / sum(trimmed), 2) if sum(trimmed) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=60)
+    parser.add_argument("--audio-dir")
+    parser.add_argument("--backend", help="e.g. whisper:tiny; omit to skip model timing")
+    parser.add_argument("--language", default="hi")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.clips)
+    if args.audio_dir:
+        corpus += recorded_corpus(args.audio_dir)
+
+    processed, results = bench_vad(corpus)
+    if args.backend:
+        results["stt"] = bench_backend(args.backend, processed, args.language)
+
+    emit("vad", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
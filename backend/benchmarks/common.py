@@ -0,0 +1,154 @@
+"""Shared helpers for the backend benchmark scripts.
+
+Run benchmarks from the backend directory, e.g.::
+
+    python -m benchmarks.bench_tts_formats --output results.json
+
+and compare runs from two commits with ``python -m benchmarks.compare``.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils.dialect_mapper import TOKEN_PATTERN
+
+DANDA_TO_SPACE = str.maketrans("\u0964\u0965", "  ")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """Latency summary in milliseconds"""
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 4) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+        "min_ms": round(min(samples_ms), 4) if samples_ms else 0.0,
+        "max_ms": round(max(samples_ms), 4) if samples_ms else 0.0,
+    }
+
+
+def word_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """(word-level edit distance, reference word count), case- and punctuation-insensitive"""
+    # TOKEN_PATTERN's Indic range includes the danda, which is punctuation here
+    ref = TOKEN_PATTERN.findall(reference.casefold().translate(DANDA_TO_SPACE))
+    hyp = TOKEN_PATTERN.findall(hypothesis.casefold().translate(DANDA_TO_SPACE))
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def word_error_rate(pairs: List[Tuple[str, str]]) -> float:
+    """Corpus WER over (reference, hypothesis) pairs"""
+    errors = words = 0
+    for reference, hypothesis in pairs:
+        e, n = word_errors(reference, hypothesis)
+        errors += e
+        words += n
+    return round(errors / words, 4) if words else 0.0
+
+
+def time_calls(func: Callable, repeat: int, warmup: int = 1) -> List[float]:
+    """Wall time of repeated calls to func, in milliseconds"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def per_second(count: int, seconds: float) -> float:
+    """Throughput, rounded for reports"""
+    return round(count / seconds, 2) if seconds else 0.0
+
+
+@contextmanager
+def peak_memory():
+    """Peak bytes allocated by Python inside the block, in usage["peak_bytes"].
+
+    Tracing slows the code down, so time it in a separate run.
+    """
+    usage = {"peak_bytes": 0}
+    tracemalloc.start()
+    try:
+        yield usage
+        usage["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scratch_workdir(prefix: str = "bharatpulse-bench-") -> str:
+    """Send everything the app writes (SQLite file, encryption key, audio,
+    TTS cache) to a new temp directory and chdir there; call before
+    importing app modules"""
+    workdir = tempfile.mkdtemp(prefix=prefix)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["AUDIO_STORAGE_BACKEND"] = "local"
+    os.environ["AUDIO_STORAGE_ROOT"] = os.path.join(workdir, "audio_files")
+    os.environ["TTS_CACHE_DIR"] = os.path.join(workdir, "tts_cache")
+    os.environ["VOSK_MODEL_PATH"] = os.path.join(workdir, "no-vosk")
+    os.chdir(workdir)
+    return workdir
+
+
+def environment() -> Dict:
+    """Machine and revision info so results can be compared across commits"""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).decode().strip()
+    except Exception:
+        commit = None
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "commit": commit,
+    }
+
+
+def emit(name: str, results: Dict, output: Optional[str] = None) -> Dict:
+    """Print results as JSON and optionally write them to a file"""
+    payload = {
+        "benchmark": name,
+        "environment": environment(),
+        "results": results,
+    }
+    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    return payload
@@ -0,0 +1,84 @@
+"""Compare two benchmark JSON files and flag regressions.
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 10]
+
+Works on the output of any benchmark in this package. Keys ending in
+_per_sec are higher-is-better; latency (_ms, except min/max) and size
+(_mb, _bytes, _bytes_per_row) keys are lower-is-better; everything else
+is ignored. Exits 1 when a metric moved the wrong way by more than the
+threshold percentage, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Optional, Tuple
+
+HIGHER_IS_BETTER = ("_per_sec",)
+LOWER_IS_BETTER = ("_ms", "_mb", "_bytes", "_bytes_per_row")
+# Single extreme samples are too noisy to gate on
+IGNORED = ("min_ms", "max_ms")
+
+
+def flatten(results, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """(dotted.path, value) for every numeric leaf"""
+    if isinstance(results, dict):
+        for key, value in results.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(results, (int, float)) and not isinstance(results, bool):
+        yield prefix, float(results)
+
+
+def direction(path: str) -> Optional[int]:
+    """+1 if higher is better, -1 if lower is better, None if not a tracked metric"""
+    key = path.rsplit(".", 1)[-1]
+    if key in IGNORED:
+        return None
+    if key.endswith(HIGHER_IS_BETTER):
+        return 1
+    if key.endswith(LOWER_IS_BETTER):
+        return -1
+    return None
+
+
+def compare(baseline: Dict, current: Dict, threshold: float):
+    """Rows of (path, before, after, percent change, regressed)"""
+    before = dict(flatten(baseline.get("results", {})))
+    after = dict(flatten(current.get("results", {})))
+    rows = []
+    for path, old in before.items():
+        sign = direction(path)
+        if sign is None or path not in after:
+            continue
+        new = after[path]
+        change = (new - old) / old * 100 if old else 0.0
+        rows.append((path, old, new, change, sign * change < -threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed change in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    print(f"{baseline.get('benchmark')}: {baseline['environment'].get('commit')} -> "
+          f"{current['environment'].get('commit')}")
+    rows = compare(baseline, current, args.threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    for path, old, new, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{path:<{width}}  {old:>12.2f}  {new:>12.2f}  {change:+7.1f}%{flag}")
+
+    regressions = sum(row[4] for row in rows)
+    print(f"{len(rows)} metrics compared, {regressions} regressed beyond {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
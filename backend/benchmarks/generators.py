@@ -0,0 +1,227 @@
+"""Synthetic data generators for benchmarks (no real respondent data)."""
+import io
+import math
+import random
+import struct
+import uuid
+import wave
+from datetime import datetime, timedelta
+
+HINDI_NAMES = ["राम कुमार", "सीता देवी", "मोहन लाल", "गीता शर्मा", "सुनील यादव", "पूजा वर्मा", "अनिल सिंह", "रेखा कुमारी"]
+ENGLISH_NAMES = ["Ramesh Patel", "Anita Singh", "Suresh Reddy", "Kavita Nair", "Vijay Kumar", "Priya Das"]
+VILLAGES = ["रामपुर", "सीतापुर", "बरेली", "Khandwa", "Nashik", "Madurai", "चंदनपुर", "Bhadrak"]
+OCCUPATIONS = ["किसान", "मजदूर", "दुकानदार", "शिक्षक", "farmer", "driver", "tailor", "weaver"]
+
+# (Devanagari, romanized spellings) syllables synthetic place names are built from
+SYLLABLES = [
+    ("रा", ["ra", "raa"]), ("म", ["ma"]), ("सी", ["si", "see"]), ("ता", ["ta", "taa"]), ("चं", ["chan"]),
+    ("द", ["da"]), ("न", ["na"]), ("बि", ["bi"]), ("ला", ["la", "laa"]), ("सु", ["su"]), ("ल", ["la"]),
+    ("गो", ["go"]), ("वि", ["vi", "wi"]), ("हा", ["ha", "haa"]), ("री", ["ri", "ree"]), ("कु", ["ku"]),
+    ("मा", ["ma", "maa"]), ("दे", ["de"]), ("व", ["va", "wa"]), ("शि", ["shi"]), ("कि", ["ki"]),
+    ("श", ["sha"]), ("भ", ["bha"]), ("ज", ["ja"]), ("पा", ["pa", "paa"]), ("टे", ["te"]), ("मो", ["mo"]),
+    ("ही", ["hi", "hee"]), ("नी", ["ni", "nee"]), ("कै", ["kai"]), ("सो", ["so"]), ("धा", ["dha"]),
+]
+SUFFIXES = [
+    ("पुर", ["pur", "poor"]), ("गढ़", ["garh", "gadh"]), ("नगर", ["nagar"]), ("खेड़ा", ["khera", "kheda"]),
+    ("गांव", ["gaon", "gaanv"]), ("पल्ली", ["palli"]), ("वाड़ी", ["wadi", "vaadi", "wari"]), ("कोट", ["kot"]),
+    ("बाद", ["bad", "baad"]), ("गंज", ["ganj"]),
+]
+
+# Spoken answers as STT would return them, keyed by the field they answer
+SPOKEN_ANSWERS = {
+    "name": [("hi", "मेरा नाम {name} है"), ("en", "my name is {name}")],
+    "age": [("hi", "मैं {age} साल का हूँ"), ("en", "I am {age} years old")],
+    "income": [("hi", "महीने में {income} रुपये कमाता हूँ"), ("en", "I earn {income} rupees per month")],
+    "occupation": [("hi", "मैं {occupation} का काम करता हूँ"), ("en", "I work as a {occupation}")],
+    "location": [("hi", "मैं {village} गांव में रहता हूँ"), ("en", "I live in {village} village")],
+}
+
+
+def speech_like_samples(seconds: float, sample_rate: int = 16000, seed: int = 0,
+                        leading_silence: float = 0.0, trailing_silence: float = 0.0):
+    """Float samples in [-1, 1] that roughly mimic voiced speech.
+
+    Syllable-rate (~4 Hz) amplitude bursts of a harmonic series with a
+    drifting pitch plus a little noise, optionally padded with near-silence.
+    """
+    rng = random.Random(seed)
+    samples = []
+
+    def silence(duration):
+        for _ in range(int(duration * sample_rate)):
+            samples.append(rng.gauss(0, 0.002))
+
+    silence(leading_silence)
+
+    pitch = 120 + rng.random() * 80
+    phase = 0.0
+    for n in range(int(seconds * sample_rate)):
+        t = n / sample_rate
+        envelope = max(0.0, math.sin(2 * math.pi * 4 * t)) ** 2
+        pitch_now = pitch * (1 + 0.1 * math.sin(2 * math.pi * 0.5 * t))
+        phase += 2 * math.pi * pitch_now / sample_rate
+        voiced = sum(math.sin(k * phase) / k for k in range(1, 6))
+        samples.append(0.3 * envelope * voiced + rng.gauss(0, 0.01))
+
+    silence(trailing_silence)
+    return samples
+
+
+def wav_bytes(samples, sample_rate: int = 16000) -> bytes:
+    """Encode float samples as 16-bit mono PCM WAV"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"".join(
+            struct.pack("<h", max(-32768, min(32767, int(s * 32767)))) for s in samples
+        ))
+    return buffer.getvalue()
+
+
+def speech_like_wav(seconds: float, sample_rate: int = 16000, seed: int = 0, **kwargs) -> bytes:
+    """Synthetic speech-like clip as WAV bytes"""
+    return wav_bytes(speech_like_samples(seconds, sample_rate, seed, **kwargs), sample_rate)
+
+
+def synthetic_phone(rng: random.Random) -> str:
+    return f"+91 {rng.choice('6789')}{rng.randint(0, 999999999):09d}"
+
+
+def synthetic_aadhaar(rng: random.Random) -> str:
+    digits = f"{rng.randint(2, 9)}{rng.randint(0, 10 ** 11 - 1):011d}"
+    return f"{digits[:4]} {digits[4:8]} {digits[8:]}"
+
+
+def synthetic_survey(seed: int = 0, questions: int = 10, languages=("hi", "en")):
+    """Survey create request (dict) with a mix of demographic and free-text questions"""
+    rng = random.Random(seed)
+    fields = list(SPOKEN_ANSWERS)
+    items = []
+    for i in range(questions):
+        field = fields[i % len(fields)]
+        items.append({
+            "id": f"q{i + 1}",
+            "type": "voice",
+            "text": f"कृपया अपना {field} बताइए ({i + 1})",
+            "required": rng.random() < 0.8,
+            "extract": [{"field": field, "type": "number" if field in ("age", "income") else "text"}],
+            "retry_prompts": [f"फिर से बताइए ({i + 1})"],
+        })
+    return {
+        "title": f"Synthetic household survey {seed}",
+        "description": "Generated for benchmarks",
+        "languages": list(languages),
+        "questions": items,
+        "logic": {"max_retries": 3, "confidence_threshold": 0.7, "auto_skip_timeout": 30},
+        "responses": {
+            "thank_you": "धन्यवाद",
+            "error_generic": "कुछ गलत हो गया",
+            "error_unclear": "कृपया फिर से बोलिए",
+        },
+    }
+
+
+def synthetic_answers(rng: random.Random) -> dict:
+    """One respondent's answers, with the PII PrivacyService encrypts and masks"""
+    hindi = rng.random() < 0.6
+    name = rng.choice(HINDI_NAMES if hindi else ENGLISH_NAMES)
+    village = rng.choice(VILLAGES)
+    phone = synthetic_phone(rng)
+    notes = (f"उत्तरदाता ने फोन {phone} और आधार {synthetic_aadhaar(rng)} बताया" if hindi
+             else f"Respondent shared phone {phone} and aadhaar {synthetic_aadhaar(rng)}")
+    return {
+        "name": name,
+        "phone": phone,
+        "address": f"{rng.randint(1, 400)}, {village}, जिला {rng.choice(VILLAGES)}",
+        "email": f"user{rng.randint(1000, 99999)}@example.in" if rng.random() < 0.3 else "",
+        "age": rng.randint(18, 85),
+        "income": rng.choice([3000, 5000, 8000, 12000, 15000, 25000, 40000]),
+        "occupation": rng.choice(OCCUPATIONS),
+        "household_size": rng.randint(1, 9),
+        "notes": notes,
+    }
+
+
+def synthetic_response(survey_id: str, seed: int = 0, response_id: str = None) -> dict:
+    """Response as the mobile app sends it in a batch sync"""
+    rng = random.Random(seed)
+    created = datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+    return {
+        "id": response_id or str(uuid.UUID(int=rng.getrandbits(128))),
+        "survey_id": survey_id,
+        "respondent_id": f"R{seed:07d}",
+        "responses": synthetic_answers(rng),
+        "location": {"latitude": rng.uniform(8.0, 32.0), "longitude": rng.uniform(69.0, 89.0)},
+        "device_info": {"device_model": rng.choice(["Redmi 9A", "Galaxy M12", "Nokia C20"]),
+                        "os_version": "11", "app_version": "1.0.0",
+                        "device_id": f"dev-{rng.randint(1, 500)}"},
+        "confidence_scores": {"q1": round(rng.uniform(0.5, 1.0), 2)},
+        "is_complete": rng.random() < 0.9,
+        "created_at": created.isoformat(),
+    }
+
+
+def spoken_answers(count: int, seed: int = 0):
+    """(language, field, transcript) triples like those process_voice extracts from"""
+    rng = random.Random(seed)
+    fields = list(SPOKEN_ANSWERS)
+    answers = []
+    for i in range(count):
+        field = fields[i % len(fields)]
+        language, template = rng.choice(SPOKEN_ANSWERS[field])
+        names = HINDI_NAMES if language == "hi" else ENGLISH_NAMES
+        text = template.format(
+            name=rng.choice(names), age=rng.randint(18, 85), income=rng.choice([5000, 12000, 25000]),
+            occupation=rng.choice(OCCUPATIONS), village=rng.choice(VILLAGES),
+        )
+        answers.append((language, field, text))
+    return answers
+
+
+def synthetic_sessions(count: int, seed: int = 0, surveys: int = 2):
+    """Enumerator interviews in the load-test replay format.
+
+    Each session names its survey (created once per run), the interview
+    language and, per question, how long the answer clip is and how long
+    the enumerator spent before recording it.
+    """
+    rng = random.Random(seed)
+    definitions = [synthetic_survey(seed=i, questions=rng.randint(6, 12)) for i in range(surveys)]
+    sessions = []
+    for i in range(count):
+        survey_key = rng.randrange(surveys)
+        survey = definitions[survey_key]
+        sessions.append({
+            "survey_key": f"survey-{survey_key}",
+            "survey": survey,
+            "language": rng.choice(survey["languages"]),
+            "steps": [
+                {
+                    "question_id": question["id"],
+                    "prompt": question["text"],
+                    "audio_seconds": round(rng.uniform(1.0, 8.0) * 2) / 2,
+                    "think_seconds": round(rng.uniform(2.0, 20.0), 1),
+                }
+                for question in survey["questions"]
+                if question["required"] or rng.random() < 0.5
+            ],
+        })
+    return sessions
+
+
+def place_name(rng: random.Random, syllables=(2, 3)):
+    """(Devanagari name, [spellings per syllable]) of a made-up village"""
+    parts = [rng.choice(SYLLABLES) for _ in range(rng.randint(*syllables))] + [rng.choice(SUFFIXES)]
+    return "".join(devanagari for devanagari, _ in parts), [spellings for _, spellings in parts]
+
+
+def romanized_spelling(rng: random.Random, spellings, typo: bool = False) -> str:
+    """One of the ways a place name is written in Latin script ("Raampur",
+    "Sitapoor"), optionally with a one-letter typo"""
+    mention = "".join(rng.choice(options) for options in spellings).capitalize()
+    if typo:
+        position = rng.randrange(1, len(mention))
+        mention = mention[:position] + rng.choice("aeiourn") + mention[position + 1:]
+    return mention
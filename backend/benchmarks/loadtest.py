@@ -0,0 +1,362 @@
+"""Closed-loop load test: replay enumerator sessions against the API.
+
+    python -m benchmarks.loadtest [--sessions sessions.jsonl] [--users 1,2,4,8,16,32]
+                                  [--step-seconds 20] [--think-scale 0]
+                                  [--stt 600/150] [--tts 200] [--nlp 5/5]
+                                  [--server-workers 1] [--url http://host:8000]
+                                  [--output out.json]
+    python -m benchmarks.loadtest --record-from sqlite:///bharatpulse.db --sessions sessions.jsonl
+
+Like a Locust user, each virtual user replays whole interviews back to
+back: fetch the survey, create the response, then per question fetch the
+prompt audio, (think), upload the answer to process-voice and save the
+response, and finally batch-sync the finished interview. The user count
+steps up until throughput stops growing; each step reports p50/p95/p99
+latency and requests/sec per endpoint, and the best step is the
+saturation throughput.
+
+Unless --url is given, the app is started with benchmarks.stub_server so
+STT, TTS and NLP cost only their configured fake latency/CPU ("real"
+loads the real service). Sessions come from a JSONL file (one
+synthetic_sessions() item per line), from a database with --record-from
+(timing and structure only; answers are replaced with synthetic ones), or
+are generated.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from benchmarks.common import emit, per_second, summarize
+from benchmarks.generators import speech_like_wav, synthetic_answers, synthetic_sessions
+
+# Uploads are assumed to be 16 kHz 16-bit mono PCM when deriving clip length from size
+RECORDED_BYTES_PER_SECOND = 32000
+
+
+def load_sessions(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_sessions(database_url: str, limit: int) -> List[Dict]:
+    """Interview structure and pacing from a database; no answer content is copied"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.response import AudioFileDB, ResponseDB
+    from app.models.survey import SurveyDB
+
+    engine = create_engine(database_url)
+    db = sessionmaker(bind=engine)()
+    sessions = []
+    try:
+        surveys = {}
+        responses = db.query(ResponseDB).order_by(ResponseDB.created_at.desc()).limit(limit).all()
+        for response in responses:
+            if response.survey_id not in surveys:
+                survey = db.query(SurveyDB).filter(SurveyDB.id == response.survey_id).first()
+                surveys[response.survey_id] = survey and {
+                    "title": survey.title,
+                    "description": survey.description,
+                    "languages": survey.languages or ["hi"],
+                    **survey.definition,
+                }
+            survey = surveys[response.survey_id]
+            if not survey:
+                continue
+
+            prompts = {question["id"]: question["text"] for question in survey.get("questions", [])}
+            audio_files = (db.query(AudioFileDB).filter(AudioFileDB.response_id == response.id)
+                           .order_by(AudioFileDB.created_at).all())
+            steps = []
+            previous = response.created_at
+            for audio in audio_files:
+                try:
+                    think = (audio.created_at - previous).total_seconds()
+                except TypeError:
+                    think = 10.0
+                previous = audio.created_at or previous
+                steps.append({
+                    "question_id": audio.question_id,
+                    "prompt": prompts.get(audio.question_id, audio.question_id),
+                    "audio_seconds": round(min(30.0, max(0.5, (audio.size_bytes or 0) / RECORDED_BYTES_PER_SECOND)), 1),
+                    "think_seconds": round(min(120.0, max(0.0, think)), 1),
+                })
+            if steps:
+                sessions.append({
+                    "survey_key": response.survey_id,
+                    "survey": survey,
+                    "language": audio_files[0].language or survey["languages"][0],
+                    "steps": steps,
+                })
+    finally:
+        db.close()
+    return sessions
+
+
+class EndpointStats:
+    """Latencies and errors per endpoint for one load step"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.sessions = 0
+
+    def record(self, endpoint: str, ms: float, ok: bool):
+        self.latencies[endpoint].append(ms)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, seconds: float) -> Dict:
+        every = [ms for samples in self.latencies.values() for ms in samples]
+        total_errors = sum(self.errors.values())
+        return {
+            "requests": len(every),
+            "requests_per_sec": per_second(len(every), seconds),
+            "sessions_per_sec": per_second(self.sessions, seconds),
+            "error_rate": round(total_errors / len(every), 4) if every else 0.0,
+            "latency": summarize(every),
+            "endpoints": {
+                endpoint: {
+                    "requests_per_sec": per_second(len(samples), seconds),
+                    "errors": self.errors[endpoint],
+                    **{key: value for key, value in summarize(samples).items()
+                       if key in ("count", "p50_ms", "p95_ms", "p99_ms", "max_ms")},
+                }
+                for endpoint, samples in sorted(self.latencies.items())
+            },
+        }
+
+
+class VirtualUser:
+    """Replays sessions one after another until the step ends"""
+
+    def __init__(self, client, sessions: List[Dict], survey_ids: Dict[str, str],
+                 clips: Dict[float, bytes], stats: EndpointStats, think_scale: float, seed: int):
+        self.client = client
+        self.sessions = sessions
+        self.survey_ids = survey_ids
+        self.clips = clips
+        self.stats = stats
+        self.think_scale = think_scale
+        self.rng = random.Random(seed)
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except Exception:
+            response, ok = None, False
+        self.stats.record(endpoint, (time.perf_counter() - start) * 1000, ok)
+        return response if ok else None
+
+    async def run(self, stop_at: float):
+        while time.monotonic() < stop_at:
+            await self.interview(self.rng.choice(self.sessions), stop_at)
+
+    async def interview(self, session: Dict, stop_at: float):
+        survey_id = self.survey_ids[session["survey_key"]]
+        language = session["language"]
+
+        await self.request("GET /api/surveys/{survey_id}", "GET", f"/api/surveys/{survey_id}")
+        created = await self.request(
+            "POST /api/surveys/{survey_id}/responses", "POST", f"/api/surveys/{survey_id}/responses",
+            json={"survey_id": survey_id, "respondent_id": f"load-{self.rng.getrandbits(32)}", "responses": {}},
+        )
+        if created is None:
+            return
+        response_id = created.json()["id"]
+        answers, confidences = {}, {}
+
+        for step in session["steps"]:
+            if time.monotonic() >= stop_at:
+                return
+            await self.request(
+                "GET /api/tts/{text}/audio", "GET", f"/api/tts/{quote(step['prompt'], safe='')}/audio",
+                params={"lang": language},
+            )
+            if self.think_scale:
+                await asyncio.sleep(step["think_seconds"] * self.think_scale)
+
+            result = await self.request(
+                "POST /api/process-voice", "POST", "/api/process-voice",
+                params={"question_id": step["question_id"], "user_lang": language,
+                        "session_id": response_id, "survey_id": survey_id},
+                files={"audio_file": ("answer.wav", self.clips[step["audio_seconds"]], "audio/wav")},
+            )
+            if result is not None:
+                body = result.json()
+                answers[step["question_id"]] = body["transcription"].get("text", "")
+                confidences[step["question_id"]] = body.get("confidence", 0.0)
+
+            await self.request(
+                "PUT /api/responses/{response_id}", "PUT", f"/api/responses/{response_id}",
+                json={"responses": answers, "confidence_scores": confidences},
+            )
+
+        # The app syncs the finished interview, with the form fields filled in offline
+        responses = {**synthetic_answers(self.rng), **answers}
+        await self.request("POST /api/sync/batch", "POST", "/api/sync/batch", json={"responses": [{
+            "id": response_id, "survey_id": survey_id, "responses": responses,
+            "confidence_scores": confidences, "is_complete": True,
+        }]})
+        self.stats.sessions += 1
+
+
+async def run_step(client, sessions, survey_ids, clips, users: int, seconds: float,
+                   think_scale: float) -> Dict:
+    stats = EndpointStats()
+    stop_at = time.monotonic() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        VirtualUser(client, sessions, survey_ids, clips, stats, think_scale, seed=users * 1000 + i).run(stop_at)
+        for i in range(users)
+    ))
+    return {"users": users, "seconds": round(time.perf_counter() - start, 2), **stats.report(time.perf_counter() - start)}
+
+
+async def load_test(args, sessions: List[Dict]) -> Dict:
+    import httpx
+
+    clips = {seconds: speech_like_wav(seconds, seed=int(seconds * 10), leading_silence=0.5, trailing_silence=1.0)
+             for seconds in {step["audio_seconds"] for session in sessions for step in session["steps"]}}
+    user_steps = [int(users) for users in args.users.split(",")]
+
+    limits = httpx.Limits(max_connections=max(user_steps), max_keepalive_connections=max(user_steps))
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=120) as client:
+        survey_ids = {}
+        for session in sessions:
+            if session["survey_key"] not in survey_ids:
+                created = await client.post("/api/surveys", json=session["survey"])
+                created.raise_for_status()
+                survey_ids[session["survey_key"]] = created.json()["id"]
+
+        # One pass to warm caches (prompt audio, imports) before measuring
+        await run_step(client, sessions, survey_ids, clips, 1, min(5.0, args.step_seconds), 0)
+
+        steps = []
+        for users in user_steps:
+            step = await run_step(client, sessions, survey_ids, clips, users, args.step_seconds, args.think_scale)
+            steps.append(step)
+            print(f"{users:>4} users: {step['requests_per_sec']:>8.1f} req/s  "
+                  f"p95 {step['latency']['p95_ms']:>8.1f} ms  errors {step['error_rate']:.1%}", file=sys.stderr)
+            if step["error_rate"] > args.max_error_rate:
+                break
+            if args.max_p95_ms and step["latency"]["p95_ms"] > args.max_p95_ms:
+                break
+
+    best = max(steps, key=lambda step: step["requests_per_sec"])
+    # Throughput has saturated once more users add less than 10%
+    knee = next((earlier for earlier, later in zip(steps, steps[1:])
+                 if later["requests_per_sec"] < earlier["requests_per_sec"] * 1.1), None)
+    interview_seconds = sum(
+        sum(step["think_seconds"] + step["audio_seconds"] for step in session["steps"]) for session in sessions
+    ) / len(sessions)
+
+    return {
+        "steps": steps,
+        "saturation": {
+            "users": best["users"],
+            "requests_per_sec": best["requests_per_sec"],
+            "sessions_per_sec": best["sessions_per_sec"],
+            "saturated_at_users": knee["users"] if knee else None,
+            "endpoints": {name: endpoint["requests_per_sec"] for name, endpoint in best["endpoints"].items()},
+            # Enumerators interviewing at the recorded pace that this server could keep up with
+            "enumerators_supported_estimate": round(best["sessions_per_sec"] * interview_seconds),
+        },
+    }
+
+
+def start_server(args) -> subprocess.Popen:
+    import httpx
+
+    command = [
+        sys.executable, "-m", "benchmarks.stub_server", "--port", str(args.port),
+        "--workers", str(args.server_workers), "--stt", args.stt,
+        "--stt-concurrency", str(args.stt_concurrency), "--tts", args.tts, "--nlp", args.nlp,
+    ]
+    server = subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"stub server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{args.url}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("stub server did not become healthy")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", help="JSONL sessions to replay (written to with --record-from)")
+    parser.add_argument("--synthetic-sessions", type=int, default=50)
+    parser.add_argument("--record-from", metavar="DATABASE_URL")
+    parser.add_argument("--record-limit", type=int, default=500)
+    parser.add_argument("--users", default="1,2,4,8,16,32", help="virtual users per step")
+    parser.add_argument("--step-seconds", type=float, default=20)
+    parser.add_argument("--think-scale", type=float, default=0.0,
+                        help="multiplier for recorded think time; 0 finds peak throughput")
+    parser.add_argument("--max-error-rate", type=float, default=0.05)
+    parser.add_argument("--max-p95-ms", type=float, help="stop ramping once p95 exceeds this")
+    parser.add_argument("--url", help="test a running server instead of starting the stub server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--server-workers", type=int, default=1)
+    parser.add_argument("--stt", default="600/150", help='fake STT cost "latency_ms/cpu_ms", or "real"')
+    parser.add_argument("--stt-concurrency", type=int, default=1)
+    parser.add_argument("--tts", default="200")
+    parser.add_argument("--nlp", default="5/5")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.record_from:
+        if not args.sessions:
+            parser.error("--record-from needs --sessions to write to")
+        sessions = record_sessions(args.record_from, args.record_limit)
+        with open(args.sessions, "w", encoding="utf-8") as f:
+            for session in sessions:
+                f.write(json.dumps(session, ensure_ascii=False) + "\n")
+        print(f"Recorded {len(sessions)} sessions to {args.sessions}")
+        return
+
+    sessions = load_sessions(args.sessions) if args.sessions else synthetic_sessions(args.synthetic_sessions)
+    if not sessions:
+        parser.error("no sessions to replay")
+
+    server: Optional[subprocess.Popen] = None
+    if not args.url:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args)
+    try:
+        results = asyncio.run(load_test(args, sessions))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    results["config"] = {
+        "url": args.url if not server else "stub_server",
+        "sessions": len(sessions),
+        "step_seconds": args.step_seconds,
+        "think_scale": args.think_scale,
+        "server_workers": args.server_workers,
+        "stt": args.stt, "stt_concurrency": args.stt_concurrency, "tts": args.tts, "nlp": args.nlp,
+    }
+    emit("loadtest", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Serve app.main:app with stub models, for load tests without GPUs or network.
+
+    python -m benchmarks.stub_server [--port 8765] [--workers 1]
+                                     [--stt 600/150] [--stt-concurrency 1]
+                                     [--tts 200] [--nlp 5/5] [--keep-env]
+
+Costs are FakeCost specs, "<latency_ms>[/<cpu_ms>]", or "real" to load the
+real service. Unless --keep-env is given the server writes to a scratch
+directory (SQLite database, encryption key, audio, TTS cache); with it,
+DATABASE_URL and friends come from the environment, e.g. to load-test
+against Postgres with several workers.
+"""
+import argparse
+import os
+
+from benchmarks.common import scratch_workdir
+
+
+def create_app():
+    """uvicorn factory: app.main:app with the services chosen by STUB_* variables"""
+    from app import main
+    from benchmarks import stubs
+
+    stubs.install_services(
+        main,
+        stt=os.getenv("STUB_STT", "600/150"),
+        tts=os.getenv("STUB_TTS", "200"),
+        nlp=os.getenv("STUB_NLP", "5/5"),
+        stt_concurrency=int(os.getenv("STUB_STT_CONCURRENCY", 1)),
+    )
+    return main.app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--stt", default="600/150")
+    parser.add_argument("--stt-concurrency", type=int, default=1)
+    parser.add_argument("--tts", default="200")
+    parser.add_argument("--nlp", default="5/5")
+    parser.add_argument("--keep-env", action="store_true")
+    args = parser.parse_args()
+
+    # Worker processes build their own app, so configuration travels in the environment
+    os.environ.update({
+        "STUB_STT": args.stt,
+        "STUB_STT_CONCURRENCY": str(args.stt_concurrency),
+        "STUB_TTS": args.tts,
+        "STUB_NLP": args.nlp,
+    })
+    if not args.keep_env:
+        scratch_workdir("bharatpulse-loadtest-")
+
+    import uvicorn
+    uvicorn.run(
+        "benchmarks.stub_server:create_app", factory=True,
+        host=args.host, port=args.port, workers=args.workers,
+        log_level="warning", access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Stand-in models so benchmarks and load tests measure the service, not the weights.
+
+Each stub keeps the real service around the model: StubSTTService still
+decodes, trims with VAD and routes languages, StubTTSService still caches
+and de-duplicates renders, StubNLPService still runs the regex extractors.
+Only inference is replaced by a FakeCost - a wall-clock wait plus CPU
+burned on the thread that would run the model - and a canned result.
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from app.services.nlp_service import NLPService
+from app.services.stt_backends import BACKENDS, STTBackend
+from app.services.stt_service import STTService
+from app.services.tts_service import TTSService
+from benchmarks.generators import speech_like_wav, spoken_answers
+
+
+def burn_cpu(seconds: float):
+    """Spin on the current thread until it has used `seconds` of CPU"""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+class FakeCost:
+    """Simulated model cost: "<latency_ms>[/<cpu_ms>]", each varied by +/- jitter"""
+
+    def __init__(self, latency_ms: float = 0.0, cpu_ms: float = 0.0, jitter: float = 0.2):
+        self.latency_ms = latency_ms
+        self.cpu_ms = cpu_ms
+        self.jitter = jitter
+        self._rng = random.Random(0)
+
+    @classmethod
+    def parse(cls, spec: str) -> "FakeCost":
+        latency, _, cpu = (spec or "0").partition("/")
+        return cls(float(latency or 0), float(cpu or 0))
+
+    @property
+    def spec(self) -> str:
+        return f"{self.latency_ms:g}/{self.cpu_ms:g}"
+
+    def _sample(self, ms: float) -> float:
+        return ms / 1000 * self._rng.uniform(1 - self.jitter, 1 + self.jitter) if ms else 0.0
+
+    def block(self):
+        """Pay the cost on this thread (models running in an executor)"""
+        time.sleep(self._sample(self.latency_ms))
+        burn_cpu(self._sample(self.cpu_ms))
+
+    async def wait(self):
+        """Pay the cost on the event loop; the CPU part blocks it, as inline spaCy does"""
+        await asyncio.sleep(self._sample(self.latency_ms))
+        burn_cpu(self._sample(self.cpu_ms))
+
+
+class StubSTTBackend(STTBackend):
+    """Returns canned Hindi/English answers; size is a FakeCost spec, e.g. "stub:600/150" """
+
+    name = "stub"
+
+    def __init__(self, size: str, concurrency: int = 1):
+        # Whisper serves one call at a time; raise this to model a backend that scales
+        self.concurrency = concurrency
+        super().__init__(size)
+        self.cost = FakeCost.parse(size)
+        self.answers = spoken_answers(64, seed=11)
+        self.calls = 0
+
+    def load(self):
+        pass
+
+    def detect_language(self, audio: np.ndarray,
+                        candidates: Optional[Iterable[str]] = None):
+        self.cost.block()
+        return "hi", 0.9
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        self.cost.block()
+        answer_language, _, text = self.answers[self.calls % len(self.answers)]
+        self.calls += 1
+        seconds = len(audio) / 16000
+        return {
+            "text": text,
+            "language": language or answer_language,
+            "segments": [{"start": 0.0, "end": seconds, "text": text, "avg_logprob": -0.2}],
+        }
+
+
+class StubSTTService(STTService):
+    """The real STT pipeline with every model replaced by one StubSTTBackend"""
+
+    def __init__(self, cost: str = "600/150", concurrency: int = 1):
+        self.stub_backend = StubSTTBackend(cost, concurrency)
+        super().__init__()
+
+    def _get_backend(self, spec: str) -> Optional[STTBackend]:
+        return self.stub_backend
+
+
+class StubTTSService(TTSService):
+    """The real TTS cache and request de-duplication over a fake engine.
+
+    The fake engine's CPU burns in this process's thread pool; the real
+    offline engine runs in worker processes, so keep the CPU part small.
+    """
+
+    def __init__(self, cost: str = "200"):
+        self.cost = FakeCost.parse(cost)
+        self._audio = speech_like_wav(1.0, seed=5)
+        super().__init__()
+
+    def _init_engine_pool(self):
+        self.engine_pool = None
+
+    async def _online_tts(self, text: str, lang: str, slow: bool = False) -> bytes:
+        await asyncio.get_running_loop().run_in_executor(None, self.cost.block)
+        return self._audio
+
+
+class StubNLPService(NLPService):
+    """Regex extraction as usual; spaCy is replaced by a FakeCost on the event loop"""
+
+    def __init__(self, cost: str = "5/5"):
+        self.cost = FakeCost.parse(cost)
+        super().__init__()
+
+    def _init_spacy(self):
+        self.nlp_hi = None
+        self.nlp_en = None
+
+    async def extract_fields(self, text: str, question_id: str = None,
+                             language: Optional[str] = None, **context) -> Dict:
+        await self.cost.wait()
+        return await super().extract_fields(text, question_id, language=language, **context)
+
+
+def install():
+    """Make "stub:<latency_ms>[/<cpu_ms>]" a valid STT_BACKEND spec"""
+    BACKENDS.setdefault("stub", lambda size: StubSTTBackend(size))
+
+
+def install_services(main_module, stt: Optional[str] = None, tts: Optional[str] = None,
+                     nlp: Optional[str] = None, stt_concurrency: int = 1):
+    """Have app.main's startup build stub services; a None or "real" cost keeps the real one"""
+    if stt and stt != "real":
+        main_module.STTService = lambda: StubSTTService(stt, stt_concurrency)
+    if tts and tts != "real":
+        main_module.TTSService = lambda: StubTTSService(tts)
+    if nlp and nlp != "real":
+        main_module.NLPService = lambda: StubNLPService(nlp)